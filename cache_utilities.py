@@ -0,0 +1,72 @@
+"""
+Shared caching helpers for the scheduling and routing utilities.
+
+LRUCache is the bounded, counted store behind sbn_utilities.SubproblemCache
+and cvrp_utilities.RouteSolutionCache; those subclasses only decide what a
+key is and how values are copied in and out.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit/miss counters.
+
+    Attributes:
+        maxsize: Maximum number of stored entries
+        hits: Number of lookups answered from the cache
+        misses: Number of lookups that found nothing
+
+    Example:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.put("a", 1)
+        >>> cache.get("a"), cache.get("b")
+        (1, None)
+        >>> cache.info()["hit_rate"]
+        0.5
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the value stored for key (or None) and update the counters."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, Any]:
+        """Hit/miss counters, hit rate and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
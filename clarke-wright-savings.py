@@ -20,8 +20,10 @@ def _():
     from sklearn.metrics.pairwise import haversine_distances
     from tqdm.auto import tqdm
 
+    import cvrp_utilities
+
     sns.set_style('whitegrid')
-    return haversine_distances, itertools, mo, np, pathlib, pl, plt
+    return cvrp_utilities, haversine_distances, itertools, mo, np, pathlib, pl, plt
 
 
 @app.cell(hide_code=True)
@@ -324,13 +326,15 @@ def _(mo):
     - **lng**: Longitude coordinate
 
     We precompute all pairwise distances using the Haversine formula (distance on Earth's surface in miles).
+    The distances are kept both as a long-format table (`distance_df`) and as an index-based matrix
+    (`distance_matrix`, with rows/columns ordered as in `coordinate_df`) for the array-based routing steps.
     """
     )
     return
 
 
 @app.cell
-def _(get_distance_df, get_distance_dict, pathlib, pl):
+def _(cvrp_utilities, get_distance_df, get_distance_dict, pathlib, pl):
     _data_filepath = pathlib.Path('data/tsp_AL_100.csv')
     coordinate_df = pl.read_csv(_data_filepath)
 
@@ -341,7 +345,19 @@ def _(get_distance_df, get_distance_dict, pathlib, pl):
     distance_dict = get_distance_dict(
         distance_df=distance_df
     )
-    return coordinate_df, distance_df, distance_dict
+
+    distance_matrix, location_names = cvrp_utilities.get_distance_matrix(
+        coordinate_df=coordinate_df
+    )
+    location2index = {_location: _idx for _idx, _location in enumerate(location_names)}
+    return (
+        coordinate_df,
+        distance_df,
+        distance_dict,
+        distance_matrix,
+        location2index,
+        location_names,
+    )
 
 
 @app.cell(hide_code=True)
@@ -479,7 +495,7 @@ def _(customer_locations, depot, savings_data):
     cluster2customers = {_idx: _val for _idx, _val in enumerate(cluster2customers.values(), 1)}
     for _key in cluster2customers:
         cluster2customers[_key].append(depot)
-    return (cluster2customers,)
+    return CAPACITY, cluster2customers
 
 
 @app.cell(hide_code=True)
@@ -495,6 +511,10 @@ def _(mo):
     3. Repeat until all customers in the cluster are visited
     4. Return to depot
 
+    Each nearest neighbor route is then polished with **exhaustive 2-opt** (reverse a segment of the route whenever that shortens it, until no reversal helps).
+
+    Only the rows and columns of a cluster are sliced out of `distance_matrix`, so routes are independent of one another and are sequenced in parallel across a pool of worker processes.
+
     This creates efficient routes within each cluster while respecting the cluster assignments from the savings algorithm.
     """
     )
@@ -504,33 +524,98 @@ def _(mo):
 @app.cell
 def _(
     cluster2customers,
+    cvrp_utilities,
     depot,
-    distance_df,
-    get_nearest_neighbors_solution,
-    pl,
+    distance_matrix,
+    location2index,
+    location_names,
 ):
-    routes = {}
-    for _cluster, _customer_list in cluster2customers.items():
-
-        cluster_distance_df = distance_df.filter(
-            pl.col('origin').is_in(_customer_list),
-            pl.col('destination').is_in(_customer_list)
-        )
+    _clusters = [
+        [location2index[_customer] for _customer in _customer_list]
+        for _customer_list in cluster2customers.values()
+    ]
+
+    _sequenced_routes = cvrp_utilities.sequence_routes(
+        clusters=_clusters,
+        depot=location2index[depot],
+        distance_matrix=distance_matrix,
+    )
 
-        routes[_cluster] = get_nearest_neighbors_solution(
-            distance_df=cluster_distance_df, 
-            start_location=depot,
-        )
+    routes = {
+        _cluster: [location_names[_idx] for _idx in _route]
+        for _cluster, _route in zip(cluster2customers.keys(), _sequenced_routes)
+    }
     return (routes,)
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Step 4: Improve Routes with Inter-Route Local Search
+
+    The savings phase never moves a customer once its cluster is fixed. We improve the routes by applying moves **between** routes:
+
+    - **Relocate**: move a customer into another route, next to one of its neighbors
+    - **Exchange**: swap two customers that belong to different routes
+    - **2-opt\***: swap the tails of two routes
+
+    Each route caches its load, prefix loads, length and the position of every customer, so each move is evaluated in O(1).
+    Only the *k* nearest customers of each customer are considered as move partners (granular neighborhoods).
+    The improved routes are re-sequenced with Nearest Neighbor + 2-opt at the end.
+    """
+    )
+    return
+
+
+@app.cell
+def _(
+    CAPACITY,
+    cvrp_utilities,
+    depot,
+    distance_matrix,
+    location2index,
+    location_names,
+    routes,
+):
+    _depot_idx = location2index[depot]
+    _routes = [
+        [location2index[_location] for _location in _route]
+        for _route in routes.values()
+    ]
+
+    _improved_routes = cvrp_utilities.improve_routes(
+        routes=_routes,
+        depot=_depot_idx,
+        distance_matrix=distance_matrix,
+        capacity=CAPACITY,
+        n_neighbors=10,
+    )
+    _improved_routes = cvrp_utilities.sequence_routes(
+        clusters=[_route[1:] for _route in _improved_routes],
+        depot=_depot_idx,
+        distance_matrix=distance_matrix,
+    )
+
+    _initial_distance = sum(cvrp_utilities.get_route_distance(_route, distance_matrix) for _route in _routes)
+    _improved_distance = sum(cvrp_utilities.get_route_distance(_route, distance_matrix) for _route in _improved_routes)
+    print(f'Savings routes:  {len(_routes)} vehicles, {_initial_distance:.2f} miles')
+    print(f'Improved routes: {len(_improved_routes)} vehicles, {_improved_distance:.2f} miles')
+
+    improved_routes = {
+        _cluster: [location_names[_idx] for _idx in _route]
+        for _cluster, _route in enumerate(_improved_routes, 1)
+    }
+    return (improved_routes,)
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(
         r"""
     ## Results
 
-    The visualization below shows the final solution:
+    The visualization below shows the final (improved) solution:
     - Each **color** represents a different vehicle route (cluster)
     - All routes start and end at the **depot** (Birmingham)
     - **Arrows** indicate the direction of travel
@@ -541,15 +626,239 @@ def _(mo):
 
 
 @app.cell
-def _(coordinate_df, get_solution_df, routes):
-    get_solution_df(coordinate_df=coordinate_df, tour_list=routes[1])
+def _(coordinate_df, get_solution_df, improved_routes):
+    get_solution_df(coordinate_df=coordinate_df, tour_list=improved_routes[1])
+    return
+
+
+@app.cell
+def _(coordinate_df, improved_routes, visualize_solution):
+    visualize_solution(
+        cluster_routes=improved_routes, 
+        coordinate_df=coordinate_df,
+        figsize=(5, 8)
+    )
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Capacity Planning: Solving Many Capacities at Once
+
+    The savings only depend on distances, not on the vehicle capacity. To compare fleet capacities we therefore
+    **sort the savings once** and replay only the merge step (followed by Nearest Neighbor + 2-opt sequencing)
+    for each capacity. The capacities are independent, so they can be spread over a pool of worker processes.
+
+    The resulting table maps each capacity to its routes, number of vehicles and total distance.
+    """
+    )
+    return
+
+
+@app.cell
+def _(cvrp_utilities, depot, distance_matrix, location2index, location_names):
+    capacity_results = cvrp_utilities.solve_capacities(
+        distance_matrix=distance_matrix,
+        depot=location2index[depot],
+        capacities=list(range(2, 21)),
+        location_names=location_names,
+        max_workers=None,
+    )
+
+    capacity_results.select(['capacity', 'n_vehicles', 'distance'])
+    return (capacity_results,)
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Savings Sweeps: Parametric and Randomized Clarke-Wright
+
+    Clarke-Wright is deterministic, so it always returns the same answer. The **generalized savings**
+
+    **s(i, j) = d(depot, i) + d(j, depot) - λ·d(i, j)**
+
+    use the route shape parameter λ to change how strongly the distance between i and j is penalized (λ = 1 is the classical rule).
+    We run a grid of λ values, and for each λ several **randomized replicas** that break ties randomly and slightly perturb the savings.
+    All runs are independent, so they are spread across worker processes that receive the distance matrix once, and the best routes are kept.
+    """
+    )
+    return
+
+
+@app.cell
+def _(
+    CAPACITY,
+    cvrp_utilities,
+    depot,
+    distance_matrix,
+    location2index,
+    location_names,
+):
+    _sweep_results = cvrp_utilities.sweep_savings(
+        distance_matrix=distance_matrix,
+        depot=location2index[depot],
+        capacity=CAPACITY,
+        lambdas=[0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0],
+        n_replicas=8,
+        seed=42,
+        max_workers=None,
+    )
+    print(
+        f"Best sweep run: λ = {_sweep_results.get('lambda')}, replica {_sweep_results.get('replica')}, "
+        f"{len(_sweep_results.get('routes'))} vehicles, {_sweep_results.get('distance'):.2f} miles"
+    )
+
+    sweep_routes = {
+        _cluster: [location_names[_idx] for _idx in _route]
+        for _cluster, _route in enumerate(_sweep_results.get('routes'), 1)
+    }
+
+    _sweep_results.get('runs').sort('distance').head(10)
+    return (sweep_routes,)
+
+
+@app.cell
+def _(coordinate_df, sweep_routes, visualize_solution):
+    visualize_solution(
+        cluster_routes=sweep_routes,
+        coordinate_df=coordinate_df,
+        figsize=(5, 8)
+    )
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ### Route Cache
+
+    Sequencing (Nearest Neighbor + 2-opt) results are memoized in a bounded LRU cache keyed by the set of customers,
+    the depot and a hash of the distance matrix. Repeated runs that produce the same cluster (re-sequencing after
+    the local search, capacity and λ sweeps, what-if analysis) reuse the stored route instead of solving it again.
+    Each process keeps its own cache, so the counters below only cover work done in this notebook's process.
+    """
+    )
+    return
+
+
+@app.cell
+def _(capacity_results, cvrp_utilities, improved_routes, sweep_routes):
+    # Reference the routing results so the counters are read after they ran
+    _ = (capacity_results, improved_routes, sweep_routes)
+    cvrp_utilities.ROUTE_CACHE.info()
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Vehicle Routing with Time Windows
+
+    Customers often have **delivery windows** [eᵢ, lᵢ] (service must start inside the window) and a **service time** sᵢ.
+    For illustration we generate windows for every customer: vehicles travel at 50 mph, each stop takes 15 minutes,
+    windows are 2 hours wide and open between 0 and 4 hours after the earliest possible arrival from the depot.
+    The depot is open for 16 hours.
+
+    With time windows the visiting order matters, so the merge step uses the classical route-end rule
+    (join the route **ending** in i with the route **starting** in j). Each route caches, for every stop:
+
+    - the **earliest** service start (forward pass),
+    - the **latest** service start that keeps all later stops on time (backward pass),
+    - the **forward time slack** (latest − earliest).
+
+    With these arrays, checking whether two routes can be joined or a customer can be inserted takes O(1)
+    instead of simulating the whole route. Routes are then re-sequenced with cheapest *feasible* insertion.
+    """
+    )
+    return
+
+
+@app.cell
+def _(depot, distance_matrix, location2index, np):
+    _rng = np.random.default_rng(42)
+    _depot_idx = location2index[depot]
+    _n_locations = distance_matrix.shape[0]
+
+    travel_times = distance_matrix / 50
+
+    service_times = np.full(_n_locations, 0.25)
+    service_times[_depot_idx] = 0
+
+    window_start = travel_times[_depot_idx] + _rng.uniform(0, 4, size=_n_locations)
+    window_end = window_start + 2
+    window_start[_depot_idx] = 0
+    window_end[_depot_idx] = 16
+    return service_times, travel_times, window_end, window_start
+
+
+@app.cell
+def _(
+    CAPACITY,
+    cvrp_utilities,
+    depot,
+    distance_matrix,
+    location2index,
+    location_names,
+    service_times,
+    travel_times,
+    window_end,
+    window_start,
+):
+    _depot_idx = location2index[depot]
+    _customers = [_idx for _idx in range(len(location_names)) if _idx != _depot_idx]
+    _customer1, _customer2, _ = cvrp_utilities.get_savings(
+        distance_matrix=distance_matrix,
+        depot=_depot_idx,
+        customers=_customers,
+    )
+
+    _tw_routes = cvrp_utilities.merge_routes_time_windows(
+        customer1=_customer1,
+        customer2=_customer2,
+        customers=_customers,
+        depot=_depot_idx,
+        capacity=CAPACITY,
+        travel_times=travel_times,
+        service_times=service_times,
+        window_start=window_start,
+        window_end=window_end,
+    )
+    _tw_routes = [
+        cvrp_utilities.sequence_route_time_windows(
+            route=_route,
+            depot=_depot_idx,
+            distance_matrix=distance_matrix,
+            travel_times=travel_times,
+            service_times=service_times,
+            window_start=window_start,
+            window_end=window_end,
+        )
+        for _route in _tw_routes
+    ]
+
+    _tw_distance = sum(
+        cvrp_utilities.get_route_distance([_depot_idx] + _route, distance_matrix)
+        for _route in _tw_routes
+    )
+    print(f'Time window routes: {len(_tw_routes)} vehicles, {_tw_distance:.2f} miles')
+
+    tw_routes = {
+        _cluster: [location_names[_idx] for _idx in [_depot_idx] + _route]
+        for _cluster, _route in enumerate(_tw_routes, 1)
+    }
+    return (tw_routes,)
+
+
 @app.cell
-def _(coordinate_df, routes, visualize_solution):
+def _(coordinate_df, tw_routes, visualize_solution):
     visualize_solution(
-        cluster_routes=routes, 
+        cluster_routes=tw_routes,
         coordinate_df=coordinate_df,
         figsize=(5, 8)
     )
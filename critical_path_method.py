@@ -26,9 +26,10 @@ def _(mo):
     ## Imports
 
     We use the following packages:
-    - **polars**: For efficient data loading and manipulation
+    - **polars**: For efficient data loading and predecessor parsing
+    - **numpy**: For the integer-indexed project network and the vectorized forward/backward passes
     - **matplotlib**: For creating the Gantt-style schedule visualization
-    - **collections**: For data structures (defaultdict, deque)
+    - **heapq**: For the topological-order work queue of the incremental what-if updates
     """
     )
     return
@@ -36,11 +37,15 @@ def _(mo):
 
 @app.cell
 def _():
+    import heapq
+
+    import numpy as np
     import polars as pl
     import matplotlib.pyplot as plt
-    from collections import defaultdict, deque
     import marimo as mo
-    return defaultdict, mo, pl, plt
+
+    import sbn_utilities
+    return heapq, mo, np, pl, plt, sbn_utilities
 
 
 @app.cell(hide_code=True)
@@ -52,20 +57,23 @@ def _(mo):
     This section contains all the functions that implement the CPM algorithm:
 
     1. **load_project_data**: Loads the CSV file with project data
-    2. **parse_predecessors**: Parses predecessor dependencies from strings
-    3. **calculate_early_times**: Forward pass - calculates ES and EF times
-    4. **calculate_late_times**: Backward pass - calculates LS and LF times
+    2. **build_project_network**: Parses predecessors into integer-indexed CSR arrays and computes a topological order
+       (level by level), so rows may come in any order
+    3. **calculate_early_times**: Forward pass - calculates ES and EF times (vectorized per topological level)
+    4. **calculate_late_times**: Backward pass - calculates LS and LF times (vectorized per topological level)
     5. **calculate_slack**: Computes slack time (float) for each task
     6. **find_critical_path**: Identifies tasks with zero slack
-    7. **print_results**: Displays formatted results table
-    8. **visualize_schedule**: Creates a Gantt chart visualization
+    7. **simulate_project**: Monte Carlo PERT simulation with triangular or beta-PERT durations
+    8. **IncrementalProjectCPM**: What-if updates: `set_duration(job, p)` re-propagates only the affected forward and backward cones
+    9. **print_results**: Displays formatted results table
+    10. **visualize_schedule**: Creates a Gantt chart visualization (drawn with the shared `sbn_utilities.plot_gantt` renderer)
     """
     )
     return
 
 
 @app.cell
-def _(defaultdict, pl, plt):
+def _(heapq, np, pl, plt, sbn_utilities):
     def load_project_data(filename):
         """
         Load project data from CSV file.
@@ -77,104 +85,158 @@ def _(defaultdict, pl, plt):
         return df
 
 
-    def parse_predecessors(pred_str):
+    def _segment_positions(ptr, nodes):
+        """Positions in a CSR index array of the segments of the given nodes, concatenated."""
+        starts = ptr[nodes]
+        lengths = ptr[nodes + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        return np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+
+
+    def build_project_network(df):
         """
-        Parse the predecessor string into a list of integers.
+        Build an integer-indexed project network from the project data.
+
+        Activity i is row i of df. Predecessor strings are parsed in one
+        vectorized pass, arcs are stored as CSR predecessor and successor
+        indices, and a topological order is computed level by level (Kahn's
+        algorithm), so the rows may come in any order.
 
         Args:
-            pred_str: String containing comma-separated predecessor job numbers
+            df: DataFrame with columns j (job), pj (duration), pred (comma-separated predecessors)
 
         Returns:
-            list: List of predecessor job numbers as integers
-        """
-        if pred_str is None or pred_str == "":
-            return []
-        return [int(p.strip()) for p in str(pred_str).split(",")]
-
+            dict: Arrays jobs, duration, pred_ptr/pred_index, succ_ptr/succ_index
+            (CSR, pred_index[pred_ptr[i]:pred_ptr[i + 1]] are the predecessors
+            of activity i) and levels, a list of activity index arrays where
+            every activity comes after all of its predecessors
 
-    def calculate_early_times(df):
+        Raises:
+            ValueError: For duplicate jobs, unknown predecessors or cycles
+        """
+        jobs = df['j'].to_numpy()
+        duration = df['pj'].to_numpy()
+        n = len(jobs)
+
+        arcs = (
+            df.with_row_index('target')
+            .select('target', pl.col('pred').cast(pl.Utf8).str.split(','))
+            .explode('pred')
+            .with_columns(pl.col('pred').str.strip_chars())
+            .filter(pl.col('pred').is_not_null() & (pl.col('pred') != ''))
+        )
+        target = arcs['target'].to_numpy().astype(np.int64)
+        pred_jobs = arcs['pred'].cast(pl.Int64).to_numpy()
+
+        # Map job numbers to row indices through the sorted job array
+        by_job = np.argsort(jobs, kind='stable')
+        sorted_jobs = jobs[by_job]
+        if n > 1 and np.any(sorted_jobs[1:] == sorted_jobs[:-1]):
+            raise ValueError("Duplicate job numbers in project data")
+        position = np.minimum(np.searchsorted(sorted_jobs, pred_jobs), max(n - 1, 0))
+        if len(pred_jobs) and np.any(sorted_jobs[position] != pred_jobs):
+            unknown = pred_jobs[sorted_jobs[position] != pred_jobs]
+            raise ValueError(f"Unknown predecessor jobs: {sorted(set(unknown.tolist()))[:10]}")
+        source = by_job[position]
+
+        order = np.argsort(target, kind='stable')
+        pred_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(target, minlength=n), out=pred_ptr[1:])
+        pred_index = source[order]
+
+        order = np.argsort(source, kind='stable')
+        succ_ptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(source, minlength=n), out=succ_ptr[1:])
+        succ_index = target[order]
+
+        # Kahn's algorithm, one vectorized step per level of the network
+        indegree = np.diff(pred_ptr)
+        frontier = np.flatnonzero(indegree == 0)
+        levels = []
+        visited = 0
+        while frontier.size:
+            levels.append(frontier)
+            visited += frontier.size
+            successors = succ_index[_segment_positions(succ_ptr, frontier)]
+            np.subtract.at(indegree, successors, 1)
+            frontier = np.unique(successors[indegree[successors] == 0])
+        if visited < n:
+            raise ValueError("Project network contains a cycle")
+
+        return {
+            'jobs': jobs,
+            'duration': duration,
+            'pred_ptr': pred_ptr,
+            'pred_index': pred_index,
+            'succ_ptr': succ_ptr,
+            'succ_index': succ_index,
+            'levels': levels,
+        }
+
+
+    def calculate_early_times(network):
         """
         Calculate Early Start (ES) and Early Finish (EF) times for all tasks.
 
         The early start is the earliest a task can begin (after all predecessors finish).
-        The early finish is early start + duration.
+        The early finish is early start + duration. Levels are processed in
+        topological order; within a level, ES is a segmented maximum over the
+        EF of the predecessors.
 
         Args:
-            df: DataFrame with project data
+            network: Project network from build_project_network
 
         Returns:
-            dict: Dictionary mapping job number to (ES, EF) tuple
+            tuple: (ES, EF) arrays indexed like network['jobs']
         """
-        # Dictionary to store ES and EF for each job
-        early_times = {}
-
-        # Process jobs in order (assumes jobs are numbered sequentially)
-        for row in df.iter_rows(named=True):
-            job = row['j']
-            duration = row['pj']
-            predecessors = parse_predecessors(row['pred'])
-
-            # Calculate Early Start (ES)
-            if not predecessors:
-                # No predecessors means this job can start at time 0
-                es = 0
-            else:
-                # ES is the maximum EF of all predecessors
-                es = max(early_times[pred][1] for pred in predecessors)
+        duration = network['duration']
+        pred_ptr, pred_index = network['pred_ptr'], network['pred_index']
 
-            # Calculate Early Finish (EF)
-            ef = es + duration
+        # Jobs without predecessors (the first level) start at time 0
+        es = np.zeros(len(duration), dtype=duration.dtype)
+        ef = duration.copy()
+        for nodes in network['levels'][1:]:
+            # Every job beyond the first level has at least one predecessor
+            counts = pred_ptr[nodes + 1] - pred_ptr[nodes]
+            positions = _segment_positions(pred_ptr, nodes)
+            es[nodes] = np.maximum.reduceat(ef[pred_index[positions]], np.cumsum(counts) - counts)
+            ef[nodes] = es[nodes] + duration[nodes]
 
-            early_times[job] = (es, ef)
+        return es, ef
 
-        return early_times
 
-
-    def calculate_late_times(df, early_times, project_duration):
+    def calculate_late_times(network, project_duration):
         """
         Calculate Late Start (LS) and Late Finish (LF) times for all tasks.
 
         The late finish is the latest a task can finish without delaying the project.
-        The late start is late finish - duration.
+        The late start is late finish - duration. Levels are processed in
+        reverse topological order.
 
         Args:
-            df: DataFrame with project data
-            early_times: Dictionary of early start/finish times
+            network: Project network from build_project_network
             project_duration: Total project duration (maximum EF)
 
         Returns:
-            dict: Dictionary mapping job number to (LS, LF) tuple
+            tuple: (LS, LF) arrays indexed like network['jobs']
         """
-        # Dictionary to store LS and LF for each job
-        late_times = {}
-
-        # Create a mapping of which jobs depend on each job (reverse dependencies)
-        successors = defaultdict(list)
-        for row in df.iter_rows(named=True):
-            job = row['j']
-            predecessors = parse_predecessors(row['pred'])
-            for pred in predecessors:
-                successors[pred].append(job)
-
-        # Process jobs in reverse order
-        jobs = df['j'].to_list()
-        for job in reversed(jobs):
-            duration = df.filter(pl.col('j') == job)['pj'][0]
-
-            # Calculate Late Finish (LF)
-            if job not in successors or not successors[job]:
-                # No successors means this is a final job
-                lf = project_duration
-            else:
-                # LF is the minimum LS of all successors
-                lf = min(late_times[succ][0] for succ in successors[job])
-
-            # Calculate Late Start (LS)
-            ls = lf - duration
+        duration = network['duration']
+        succ_ptr, succ_index = network['succ_ptr'], network['succ_index']
 
-            late_times[job] = (ls, lf)
+        # Jobs without successors are final jobs and finish at the project duration
+        lf = np.full(len(duration), project_duration, dtype=duration.dtype)
+        ls = lf - duration
+        for nodes in reversed(network['levels']):
+            counts = succ_ptr[nodes + 1] - succ_ptr[nodes]
+            nodes = nodes[counts > 0]
+            if not nodes.size:
+                continue
+            counts = counts[counts > 0]
+            positions = _segment_positions(succ_ptr, nodes)
+            lf[nodes] = np.minimum.reduceat(ls[succ_index[positions]], np.cumsum(counts) - counts)
+            ls[nodes] = lf[nodes] - duration[nodes]
 
-        return late_times
+        return ls, lf
 
 
     def calculate_slack(early_times, late_times):
@@ -185,37 +247,303 @@ def _(defaultdict, pl, plt):
         Tasks with zero slack are on the critical path.
 
         Args:
-            early_times: Dictionary of early start/finish times
-            late_times: Dictionary of late start/finish times
+            early_times: (ES, EF) arrays
+            late_times: (LS, LF) arrays
 
         Returns:
-            dict: Dictionary mapping job number to slack time
+            numpy.ndarray: Slack time of each task
         """
-        slack = {}
-        for job in early_times:
-            es, ef = early_times[job]
-            ls, lf = late_times[job]
-            slack[job] = ls - es  # or equivalently: lf - ef
+        return late_times[0] - early_times[0]  # or equivalently: LF - EF
 
-        return slack
 
-
-    def find_critical_path(df, slack):
+    def find_critical_path(network, early_times, slack):
         """
         Identify the critical path (tasks with zero slack).
 
         Args:
-            df: DataFrame with project data
-            slack: Dictionary of slack times
+            network: Project network from build_project_network
+            early_times: (ES, EF) arrays
+            slack: Slack array
 
         Returns:
-            list: List of job numbers on the critical path
+            numpy.ndarray: Job numbers on the critical path, in order of early start
+        """
+        critical = np.flatnonzero(np.isclose(slack, 0))
+        jobs = network['jobs'][critical]
+        return jobs[np.lexsort((jobs, early_times[0][critical]))]
+
+
+    def _sample_triangular(rng, optimistic, most_likely, pessimistic, size):
+        """Triangular durations by inverse transform (degenerate a = b ranges allowed)."""
+        spread = pessimistic - optimistic
+        u = rng.random(size)
+        mode = np.divide(most_likely - optimistic, spread, out=np.zeros_like(spread), where=spread > 0)
+        lower = optimistic + np.sqrt(u * spread * (most_likely - optimistic))
+        upper = pessimistic - np.sqrt((1 - u) * spread * (pessimistic - most_likely))
+        return np.where(u < mode, lower, upper)
+
+
+    def _sample_beta_pert(rng, optimistic, most_likely, pessimistic, size):
+        """Beta-PERT durations: a + (b - a) * Beta(1 + 4(m - a)/(b - a), 1 + 4(b - m)/(b - a))."""
+        spread = pessimistic - optimistic
+        alpha = 1 + 4 * np.divide(most_likely - optimistic, spread, out=np.zeros_like(spread), where=spread > 0)
+        beta = 1 + 4 * np.divide(pessimistic - most_likely, spread, out=np.zeros_like(spread), where=spread > 0)
+        return optimistic + spread * rng.beta(alpha, beta, size=size)
+
+
+    DURATION_DISTRIBUTIONS = {
+        'triangular': _sample_triangular,
+        'pert': _sample_beta_pert,
+    }
+
+
+    def simulate_project(
+        network,
+        optimistic,
+        most_likely,
+        pessimistic,
+        distribution='pert',
+        n_scenarios=10000,
+        quantiles=(0.5, 0.8, 0.9, 0.95),
+        max_memory_mb=256,
+        seed=None,
+    ):
         """
-        critical_jobs = [job for job, s in slack.items() if s == 0]
-        return sorted(critical_jobs)
+        Monte Carlo PERT simulation of the project duration.
+
+        Durations of all activities are sampled for a block of scenarios at
+        once, and every topological level of the forward and backward passes
+        is a segmented max/min over an activities x scenarios array (activity
+        rows are contiguous, so gathering predecessors copies whole rows).
+        Scenarios are processed in chunks so the working arrays, including
+        the gathered predecessor/successor rows of the widest level, stay
+        within max_memory_mb; durations are drawn scenario by scenario, so a
+        given seed gives the same result for any memory budget.
+
+        Args:
+            network: Project network from build_project_network
+            optimistic: Optimistic duration (a) of each activity
+            most_likely: Most likely duration (m) of each activity
+            pessimistic: Pessimistic duration (b) of each activity
+            distribution: Key of DURATION_DISTRIBUTIONS ('pert' or 'triangular')
+            n_scenarios: Number of simulated scenarios
+            quantiles: Completion time quantiles to report
+            max_memory_mb: Memory budget for the per-chunk arrays
+            seed: Random seed
 
+        Returns:
+            dict: completion_times (one per scenario), quantiles (DataFrame
+            with columns quantile and completion_time), mean, std and
+            criticality (fraction of scenarios in which each activity has
+            zero slack, indexed like network['jobs'])
+
+        Example:
+            >>> simulation = simulate_project(network, 0.8 * pj, pj, 1.5 * pj, n_scenarios=5000)
+            >>> simulation['quantiles']
+        """
+        optimistic, most_likely, pessimistic = (
+            np.asarray(values, dtype=np.float64) for values in (optimistic, most_likely, pessimistic)
+        )
+        if np.any(optimistic > most_likely) or np.any(most_likely > pessimistic):
+            raise ValueError("Durations must satisfy optimistic <= most_likely <= pessimistic")
+        if distribution not in DURATION_DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution '{distribution}', choose from {list(DURATION_DISTRIBUTIONS)}")
+        sample = DURATION_DISTRIBUTIONS[distribution]
+        rng = np.random.default_rng(seed)
+        n = len(network['jobs'])
+
+        # Arc positions and segment starts of every level, shared by all chunks
+        pred_ptr, pred_index = network['pred_ptr'], network['pred_index']
+        succ_ptr, succ_index = network['succ_ptr'], network['succ_index']
+        forward = []
+        for nodes in network['levels'][1:]:
+            counts = pred_ptr[nodes + 1] - pred_ptr[nodes]
+            forward.append((nodes, pred_index[_segment_positions(pred_ptr, nodes)], np.cumsum(counts) - counts))
+        backward = []
+        for nodes in reversed(network['levels']):
+            counts = succ_ptr[nodes + 1] - succ_ptr[nodes]
+            nodes, counts = nodes[counts > 0], counts[counts > 0]
+            if nodes.size:
+                backward.append((nodes, succ_index[_segment_positions(succ_ptr, nodes)], np.cumsum(counts) - counts))
+
+        # Per scenario: sampled and transposed durations, finish and late start
+        # arrays plus temporaries (~5 float64 values per activity) and the largest per-level gather of
+        # predecessor/successor rows (one float64 value per arc in that level)
+        max_gather = max((arcs.size for _, arcs, _ in forward + backward), default=0)
+        bytes_per_scenario = 8 * (5 * n + max_gather)
+        chunk_size = max(1, min(n_scenarios, int(max_memory_mb * 2**20 // max(bytes_per_scenario, 1))))
+        completion_times = np.empty(n_scenarios)
+        critical_counts = np.zeros(n, dtype=np.int64)
+
+        for start in range(0, n_scenarios, chunk_size):
+            # Drawn scenario-major so the random stream, and hence the result for a
+            # given seed, does not depend on the chunk size
+            size = (min(chunk_size, n_scenarios - start), n)
+            duration = np.ascontiguousarray(sample(rng, optimistic, most_likely, pessimistic, size).T)
+
+            # Forward pass: EF = max EF over predecessors + duration
+            ef = duration.copy()
+            for nodes, predecessors, segments in forward:
+                ef[nodes] = np.maximum.reduceat(ef[predecessors], segments, axis=0) + duration[nodes]
+            project_duration = ef.max(axis=0)
+
+            # Backward pass: LS = min LS over successors - duration
+            ls = project_duration - duration
+            for nodes, successors, segments in backward:
+                ls[nodes] = np.minimum.reduceat(ls[successors], segments, axis=0) - duration[nodes]
+
+            # Zero slack (LS = ES = EF - duration) up to floating point error
+            slack = ls - (ef - duration)
+            critical_counts += (slack <= 1e-9 * project_duration).sum(axis=1)
+            completion_times[start:start + size[0]] = project_duration
+
+        return {
+            'completion_times': completion_times,
+            'quantiles': pl.DataFrame({
+                'quantile': list(quantiles),
+                'completion_time': np.quantile(completion_times, quantiles),
+            }),
+            'mean': completion_times.mean(),
+            'std': completion_times.std(),
+            'criticality': critical_counts / n_scenarios,
+        }
+
+
+    class IncrementalProjectCPM:
+        """
+        Project CPM that is updated in place when activity durations change.
+
+        Holds the early start (head) of every activity and its tail, the
+        longest path from its finish to the end of the project, so that
+        LF = T - tail and LS = LF - duration for project duration T. A
+        duration change re-evaluates heads in its forward cone and tails in
+        its backward cone only, in topological (level) order with a heap, and
+        stops wherever a value does not change.
+
+        Example:
+            >>> cpm = IncrementalProjectCPM(build_project_network(df))
+            >>> changed, project_duration = cpm.set_duration(6, 15)
+        """
 
-    def print_results(df, early_times, late_times, slack, critical_path):
+        def __init__(self, network):
+            n = len(network['jobs'])
+            self.jobs = network['jobs'].tolist()
+            self.index = {job: i for i, job in enumerate(self.jobs)}
+            self.duration = network['duration'].tolist()
+            pred_ptr, succ_ptr = network['pred_ptr'].tolist(), network['succ_ptr'].tolist()
+            pred_index, succ_index = network['pred_index'].tolist(), network['succ_index'].tolist()
+            self.predecessors = [pred_index[pred_ptr[i]:pred_ptr[i + 1]] for i in range(n)]
+            self.successors = [succ_index[succ_ptr[i]:succ_ptr[i + 1]] for i in range(n)]
+            self.position = [0] * n
+            for level, nodes in enumerate(network['levels']):
+                for i in nodes.tolist():
+                    self.position[i] = level
+
+            es, ef = calculate_early_times(network)
+            ls, lf = calculate_late_times(network, ef.max() if n else 0)
+            self.head = es.tolist()
+            self.tail = ((ef.max() if n else 0) - lf).tolist()
+
+            # Finish times of the final activities; stale entries are skipped lazily
+            # and the heap is rebuilt once they outnumber the final activities
+            self._final = [i for i in range(n) if not self.successors[i]]
+            self._rebuild_finishes()
+
+        def _rebuild_finishes(self):
+            """Heap of (-early finish, activity) over the final activities, without stale entries."""
+            self._finishes = [(-self.head[i] - self.duration[i], i) for i in self._final]
+            heapq.heapify(self._finishes)
+
+        @property
+        def project_duration(self):
+            """Project duration (largest early finish)."""
+            finishes, head, duration = self._finishes, self.head, self.duration
+            while finishes and -finishes[0][0] != head[finishes[0][1]] + duration[finishes[0][1]]:
+                heapq.heappop(finishes)
+            return -finishes[0][0] if finishes else 0
+
+        def set_duration(self, job, duration):
+            """
+            Change the duration of one activity.
+
+            Args:
+                job: Job number
+                duration: New duration
+
+            Returns:
+                tuple: (changed, project_duration), the job numbers whose ES/EF
+                or tail (LS/LF relative to the project end) changed, including
+                job itself, and the new project duration. When the project
+                duration changes, the LS/LF of every activity shift by the
+                same amount.
+            """
+            i = self.index[job]
+            changed = {i}
+            if duration != self.duration[i]:
+                self.duration[i] = duration
+                changed.update(self._update_heads(self.successors[i]))
+                changed.update(self._update_tails(self.predecessors[i]))
+                for op in changed:
+                    if not self.successors[op]:
+                        heapq.heappush(self._finishes, (-self.head[op] - self.duration[op], op))
+                if len(self._finishes) > 2 * len(self._final):
+                    self._rebuild_finishes()
+            return sorted(self.jobs[op] for op in changed), self.project_duration
+
+        def _update_heads(self, changed):
+            """Re-evaluate heads downstream of changed activities in topological order."""
+            position, duration, head = self.position, self.duration, self.head
+            queued = set(changed)
+            heap = [(position[op], op) for op in queued]
+            heapq.heapify(heap)
+            updated = []
+
+            while heap:
+                _rank, op = heapq.heappop(heap)
+                new_head = max(head[pred] + duration[pred] for pred in self.predecessors[op])
+                if new_head == head[op]:
+                    continue
+                head[op] = new_head
+                updated.append(op)
+                for succ in self.successors[op]:
+                    if succ not in queued:
+                        queued.add(succ)
+                        heapq.heappush(heap, (position[succ], succ))
+            return updated
+
+        def _update_tails(self, changed):
+            """Re-evaluate tails upstream of changed activities in reverse topological order."""
+            position, duration, tail = self.position, self.duration, self.tail
+            queued = set(changed)
+            heap = [(-position[op], op) for op in queued]
+            heapq.heapify(heap)
+            updated = []
+
+            while heap:
+                _rank, op = heapq.heappop(heap)
+                new_tail = max(duration[succ] + tail[succ] for succ in self.successors[op])
+                if new_tail == tail[op]:
+                    continue
+                tail[op] = new_tail
+                updated.append(op)
+                for pred in self.predecessors[op]:
+                    if pred not in queued:
+                        queued.add(pred)
+                        heapq.heappush(heap, (-position[pred], pred))
+            return updated
+
+        def early_times(self):
+            """(ES, EF) arrays, indexed like the network."""
+            es = np.array(self.head)
+            return es, es + np.array(self.duration)
+
+        def late_times(self):
+            """(LS, LF) arrays, indexed like the network."""
+            lf = self.project_duration - np.array(self.tail)
+            return lf - np.array(self.duration), lf
+
+
+    def print_results(network, early_times, late_times, slack, critical_path):
         """
         Print the CPM analysis results in a formatted table.
         """
@@ -226,52 +554,53 @@ def _(defaultdict, pl, plt):
         print(f"{'Job':<6} {'Duration':<10} {'ES':<8} {'EF':<8} {'LS':<8} {'LF':<8} {'Slack':<8} {'Critical'}")
         print("-"*80)
 
-        for row in df.iter_rows(named=True):
-            job = row['j']
-            duration = row['pj']
-            es, ef = early_times[job]
-            ls, lf = late_times[job]
-            s = slack[job]
+        columns = (network['jobs'], network['duration'], *early_times, *late_times, slack)
+        for job, duration, es, ef, ls, lf, s in zip(*(column.tolist() for column in columns)):
             is_critical = "YES" if s == 0 else ""
 
             print(f"{job:<6} {duration:<10} {es:<8} {ef:<8} {ls:<8} {lf:<8} {s:<8} {is_critical}")
 
         print()
-        print(f"Project Duration: {max(ef for es, ef in early_times.values())} time units")
+        print(f"Project Duration: {early_times[1].max()} time units")
         print(f"Critical Path: {' -> '.join(map(str, critical_path))}")
         print("="*80)
 
 
-    def visualize_schedule(df, early_times, late_times, slack):
+    def visualize_schedule(network, early_times, late_times, slack):
         """
         Create a Gantt-style chart showing the project schedule.
         """
-        jobs = df['j'].to_list()
-
-        fig, ax = plt.subplots(figsize=(12, len(jobs) * 0.5))
-
-        # Plot each job
-        for i, job in enumerate(jobs):
-            es, ef = early_times[job]
-            ls, lf = late_times[job]
-            duration = ef - es
-            s = slack[job]
-
-            # Color based on whether job is critical
-            color = 'red' if s == 0 else 'lightblue'
-
-            # Draw the early start bar
-            ax.barh(i, duration, left=es, height=0.4, color=color,
-                    edgecolor='black', label='Critical' if s == 0 and i == 0 else '')
-
-            # Draw slack as a lighter bar if it exists
-            if s > 0:
-                ax.barh(i, s, left=ef, height=0.4, color='lightgray',
-                        edgecolor='gray', alpha=0.5)
+        jobs = network['jobs'].tolist()
+        rows = range(len(jobs))
+        early_start, early_finish = (times.tolist() for times in early_times)
+        job_slack = slack.tolist()
+
+        # Early start bars, colored by whether the job is critical
+        fig, ax = sbn_utilities.plot_gantt(
+            rows=rows,
+            starts=early_start,
+            durations=[ef - es for es, ef in zip(early_start, early_finish)],
+            row_labels=[f"Job {j}" for j in jobs],
+            colors=['red' if s == 0 else 'lightblue' for s in job_slack],
+            height=0.4,
+            figsize=(12, len(jobs) * 0.5),
+        )
+
+        # Draw slack as lighter bars for jobs that have it
+        has_slack = [i for i in rows if job_slack[i] > 0]
+        sbn_utilities.plot_gantt(
+            rows=has_slack,
+            starts=[early_finish[i] for i in has_slack],
+            durations=[job_slack[i] for i in has_slack],
+            row_labels=[f"Job {j}" for j in jobs],
+            colors=['lightgray'] * len(has_slack),
+            ax=ax,
+            height=0.4,
+            edgecolor='gray',
+            alpha=0.5,
+        )
 
         # Formatting
-        ax.set_yticks(range(len(jobs)))
-        ax.set_yticklabels([f"Job {j}" for j in jobs])
         ax.set_xlabel('Time Units')
         ax.set_title('Project Schedule (CPM)')
         ax.grid(axis='x', alpha=0.3)
@@ -288,12 +617,16 @@ def _(defaultdict, pl, plt):
         plt.tight_layout()
         return fig
     return (
+        DURATION_DISTRIBUTIONS,
+        IncrementalProjectCPM,
+        build_project_network,
         calculate_early_times,
         calculate_late_times,
         calculate_slack,
         find_critical_path,
         load_project_data,
         print_results,
+        simulate_project,
         visualize_schedule,
     )
 
@@ -320,6 +653,7 @@ def _(mo):
 
 @app.cell
 def _(
+    build_project_network,
     calculate_early_times,
     calculate_late_times,
     calculate_slack,
@@ -332,31 +666,32 @@ def _(
     # Load the project data
     print("Loading project data from 'project_data.csv'...")
     _df = load_project_data('data/project_data.csv')
+    _network = build_project_network(_df)
 
     # Calculate early times (forward pass)
     print("Calculating early start and finish times...")
-    _early_times = calculate_early_times(_df)
+    _early_times = calculate_early_times(_network)
 
     # Determine project duration
-    _project_duration = max(ef for es, ef in _early_times.values())
+    _project_duration = _early_times[1].max()
 
     # Calculate late times (backward pass)
     print("Calculating late start and finish times...")
-    _late_times = calculate_late_times(_df, _early_times, _project_duration)
+    _late_times = calculate_late_times(_network, _project_duration)
 
     # Calculate slack
     print("Calculating slack times...")
     _slack = calculate_slack(_early_times, _late_times)
 
     # Find critical path
-    _critical_path = find_critical_path(_df, _slack)
+    _critical_path = find_critical_path(_network, _early_times, _slack)
 
     # Print results
-    print_results(_df, _early_times, _late_times, _slack, _critical_path)
+    print_results(_network, _early_times, _late_times, _slack, _critical_path)
 
     # Visualize schedule
     print("\nGenerating schedule visualization...")
-    _fig = visualize_schedule(_df, _early_times, _late_times, _slack)
+    _fig = visualize_schedule(_network, _early_times, _late_times, _slack)
 
     mo.mpl.interactive(_fig)
     return
@@ -379,6 +714,111 @@ def _(mo):
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## What-If Analysis
+
+    `IncrementalProjectCPM` keeps the schedule of the project in memory. Changing a duration with
+    `set_duration(job, p)` updates early starts downstream of the job and tails (time from an activity's finish to the
+    project end) upstream of it, stopping wherever nothing changes, so a what-if edit costs time proportional to the
+    part of the network it affects instead of a full rerun.
+    """
+    )
+    return
+
+
+@app.cell
+def _(
+    IncrementalProjectCPM,
+    build_project_network,
+    calculate_slack,
+    find_critical_path,
+    load_project_data,
+):
+    _network = build_project_network(load_project_data('data/project_data.csv'))
+    _what_if = IncrementalProjectCPM(_network)
+    print(f"Baseline project duration: {_what_if.project_duration}")
+
+    # Delay a critical job, then shorten a job with slack
+    for _job, _duration in ((6, 15), (5, 3)):
+        _changed, _project_duration = _what_if.set_duration(_job, _duration)
+        _early_times = _what_if.early_times()
+        _slack = calculate_slack(_early_times, _what_if.late_times())
+        print(f"Job {_job} -> {_duration}: project duration {_project_duration}, updated jobs {_changed}, "
+              f"critical path {' -> '.join(map(str, find_critical_path(_network, _early_times, _slack)))}")
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Stochastic Durations (Monte Carlo PERT)
+
+    Real durations are uncertain. `simulate_project` replaces each `pj` with a three-point estimate
+    (optimistic `a`, most likely `m`, pessimistic `b`) and samples thousands of scenarios at once:
+    - **Distributions**: `'triangular'` or `'pert'` (beta-PERT, mean (a + 4m + b) / 6)
+    - Each topological level of the forward and backward passes is one vectorized max/min over an
+      (n_scenarios × n_activities) array; scenarios are processed in chunks within `max_memory_mb`
+    - **Completion time quantiles** give the duration that is met with a given probability
+    - **Criticality index**: the fraction of scenarios in which an activity is on the critical path
+
+    Without `a`/`m`/`b` columns in the data, the estimates below default to (0.8 pj, pj, 1.5 pj).
+    """
+    )
+    return
+
+
+@app.cell
+def _(DURATION_DISTRIBUTIONS, build_project_network, load_project_data, pl, simulate_project):
+    _df = load_project_data('data/project_data.csv')
+    _network = build_project_network(_df)
+    _pj = _network['duration'].astype(float)
+    _optimistic, _most_likely, _pessimistic = (
+        _df[column].to_numpy() if column in _df.columns else default
+        for column, default in (('a', 0.8 * _pj), ('m', _pj), ('b', 1.5 * _pj))
+    )
+
+    _quantiles, _criticality = [], {'j': _network['jobs']}
+    for _distribution in DURATION_DISTRIBUTIONS:
+        _simulation = simulate_project(
+            _network, _optimistic, _most_likely, _pessimistic,
+            distribution=_distribution, n_scenarios=20000, seed=42,
+        )
+        print(f"{_distribution}: mean completion time {_simulation['mean']:.1f} (std {_simulation['std']:.1f})")
+        _quantiles.append(_simulation['quantiles'].with_columns(pl.lit(_distribution).alias('distribution')))
+        _criticality[_distribution] = _simulation['criticality']
+
+    simulation_quantiles = pl.concat(_quantiles).pivot(on='distribution', index='quantile', values='completion_time')
+    criticality_index = pl.DataFrame(_criticality)
+    simulation_quantiles
+    return (criticality_index,)
+
+
+@app.cell
+def _(criticality_index):
+    # Activities that are critical in at least one scenario, most often critical first
+    criticality_index.filter(criticality_index['pert'] > 0).sort('pert', descending=True)
+    return
+
+
+@app.cell
+def _(build_project_network, load_project_data, simulate_project):
+    # Durations are drawn scenario by scenario, so a fixed seed gives the same
+    # result whether the scenarios fit in one chunk or are split into many
+    _network = build_project_network(load_project_data('data/project_data.csv'))
+    _pj = _network['duration'].astype(float)
+    _unchunked, _chunked = (
+        simulate_project(_network, 0.8 * _pj, _pj, 1.5 * _pj, n_scenarios=3000, seed=7, max_memory_mb=_budget)
+        for _budget in (256, 0.01)
+    )
+    assert _unchunked['quantiles'].equals(_chunked['quantiles']), "Chunking changed the simulated quantiles"
+    print(f"Quantiles identical with and without chunking: {_unchunked['quantiles']['completion_time'].to_list()}")
+    return
+
+
 @app.cell
 def _():
     return
@@ -0,0 +1,1083 @@
+"""
+Capacitated Vehicle Routing Problem (CVRP) utilities.
+
+This module provides index-based helpers for the Clarke-Wright savings
+notebook. Locations are referred to by their row position in a dense
+distance matrix (the depot included), which keeps the heavy loops on
+plain integer arrays instead of repeatedly filtering Polars frames.
+"""
+
+import hashlib
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import polars as pl
+from sklearn.metrics.pairwise import haversine_distances
+
+from cache_utilities import LRUCache
+
+
+EARTH_RADIUS_MILES = 3963.1
+
+# Read-only data shared with pool workers through _init_worker
+_WORKER_STATE = {}
+
+# Digests of live distance matrices, keyed by id() and guarded by a weakref;
+# entries are dropped by the weakref callback when their matrix is freed
+# (ndarrays are unhashable, so a WeakKeyDictionary cannot hold them)
+_MATRIX_DIGESTS = {}
+
+
+def get_distance_matrix(coordinate_df: pl.DataFrame) -> Tuple[np.ndarray, List[str]]:
+    """
+    Build a dense Haversine distance matrix (in miles) for all locations.
+
+    Args:
+        coordinate_df: A Polars DataFrame with "city", "lat" and "lng" columns
+
+    Returns:
+        Tuple of (distance_matrix, cities) where distance_matrix[i, j] is the
+        distance from cities[i] to cities[j]
+    """
+    X = coordinate_df.select(
+        pl.col('lat').radians(),
+        pl.col('lng').radians(),
+    ).to_numpy()
+
+    distance_matrix = EARTH_RADIUS_MILES * haversine_distances(X=X, Y=X)
+
+    return distance_matrix, coordinate_df['city'].to_list()
+
+
+def get_route_distance(route: Sequence[int], distance_matrix: np.ndarray) -> float:
+    """
+    Calculate the length of a closed route (returning to its first location).
+
+    Args:
+        route: Location indices in visiting order
+        distance_matrix: Dense distance matrix
+
+    Returns:
+        Total route distance including the closing arc back to route[0]
+    """
+    if len(route) < 2:
+        return 0.0
+    route = np.asarray(route)
+    return float(distance_matrix[route, np.roll(route, -1)].sum())
+
+
+def nearest_neighbor_route(distance_matrix: np.ndarray, start: int = 0) -> List[int]:
+    """
+    Sequence all locations of a distance matrix with the nearest neighbor rule.
+
+    Args:
+        distance_matrix: Dense distance matrix
+        start: Index of the starting location
+
+    Returns:
+        List of location indices beginning with start
+    """
+    n_locations = distance_matrix.shape[0]
+    visited = np.zeros(n_locations, dtype=bool)
+    visited[start] = True
+
+    route = [start]
+    current_location = start
+    for _ in range(n_locations - 1):
+        # Mask visited locations so argmin only considers unvisited ones
+        candidate_distances = np.where(visited, np.inf, distance_matrix[current_location])
+        current_location = int(np.argmin(candidate_distances))
+        visited[current_location] = True
+        route.append(current_location)
+
+    return route
+
+
+def two_opt(route: Sequence[int], distance_matrix: np.ndarray) -> List[int]:
+    """
+    Improve a closed route with exhaustive 2-opt (segment reversal) moves.
+
+    The first location of the route (the depot) stays fixed. Improving moves
+    are applied as soon as they are found and the scan restarts until no
+    reversal shortens the route. Distances are assumed to be symmetric.
+
+    Args:
+        route: Location indices in visiting order
+        distance_matrix: Dense distance matrix
+
+    Returns:
+        A 2-opt locally optimal route with the same first location
+    """
+    route = list(route)
+    n_locations = len(route)
+    if n_locations < 4:
+        return route
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n_locations - 1):
+            a, b = route[i - 1], route[i]
+            for j in range(i + 1, n_locations):
+                c, d = route[j], route[(j + 1) % n_locations]
+                delta = (
+                    distance_matrix[a, c]
+                    + distance_matrix[b, d]
+                    - distance_matrix[a, b]
+                    - distance_matrix[c, d]
+                )
+                if delta < -1e-9:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    b = route[i]
+                    improved = True
+
+    return route
+
+
+class RouteSolutionCache(LRUCache):
+    """
+    Bounded LRU cache of sequenced routes.
+
+    Keys are content based: the frozen set of customer indices, the depot
+    and a digest of the distance matrix. Identical clusters produced by
+    different runs (capacity sweeps, λ sweeps, what-if analysis) are
+    therefore sequenced only once per process.
+
+    Bounded and counted by cache_utilities.LRUCache (maxsize, hits,
+    misses, clear() and info()); routes are stored as tuples and handed
+    out as fresh lists.
+    """
+
+    def get(self, key) -> Optional[List[int]]:
+        """Return a copy of the cached route for key (or None) and update the counters."""
+        route = super().get(key)
+        return None if route is None else list(route)
+
+    def put(self, key, route: Sequence[int]) -> None:
+        """Store a route, evicting the least recently used entry when full."""
+        super().put(key, tuple(route))
+
+
+ROUTE_CACHE = RouteSolutionCache()
+
+
+def get_matrix_digest(distance_matrix: np.ndarray) -> str:
+    """
+    Content digest of a distance matrix, computed once per matrix object.
+
+    Args:
+        distance_matrix: Dense distance matrix
+
+    Returns:
+        Hex digest identifying the matrix contents
+    """
+    entry = _MATRIX_DIGESTS.get(id(distance_matrix))
+    if entry is not None and entry[0]() is distance_matrix:
+        return entry[1]
+
+    digest = hashlib.blake2b(np.ascontiguousarray(distance_matrix).tobytes(), digest_size=16).hexdigest()
+    key = id(distance_matrix)
+    try:
+        reference = weakref.ref(distance_matrix, lambda reference: _forget_matrix_digest(key, reference))
+    except TypeError:
+        return digest
+    _MATRIX_DIGESTS[key] = (reference, digest)
+    return digest
+
+
+def _forget_matrix_digest(key: int, reference: weakref.ref) -> None:
+    """Drop the digest of a freed matrix (unless its id already holds a newer entry)."""
+    entry = _MATRIX_DIGESTS.get(key)
+    if entry is not None and entry[0] is reference:
+        del _MATRIX_DIGESTS[key]
+
+
+def _route_cache_key(customers: Sequence[int], depot: int, distance_matrix: np.ndarray) -> tuple:
+    return frozenset(customers), depot, get_matrix_digest(distance_matrix)
+
+
+def _sequence_submatrix(sub_matrix: np.ndarray) -> List[int]:
+    """Nearest neighbor plus 2-opt on a route-local matrix (depot at index 0)."""
+    return two_opt(nearest_neighbor_route(sub_matrix, start=0), sub_matrix)
+
+
+def _route_nodes(customers: Sequence[int], depot: int) -> List[int]:
+    """Depot followed by the customers in sorted order (independent of input order)."""
+    return [depot] + sorted(set(customers) - {depot})
+
+
+def sequence_route(
+    customers: Sequence[int],
+    depot: int,
+    distance_matrix: np.ndarray,
+    use_cache: bool = True,
+) -> List[int]:
+    """
+    Sequence a single cluster of customers into a depot-based route.
+
+    Only the rows and columns of the cluster are sliced out of the distance
+    matrix, so the work is proportional to the route size rather than to
+    the full problem. Results are memoized in ROUTE_CACHE.
+
+    Args:
+        customers: Customer location indices served by the route
+        depot: Depot location index
+        distance_matrix: Dense distance matrix for all locations
+        use_cache: Look up and store the route in ROUTE_CACHE
+
+    Returns:
+        List of location indices starting at the depot
+    """
+    nodes = _route_nodes(customers, depot)
+
+    if use_cache:
+        key = _route_cache_key(nodes[1:], depot, distance_matrix)
+        route = ROUTE_CACHE.get(key)
+        if route is not None:
+            return route
+
+    sub_matrix = distance_matrix[np.ix_(nodes, nodes)]
+    route = [nodes[i] for i in _sequence_submatrix(sub_matrix)]
+
+    if use_cache:
+        ROUTE_CACHE.put(key, route)
+    return route
+
+
+def sequence_routes(
+    clusters: Sequence[Sequence[int]],
+    depot: int,
+    distance_matrix: np.ndarray,
+    max_workers: Optional[int] = 1,
+    use_cache: bool = True,
+) -> List[List[int]]:
+    """
+    Sequence many clusters independently, optionally across a process pool.
+
+    Each cluster is reduced to its own small distance matrix before being
+    dispatched, so workers never receive the full matrix. Clusters already
+    in ROUTE_CACHE are not dispatched at all.
+
+    Args:
+        clusters: Customer location indices for each route
+        depot: Depot location index
+        distance_matrix: Dense distance matrix for all locations
+        max_workers: Number of worker processes (1 runs serially in the
+            calling process, None uses all CPUs)
+        use_cache: Look up and store routes in ROUTE_CACHE
+
+    Returns:
+        List of routes (each starting at the depot) in the order of clusters
+
+    Example:
+        >>> routes = sequence_routes([[1, 4], [2, 3]], depot=0, distance_matrix=D)
+        >>> routes[0][0]
+        0
+    """
+    nodes_list = [_route_nodes(customers, depot) for customers in clusters]
+
+    routes = [None] * len(nodes_list)
+    keys = [None] * len(nodes_list)
+    if use_cache:
+        for idx, nodes in enumerate(nodes_list):
+            keys[idx] = _route_cache_key(nodes[1:], depot, distance_matrix)
+            routes[idx] = ROUTE_CACHE.get(keys[idx])
+
+    pending = [idx for idx, route in enumerate(routes) if route is None]
+    sub_matrices = [distance_matrix[np.ix_(nodes_list[idx], nodes_list[idx])] for idx in pending]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(sub_matrices))
+
+    if max_workers <= 1:
+        local_routes = [_sequence_submatrix(sub_matrix) for sub_matrix in sub_matrices]
+    else:
+        chunksize = max(1, len(sub_matrices) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            local_routes = list(executor.map(_sequence_submatrix, sub_matrices, chunksize=chunksize))
+
+    for idx, local_route in zip(pending, local_routes):
+        routes[idx] = [nodes_list[idx][i] for i in local_route]
+        if use_cache:
+            ROUTE_CACHE.put(keys[idx], routes[idx])
+
+    return routes
+
+
+def get_nearest_customers(
+    distance_matrix: np.ndarray,
+    customers: Sequence[int],
+    k: int,
+) -> dict:
+    """
+    Build granular candidate lists of the k nearest customers of each customer.
+
+    Args:
+        distance_matrix: Dense distance matrix for all locations
+        customers: Customer location indices (the depot excluded)
+        k: Number of neighbors to keep per customer
+
+    Returns:
+        Dictionary mapping each customer to a list of its k nearest customers
+    """
+    customers = np.asarray(customers)
+    sub_matrix = distance_matrix[np.ix_(customers, customers)].copy()
+    np.fill_diagonal(sub_matrix, np.inf)
+
+    k = min(k, len(customers) - 1)
+    if k <= 0:
+        return {int(c): [] for c in customers}
+
+    nearest = np.argpartition(sub_matrix, k - 1, axis=1)[:, :k]
+    nearest_distances = np.take_along_axis(sub_matrix, nearest, axis=1)
+    nearest = np.take_along_axis(nearest, np.argsort(nearest_distances, axis=1), axis=1)
+
+    return {
+        int(customer): customers[row].tolist()
+        for customer, row in zip(customers, nearest)
+    }
+
+
+class RouteCache:
+    """
+    Routes with cached loads, lengths and customer positions.
+
+    Routes are stored without the depot; the depot is implied before the
+    first and after the last customer. The cache keeps, for every route,
+    its load, prefix loads and length, and for every customer the route
+    and position it occupies, so neighbors and move deltas are O(1).
+    Only the routes touched by a move are refreshed.
+    """
+
+    def __init__(
+        self,
+        routes: Sequence[Sequence[int]],
+        depot: int,
+        distance_matrix: np.ndarray,
+        demands: np.ndarray,
+    ):
+        self.depot = depot
+        self.distance_matrix = distance_matrix
+        self.demands = demands
+        self.routes = [[c for c in route if c != depot] for route in routes]
+
+        n_locations = distance_matrix.shape[0]
+        self.route_of = [-1] * n_locations
+        self.position_of = [-1] * n_locations
+        self.loads = [0.0] * len(self.routes)
+        self.prefix_loads = [[] for _ in self.routes]
+        self.lengths = [0.0] * len(self.routes)
+
+        for r in range(len(self.routes)):
+            self.refresh(r)
+
+    def refresh(self, r: int):
+        """Recompute the cached values for route r."""
+        route = self.routes[r]
+        for position, customer in enumerate(route):
+            self.route_of[customer] = r
+            self.position_of[customer] = position
+
+        self.prefix_loads[r] = np.cumsum(self.demands[route]).tolist() if route else []
+        self.loads[r] = self.prefix_loads[r][-1] if route else 0.0
+        self.lengths[r] = get_route_distance([self.depot] + route, self.distance_matrix) if route else 0.0
+
+    def prev(self, customer: int) -> int:
+        """Location visited before customer (the depot for the first customer)."""
+        position = self.position_of[customer]
+        if position == 0:
+            return self.depot
+        return self.routes[self.route_of[customer]][position - 1]
+
+    def next(self, customer: int) -> int:
+        """Location visited after customer (the depot for the last customer)."""
+        route = self.routes[self.route_of[customer]]
+        position = self.position_of[customer]
+        if position == len(route) - 1:
+            return self.depot
+        return route[position + 1]
+
+    def load_through(self, customer: int) -> float:
+        """Load of the route up to and including customer."""
+        return self.prefix_loads[self.route_of[customer]][self.position_of[customer]]
+
+    def to_routes(self) -> List[List[int]]:
+        """Depot-started routes, with emptied routes dropped."""
+        return [[self.depot] + route for route in self.routes if route]
+
+
+def _best_inter_route_move(cache: RouteCache, u: int, candidates: Sequence[int], capacity: float):
+    """Evaluate relocate, exchange and 2-opt* moves of u against its candidates."""
+    D = cache.distance_matrix
+    demands = cache.demands
+
+    ru = cache.route_of[u]
+    pu, nu = cache.prev(u), cache.next(u)
+    remove_gain = D[pu, u] + D[u, nu] - D[pu, nu]
+
+    best_delta, best_move = -1e-9, None
+    for v in candidates:
+        rv = cache.route_of[v]
+        if rv == ru:
+            continue
+        pv, nv = cache.prev(v), cache.next(v)
+
+        # Relocate u next to v (before or after it)
+        if cache.loads[rv] + demands[u] <= capacity:
+            delta = D[pv, u] + D[u, v] - D[pv, v] - remove_gain
+            if delta < best_delta:
+                best_delta, best_move = delta, ('relocate', u, v, 0)
+            delta = D[v, u] + D[u, nv] - D[v, nv] - remove_gain
+            if delta < best_delta:
+                best_delta, best_move = delta, ('relocate', u, v, 1)
+
+        # Exchange u and v between their routes
+        if (
+            cache.loads[ru] - demands[u] + demands[v] <= capacity
+            and cache.loads[rv] - demands[v] + demands[u] <= capacity
+        ):
+            delta = (
+                D[pu, v] + D[v, nu] - D[pu, u] - D[u, nu]
+                + D[pv, u] + D[u, nv] - D[pv, v] - D[v, nv]
+            )
+            if delta < best_delta:
+                best_delta, best_move = delta, ('exchange', u, v, 0)
+
+        # 2-opt*: join the head of ru ending in u with the tail of rv starting at v
+        head_u = cache.load_through(u)
+        head_v = cache.load_through(v) - demands[v]
+        if (
+            head_u + cache.loads[rv] - head_v <= capacity
+            and head_v + cache.loads[ru] - head_u <= capacity
+        ):
+            delta = D[u, v] + D[pv, nu] - D[u, nu] - D[pv, v]
+            if delta < best_delta:
+                best_delta, best_move = delta, ('2-opt*', u, v, 0)
+
+    return best_delta, best_move
+
+
+def _apply_inter_route_move(cache: RouteCache, move) -> None:
+    """Apply a move returned by _best_inter_route_move and refresh both routes."""
+    kind, u, v, after = move
+    ru, rv = cache.route_of[u], cache.route_of[v]
+    i, j = cache.position_of[u], cache.position_of[v]
+    route_u, route_v = cache.routes[ru], cache.routes[rv]
+
+    if kind == 'relocate':
+        del route_u[i]
+        route_v.insert(j + after, u)
+    elif kind == 'exchange':
+        route_u[i], route_v[j] = v, u
+    else:
+        cache.routes[ru] = route_u[:i + 1] + route_v[j:]
+        cache.routes[rv] = route_v[:j] + route_u[i + 1:]
+
+    cache.refresh(ru)
+    cache.refresh(rv)
+
+
+def improve_routes(
+    routes: Sequence[Sequence[int]],
+    depot: int,
+    distance_matrix: np.ndarray,
+    capacity: float,
+    demands: Optional[np.ndarray] = None,
+    n_neighbors: int = 10,
+    max_passes: Optional[int] = None,
+) -> List[List[int]]:
+    """
+    Improve a set of routes with inter-route local search.
+
+    Three move types are applied between routes: relocate (move a customer
+    next to a neighbor in another route), exchange (swap two customers in
+    different routes) and 2-opt* (swap route tails). Only the k nearest
+    customers of each customer are considered as move partners (granular
+    neighborhoods), and every move is evaluated in O(1) from the cached
+    loads, lengths and positions of a RouteCache. For each customer the best
+    improving move is applied; passes repeat until no move improves.
+
+    Args:
+        routes: Routes as location indices starting at the depot
+        depot: Depot location index
+        distance_matrix: Dense distance matrix for all locations
+        capacity: Vehicle capacity
+        demands: Demand per location index (defaults to 1 per customer,
+            matching a capacity expressed as a number of customers)
+        n_neighbors: Size of the granular candidate list per customer
+        max_passes: Optional limit on the number of passes over all customers
+
+    Returns:
+        List of improved routes starting at the depot (empty routes removed)
+    """
+    if demands is None:
+        demands = np.ones(distance_matrix.shape[0])
+    demands = np.asarray(demands, dtype=float)
+
+    cache = RouteCache(routes, depot, distance_matrix, demands)
+    customers = [c for route in cache.routes for c in route]
+    if not customers:
+        return cache.to_routes()
+    candidates = get_nearest_customers(distance_matrix, customers, n_neighbors)
+
+    n_passes = 0
+    improved = True
+    while improved and (max_passes is None or n_passes < max_passes):
+        improved = False
+        n_passes += 1
+        for u in customers:
+            _delta, move = _best_inter_route_move(cache, u, candidates[u], capacity)
+            if move is not None:
+                _apply_inter_route_move(cache, move)
+                improved = True
+
+    return cache.to_routes()
+
+
+def _init_worker(state: dict) -> None:
+    """Pool initializer: receive shared read-only arrays once per worker process."""
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(state)
+
+
+def get_savings(
+    distance_matrix: np.ndarray,
+    depot: int,
+    customers: Sequence[int],
+    lam: float = 1.0,
+    rng: Optional[np.random.Generator] = None,
+    noise: float = 0.0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate and sort Clarke-Wright savings for all customer pairs.
+
+    Uses the generalized (parametric) savings
+
+    s(i, j) = d(depot, i) + d(j, depot) - λ·d(i, j)
+
+    which reduces to the classical savings for λ = 1. When a random number
+    generator is given, the pairs are shuffled before the stable sort (so
+    ties are broken randomly) and, if noise > 0, each saving is multiplied
+    by a factor drawn uniformly from [1 - noise, 1 + noise].
+
+    Args:
+        distance_matrix: Dense distance matrix for all locations
+        depot: Depot location index
+        customers: Customer location indices
+        lam: Route shape parameter λ weighting the customer-to-customer distance
+        rng: Optional NumPy random generator for randomized replicas
+        noise: Relative perturbation applied to the savings when rng is given
+
+    Returns:
+        Tuple of (customer1, customer2, savings) arrays sorted by savings in
+        descending order
+    """
+    customers = np.asarray(customers)
+    first, second = np.triu_indices(len(customers), k=1)
+    customer1, customer2 = customers[first], customers[second]
+
+    savings = (
+        distance_matrix[depot, customer1]
+        + distance_matrix[customer2, depot]
+        - lam * distance_matrix[customer1, customer2]
+    )
+
+    if rng is not None:
+        shuffle = rng.permutation(len(savings))
+        customer1, customer2, savings = customer1[shuffle], customer2[shuffle], savings[shuffle]
+        if noise > 0:
+            savings = savings * rng.uniform(1 - noise, 1 + noise, size=len(savings))
+
+    order = np.argsort(-savings, kind='stable')
+
+    return customer1[order], customer2[order], savings[order]
+
+
+def merge_clusters(
+    customer1: np.ndarray,
+    customer2: np.ndarray,
+    customers: Sequence[int],
+    capacity: float,
+    demands: np.ndarray,
+) -> List[List[int]]:
+    """
+    Replay the Clarke-Wright merge for one capacity over presorted savings.
+
+    Pairs are processed in the given order; the clusters of the two customers
+    are merged whenever they differ and their combined load fits.
+
+    Args:
+        customer1: First customer of each pair, in savings order
+        customer2: Second customer of each pair, in savings order
+        customers: Customer location indices (defines the initial clusters)
+        capacity: Vehicle capacity
+        demands: Demand per location index
+
+    Returns:
+        List of clusters (customer location indices), in order of creation
+    """
+    cluster_of = {c: c for c in customers}
+    members = {c: [c] for c in customers}
+    loads = {c: demands[c] for c in customers}
+
+    for c1, c2 in zip(customer1.tolist(), customer2.tolist()):
+        a, b = cluster_of[c1], cluster_of[c2]
+        if a != b and loads[a] + loads[b] <= capacity:
+            for c in members[b]:
+                cluster_of[c] = a
+            members[a].extend(members.pop(b))
+            loads[a] += loads.pop(b)
+
+    return list(members.values())
+
+
+def _solve_capacity(
+    capacity: float,
+    customer1: np.ndarray,
+    customer2: np.ndarray,
+    customers: Sequence[int],
+    depot: int,
+    distance_matrix: np.ndarray,
+    demands: np.ndarray,
+) -> dict:
+    """Merge and sequence the routes for a single capacity."""
+    clusters = merge_clusters(customer1, customer2, customers, capacity, demands)
+    routes = [sequence_route(cluster, depot, distance_matrix) for cluster in clusters]
+
+    return {
+        'capacity': capacity,
+        'n_vehicles': len(routes),
+        'distance': sum(get_route_distance(route, distance_matrix) for route in routes),
+        'routes': routes,
+    }
+
+
+def _solve_capacity_worker(capacity: float) -> dict:
+    """Pool entry point for _solve_capacity using the shared worker state."""
+    return _solve_capacity(capacity, **_WORKER_STATE)
+
+
+def solve_capacities(
+    distance_matrix: np.ndarray,
+    depot: int,
+    capacities: Sequence[float],
+    customers: Optional[Sequence[int]] = None,
+    demands: Optional[np.ndarray] = None,
+    location_names: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = 1,
+) -> pl.DataFrame:
+    """
+    Solve the same customer set for many vehicle capacities.
+
+    Savings are calculated and sorted once; only the merge step is replayed
+    for each capacity, followed by Nearest Neighbor + 2-opt sequencing.
+    Capacities can be spread across a process pool, in which case the sorted
+    savings and the distance matrix are sent to each worker only once.
+
+    Args:
+        distance_matrix: Dense distance matrix for all locations
+        depot: Depot location index
+        capacities: Vehicle capacities to solve for
+        customers: Customer location indices (defaults to every non-depot location)
+        demands: Demand per location index (defaults to 1 per customer)
+        location_names: Optional names used to report routes instead of indices
+        max_workers: Number of worker processes (1 runs serially,
+            None uses all CPUs)
+
+    Returns:
+        A Polars DataFrame with one row per capacity and the columns
+        "capacity", "n_vehicles", "distance" and "routes"
+
+    Raises:
+        ValueError: If capacities is empty
+
+    Example:
+        >>> table = solve_capacities(D, depot=0, capacities=[5, 10, 15])
+        >>> table.columns
+        ['capacity', 'n_vehicles', 'distance', 'routes']
+    """
+    if len(capacities) == 0:
+        raise ValueError("capacities must be non-empty")
+    if customers is None:
+        customers = [c for c in range(distance_matrix.shape[0]) if c != depot]
+    if demands is None:
+        demands = np.ones(distance_matrix.shape[0])
+    demands = np.asarray(demands, dtype=float)
+
+    customer1, customer2, _savings = get_savings(distance_matrix, depot, customers)
+    state = {
+        'customer1': customer1,
+        'customer2': customer2,
+        'customers': list(customers),
+        'depot': depot,
+        'distance_matrix': distance_matrix,
+        'demands': demands,
+    }
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(capacities))
+
+    if max_workers <= 1:
+        results = [_solve_capacity(capacity, **state) for capacity in capacities]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(state,),
+        ) as executor:
+            results = list(executor.map(_solve_capacity_worker, capacities))
+
+    if location_names is not None:
+        for result in results:
+            result['routes'] = [[location_names[idx] for idx in route] for route in result['routes']]
+
+    return pl.DataFrame(results).sort('capacity')
+
+
+def _solve_savings_run(
+    lambda_idx: int,
+    replica: int,
+    lambdas: Sequence[float],
+    seed: int,
+    noise: float,
+    capacity: float,
+    customers: Sequence[int],
+    depot: int,
+    distance_matrix: np.ndarray,
+    demands: np.ndarray,
+) -> dict:
+    """Build, merge and sequence one (λ, replica) savings run."""
+    # Replica 0 is the deterministic savings order; the others are randomized
+    # with a seed derived from (seed, λ index, replica) so results do not
+    # depend on how runs are scheduled across workers.
+    rng = None if replica == 0 else np.random.default_rng([seed, lambda_idx, replica])
+
+    customer1, customer2, _savings = get_savings(
+        distance_matrix, depot, customers, lam=lambdas[lambda_idx], rng=rng, noise=noise,
+    )
+    clusters = merge_clusters(customer1, customer2, customers, capacity, demands)
+    routes = [sequence_route(cluster, depot, distance_matrix) for cluster in clusters]
+
+    return {
+        'lambda': lambdas[lambda_idx],
+        'replica': replica,
+        'n_vehicles': len(routes),
+        'distance': sum(get_route_distance(route, distance_matrix) for route in routes),
+        'routes': routes,
+    }
+
+
+def _solve_savings_run_worker(run: Tuple[int, int]) -> dict:
+    """Pool entry point for _solve_savings_run using the shared worker state."""
+    return _solve_savings_run(*run, **_WORKER_STATE)
+
+
+def sweep_savings(
+    distance_matrix: np.ndarray,
+    depot: int,
+    capacity: float,
+    lambdas: Sequence[float] = (0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0),
+    n_replicas: int = 1,
+    noise: float = 0.05,
+    seed: int = 42,
+    customers: Optional[Sequence[int]] = None,
+    demands: Optional[np.ndarray] = None,
+    max_workers: Optional[int] = 1,
+) -> dict:
+    """
+    Run generalized savings over a grid of λ values and randomized replicas.
+
+    Every (λ, replica) combination is an independent Clarke-Wright run with
+    savings d(depot, i) + d(j, depot) - λ·d(i, j). Replica 0 of each λ is
+    the deterministic run; further replicas break ties randomly and
+    perturb the savings by up to ±noise. With max_workers > 1 (or None),
+    runs are distributed across a process pool whose workers receive the
+    distance matrix once.
+
+    Args:
+        distance_matrix: Dense distance matrix for all locations
+        depot: Depot location index
+        capacity: Vehicle capacity
+        lambdas: Grid of λ values to try
+        n_replicas: Number of runs per λ (including the deterministic one)
+        noise: Relative savings perturbation used by randomized replicas
+        seed: Base seed for the randomized replicas
+        customers: Customer location indices (defaults to every non-depot location)
+        demands: Demand per location index (defaults to 1 per customer)
+        max_workers: Number of worker processes (1 runs serially,
+            None uses all CPUs)
+
+    Returns:
+        A dictionary containing:
+            - "routes": Best routes found (location indices starting at the depot)
+            - "distance": Total distance of the best routes
+            - "lambda": λ value of the best run
+            - "replica": Replica number of the best run
+            - "runs": Polars DataFrame with lambda, replica, n_vehicles and
+              distance for every run
+    """
+    if customers is None:
+        customers = [c for c in range(distance_matrix.shape[0]) if c != depot]
+    if demands is None:
+        demands = np.ones(distance_matrix.shape[0])
+    demands = np.asarray(demands, dtype=float)
+
+    state = {
+        'lambdas': list(lambdas),
+        'seed': seed,
+        'noise': noise,
+        'capacity': capacity,
+        'customers': list(customers),
+        'depot': depot,
+        'distance_matrix': distance_matrix,
+        'demands': demands,
+    }
+    runs = [
+        (lambda_idx, replica)
+        for lambda_idx in range(len(lambdas))
+        for replica in range(n_replicas)
+    ]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(runs))
+
+    if max_workers <= 1:
+        results = [_solve_savings_run(*run, **state) for run in runs]
+    else:
+        chunksize = max(1, len(runs) // (4 * max_workers))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(state,),
+        ) as executor:
+            results = list(executor.map(_solve_savings_run_worker, runs, chunksize=chunksize))
+
+    # Runs come back in submission order, so ties resolve to the earliest run
+    best = min(results, key=lambda result: result['distance'])
+
+    return {
+        'routes': best['routes'],
+        'distance': best['distance'],
+        'lambda': best['lambda'],
+        'replica': best['replica'],
+        'runs': pl.DataFrame(results).drop('routes'),
+    }
+
+
+class TimeWindowRoute:
+    """
+    A depot-to-depot route with cached time window schedule information.
+
+    For every position k of nodes = [depot, c1, ..., cm, depot] the route
+    keeps:
+        - earliest[k]: earliest service start at nodes[k] (forward pass)
+        - latest[k]: latest service start at nodes[k] that keeps every later
+          stop, including the return to the depot, on time (backward pass)
+        - forward_slack[k]: latest[k] - earliest[k], how long service at
+          nodes[k] can be postponed without violating a later window
+
+    With these arrays, inserting a customer or appending another route is
+    checked for feasibility in O(1) instead of simulating the whole route.
+    """
+
+    def __init__(
+        self,
+        customers: Sequence[int],
+        depot: int,
+        travel_times: np.ndarray,
+        service_times: np.ndarray,
+        window_start: np.ndarray,
+        window_end: np.ndarray,
+    ):
+        self.depot = depot
+        self.travel_times = travel_times
+        self.service_times = service_times
+        self.window_start = window_start
+        self.window_end = window_end
+        self.customers = list(customers)
+        self.refresh()
+
+    @property
+    def nodes(self) -> List[int]:
+        return [self.depot] + self.customers + [self.depot]
+
+    def refresh(self) -> None:
+        """Recompute earliest/latest service starts and forward time slack."""
+        nodes = self.nodes
+        T, s = self.travel_times, self.service_times
+        n_nodes = len(nodes)
+
+        earliest = np.empty(n_nodes)
+        earliest[0] = self.window_start[self.depot]
+        for k in range(1, n_nodes):
+            arrival = earliest[k - 1] + s[nodes[k - 1]] + T[nodes[k - 1], nodes[k]]
+            earliest[k] = max(self.window_start[nodes[k]], arrival)
+
+        latest = np.empty(n_nodes)
+        latest[-1] = self.window_end[self.depot]
+        for k in range(n_nodes - 2, -1, -1):
+            departure = latest[k + 1] - T[nodes[k], nodes[k + 1]] - s[nodes[k]]
+            latest[k] = min(self.window_end[nodes[k]], departure)
+
+        self.earliest = earliest
+        self.latest = latest
+        self.forward_slack = latest - earliest
+
+    @property
+    def feasible(self) -> bool:
+        """True if every stop can be served within its time window."""
+        return bool(np.all(self.forward_slack >= -1e-9))
+
+    def can_insert(self, customer: int, position: int) -> bool:
+        """
+        Check in O(1) whether customer can be served between nodes[position]
+        and nodes[position + 1].
+        """
+        nodes = self.nodes
+        before, after = nodes[position], nodes[position + 1]
+        T, s = self.travel_times, self.service_times
+
+        start = max(
+            self.window_start[customer],
+            self.earliest[position] + s[before] + T[before, customer],
+        )
+        if start > self.window_end[customer] + 1e-9:
+            return False
+        return start + s[customer] + T[customer, after] <= self.latest[position + 1] + 1e-9
+
+    def can_append(self, other: 'TimeWindowRoute') -> bool:
+        """Check in O(1) whether other's customers can follow this route's customers."""
+        i, j = self.customers[-1], other.customers[0]
+        start = max(
+            self.window_start[j],
+            self.earliest[-2] + self.service_times[i] + self.travel_times[i, j],
+        )
+        return start <= other.latest[1] + 1e-9
+
+
+def merge_routes_time_windows(
+    customer1: np.ndarray,
+    customer2: np.ndarray,
+    customers: Sequence[int],
+    depot: int,
+    capacity: float,
+    travel_times: np.ndarray,
+    service_times: np.ndarray,
+    window_start: np.ndarray,
+    window_end: np.ndarray,
+    demands: Optional[np.ndarray] = None,
+) -> List[List[int]]:
+    """
+    Clarke-Wright merge with capacity and time window constraints.
+
+    Unlike the cluster merge, time windows make the visiting order matter,
+    so the classical route-end rule is used: for a pair (i, j) the route
+    ending in i is joined with the route starting in j (or the route ending
+    in j with the route starting in i). Routes are never reversed. Each
+    join is accepted only if it fits the capacity and the cached time
+    window information shows it is feasible (an O(1) check).
+
+    Args:
+        customer1: First customer of each pair, in savings order
+        customer2: Second customer of each pair, in savings order
+        customers: Customer location indices
+        depot: Depot location index
+        capacity: Vehicle capacity
+        travel_times: Dense travel time matrix
+        service_times: Service time per location index
+        window_start: Earliest service start per location index
+        window_end: Latest service start per location index
+        demands: Demand per location index (defaults to 1 per customer)
+
+    Returns:
+        List of routes (customer location indices in visiting order,
+        without the depot)
+    """
+    if demands is None:
+        demands = np.ones(travel_times.shape[0])
+
+    routes = {
+        c: TimeWindowRoute([c], depot, travel_times, service_times, window_start, window_end)
+        for c in customers
+    }
+    route_of = {c: c for c in customers}
+    loads = {c: demands[c] for c in customers}
+
+    for c1, c2 in zip(customer1.tolist(), customer2.tolist()):
+        a, b = route_of[c1], route_of[c2]
+        if a == b or loads[a] + loads[b] > capacity:
+            continue
+
+        route_a, route_b = routes[a], routes[b]
+        if route_a.customers[-1] == c1 and route_b.customers[0] == c2 and route_a.can_append(route_b):
+            first, second = a, b
+        elif route_b.customers[-1] == c2 and route_a.customers[0] == c1 and route_b.can_append(route_a):
+            first, second = b, a
+        else:
+            continue
+
+        merged = routes[first]
+        absorbed = routes.pop(second)
+        merged.customers.extend(absorbed.customers)
+        merged.refresh()
+        for c in absorbed.customers:
+            route_of[c] = first
+        loads[first] += loads.pop(second)
+
+    return [route.customers for route in routes.values()]
+
+
+def sequence_route_time_windows(
+    route: Sequence[int],
+    depot: int,
+    distance_matrix: np.ndarray,
+    travel_times: np.ndarray,
+    service_times: np.ndarray,
+    window_start: np.ndarray,
+    window_end: np.ndarray,
+) -> List[int]:
+    """
+    Re-sequence a time-feasible route with cheapest feasible insertion.
+
+    Customers are inserted in order of their window end (tightest deadline
+    first) at the cheapest position whose feasibility is confirmed in O(1)
+    by TimeWindowRoute.can_insert. The result is kept only if every customer
+    could be inserted and it is shorter than the given route.
+
+    Args:
+        route: Customer location indices in visiting order (without the depot)
+        depot: Depot location index
+        distance_matrix: Dense distance matrix
+        travel_times: Dense travel time matrix
+        service_times: Service time per location index
+        window_start: Earliest service start per location index
+        window_end: Latest service start per location index
+
+    Returns:
+        Customer location indices in visiting order (without the depot)
+    """
+    D = distance_matrix
+    candidate = TimeWindowRoute([], depot, travel_times, service_times, window_start, window_end)
+
+    for customer in sorted(route, key=lambda c: window_end[c]):
+        nodes = candidate.nodes
+        best_position, best_cost = None, np.inf
+        for position in range(len(nodes) - 1):
+            before, after = nodes[position], nodes[position + 1]
+            cost = D[before, customer] + D[customer, after] - D[before, after]
+            if cost < best_cost and candidate.can_insert(customer, position):
+                best_position, best_cost = position, cost
+        if best_position is None:
+            return list(route)
+        candidate.customers.insert(best_position, customer)
+        candidate.refresh()
+
+    if get_route_distance(candidate.nodes[:-1], D) < get_route_distance([depot] + list(route), D):
+        return candidate.customers
+    return list(route)
@@ -0,0 +1,230 @@
+"""
+Job shop benchmark instances for the shifting bottleneck heuristic.
+
+This module reads the standard job shop instance formats and turns them
+directly into sbn_utilities.DisjunctiveGraph networks:
+    - OR-Library (ft06, ft10, ft20, la01-la40, ...): an optional header
+      followed by "n_jobs n_machines" and one line per job with
+      (machine, processing time) pairs, machines numbered from 0
+    - Taillard (ta01-ta80): a "Times" block and a "Machines" block of
+      n_jobs lines each, machines numbered from 1
+
+Instances are kept as one file per instance in data/jobshop (for
+example data/jobshop/ft06.txt); the instance name is the file stem and
+is used to look up the best-known makespan.
+"""
+
+import os
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import polars as pl
+
+import sbn_utilities
+
+
+INSTANCE_DIRECTORY = os.path.join("data", "jobshop")
+
+# Best-known (optimal where proven) makespans; open Taillard instances
+# (e.g. ta41) list their best known upper bound
+BEST_KNOWN_MAKESPAN = {
+    "ft06": 55, "ft10": 930, "ft20": 1165,
+    "la01": 666, "la02": 655, "la03": 597, "la04": 590, "la05": 593,
+    "la06": 926, "la07": 890, "la08": 863, "la09": 951, "la10": 958,
+    "la11": 1222, "la12": 1039, "la13": 1150, "la14": 1292, "la15": 1207,
+    "la16": 945, "la17": 784, "la18": 848, "la19": 842, "la20": 902,
+    "la21": 1046, "la22": 927, "la23": 1032, "la24": 935, "la25": 977,
+    "la26": 1218, "la27": 1235, "la28": 1216, "la29": 1152, "la30": 1355,
+    "la31": 1784, "la32": 1850, "la33": 1719, "la34": 1721, "la35": 1888,
+    "la36": 1268, "la37": 1397, "la38": 1196, "la39": 1233, "la40": 1222,
+    "ta01": 1231, "ta02": 1244, "ta03": 1218, "ta04": 1175, "ta05": 1224,
+    "ta06": 1238, "ta07": 1227, "ta08": 1217, "ta09": 1274, "ta10": 1241,
+    "ta11": 1357, "ta12": 1367, "ta13": 1342, "ta14": 1345, "ta15": 1339,
+    "ta16": 1360, "ta17": 1462, "ta18": 1396, "ta19": 1332, "ta20": 1348,
+    "ta21": 1642, "ta22": 1600, "ta23": 1557, "ta24": 1644, "ta25": 1595,
+    "ta26": 1643, "ta27": 1680, "ta28": 1603, "ta29": 1625, "ta30": 1584,
+    "ta31": 1764, "ta32": 1784, "ta33": 1791, "ta34": 1829, "ta35": 2007,
+    "ta36": 1819, "ta37": 1771, "ta38": 1673, "ta39": 1795, "ta40": 1669,
+    "ta41": 2005, "ta42": 1937, "ta43": 1846, "ta44": 1979, "ta45": 2000,
+    "ta46": 2004, "ta47": 1889, "ta48": 1937, "ta49": 1968, "ta50": 1923,
+    "ta51": 2760, "ta52": 2756, "ta53": 2717, "ta54": 2839, "ta55": 2679,
+    "ta56": 2781, "ta57": 2943, "ta58": 2885, "ta59": 2655, "ta60": 2723,
+    "ta61": 2868, "ta62": 2869, "ta63": 2755, "ta64": 2702, "ta65": 2725,
+    "ta66": 2845, "ta67": 2825, "ta68": 2784, "ta69": 3071, "ta70": 2995,
+    "ta71": 5464, "ta72": 5181, "ta73": 5568, "ta74": 5339, "ta75": 5392,
+    "ta76": 5342, "ta77": 5436, "ta78": 5394, "ta79": 5358, "ta80": 5183,
+}
+
+
+def _read_integer_lines(path: str) -> List[List[int]]:
+    """Lines of a file parsed as integers (lines with any other token are kept as None)."""
+    lines = []
+    with open(path) as f:
+        for line in f:
+            tokens = line.split()
+            if not tokens:
+                continue
+            try:
+                lines.append([int(token) for token in tokens])
+            except ValueError:
+                lines.append(None)
+    return lines
+
+
+def read_orlib_instance(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read an OR-Library job shop instance.
+
+    The header (instance name, separators, description) is skipped; the
+    data starts at the first line holding exactly two integers.
+
+    Args:
+        path: Path to the instance file
+
+    Returns:
+        Tuple of (machines, processing_times), n_jobs x n_machines arrays
+        with 0-based machine codes
+    """
+    lines = _read_integer_lines(path)
+    start = next(i for i, line in enumerate(lines) if line is not None and len(line) == 2)
+    n_jobs, n_machines = lines[start]
+
+    rows = np.array(lines[start + 1:start + 1 + n_jobs], dtype=np.int64)
+    if rows.shape != (n_jobs, 2 * n_machines):
+        raise ValueError(f"{path}: expected {n_jobs} jobs with {n_machines} (machine, time) pairs")
+    return rows[:, 0::2], rows[:, 1::2]
+
+
+def read_taillard_instance(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read a Taillard job shop instance.
+
+    Args:
+        path: Path to the instance file ("Nb of jobs, Nb of Machines, ..."
+            header, then the "Times" and "Machines" blocks)
+
+    Returns:
+        Tuple of (machines, processing_times), n_jobs x n_machines arrays
+        with 0-based machine codes
+    """
+    with open(path) as f:
+        text = f.read()
+
+    header, times_block = text.split("Times", 1)
+    times_block, machines_block = times_block.split("Machines", 1)
+    # The first two numbers after the field names (n_jobs, n_machines, then
+    # optionally the seeds and bounds)
+    n_jobs, n_machines = [int(token) for token in header.split() if token.isdigit()][:2]
+
+    processing_times = np.array(times_block.split(), dtype=np.int64).reshape(n_jobs, n_machines)
+    machines = np.array(machines_block.split(), dtype=np.int64).reshape(n_jobs, n_machines)
+    return machines - 1, processing_times
+
+
+def load_jobshop_instance(path: str) -> sbn_utilities.DisjunctiveGraph:
+    """
+    Load a benchmark instance as an SBN network.
+
+    Args:
+        path: Path to an OR-Library or Taillard instance (detected from
+            the "Times"/"Machines" block headers)
+
+    Returns:
+        DisjunctiveGraph with operations named "machine,job" (both 1-based)
+
+    Example:
+        >>> graph = load_jobshop_instance("data/jobshop/ft06.txt")
+        >>> graph.n_operations
+        36
+    """
+    with open(path) as f:
+        is_taillard = "Times" in f.read()
+
+    reader = read_taillard_instance if is_taillard else read_orlib_instance
+    machines, processing_times = reader(path)
+    return sbn_utilities.DisjunctiveGraph.from_routings(machines, processing_times)
+
+
+def instance_name(path: str) -> str:
+    """Instance name of a file (its stem, e.g. "ft06")."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def list_instances(directory: str = INSTANCE_DIRECTORY) -> List[str]:
+    """Paths of the instance files in a directory, sorted by name."""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def run_benchmark(
+    paths: Sequence[str] = None,
+    solver: str = "edd",
+    reoptimize: bool = True,
+    max_workers: int = 1,
+    use_cache: bool = True,
+    best_known: Dict[str, int] = None,
+) -> pl.DataFrame:
+    """
+    Run the shifting bottleneck heuristic on a set of instances.
+
+    Args:
+        paths: Instance files (default: everything in INSTANCE_DIRECTORY)
+        solver: Subproblem solver ("edd" or "carlier")
+        reoptimize: Run the re-optimization phase
+        max_workers: Workers for the candidate subproblems
+        use_cache: Share a SubproblemCache across the iterations of an instance
+        best_known: Instance name -> best-known makespan (default: BEST_KNOWN_MAKESPAN)
+
+    Returns:
+        DataFrame with one row per instance: instance, n_jobs, n_machines,
+        makespan, best_known, gap (relative to best_known, null when
+        unknown), lower_bound (makespan_lower_bounds), lb_gap (relative to
+        lower_bound), wall_time, load_time, cpm_time, subproblem_time,
+        update_time and cache_hit_rate (seconds for the times)
+
+    Example:
+        >>> run_benchmark(["data/jobshop/ft06.txt"], solver="carlier")
+        >>> # One Taillard instance per size, 15x15 up to 100x20 (about 15 s with EDD)
+        >>> run_benchmark([f"{INSTANCE_DIRECTORY}/ta{i:02d}.txt" for i in range(1, 80, 10)])
+    """
+    paths = list_instances() if paths is None else list(paths)
+    best_known = BEST_KNOWN_MAKESPAN if best_known is None else best_known
+
+    rows = []
+    for path in paths:
+        name = instance_name(path)
+
+        start = time.perf_counter()
+        graph = load_jobshop_instance(path)
+        load_time = time.perf_counter() - start
+
+        cache = sbn_utilities.SubproblemCache() if use_cache else None
+        start = time.perf_counter()
+        result = sbn_utilities.shifting_bottleneck(
+            graph, solver=solver, reoptimize=reoptimize, max_workers=max_workers, cache=cache,
+        )
+        wall_time = time.perf_counter() - start
+
+        reference = best_known.get(name)
+        lower_bound = sbn_utilities.makespan_lower_bounds(graph)["lower_bound"]
+        rows.append({
+            "instance": name,
+            "n_jobs": len(graph.job_ids),
+            "n_machines": len(graph.machine_ids),
+            "makespan": result["makespan"],
+            "best_known": reference,
+            "gap": (result["makespan"] - reference) / reference if reference else None,
+            "lower_bound": lower_bound,
+            "lb_gap": (result["makespan"] - lower_bound) / lower_bound if lower_bound else None,
+            "wall_time": wall_time,
+            "load_time": load_time,
+            "cpm_time": result["timings"]["cpm"],
+            "subproblem_time": result["timings"]["subproblems"],
+            "update_time": result["timings"]["network_updates"],
+            "cache_hit_rate": cache.info()["hit_rate"] if cache is not None else None,
+        })
+
+    return pl.DataFrame(rows, schema_overrides={"best_known": pl.Int64, "gap": pl.Float64})
@@ -14,7 +14,9 @@ def _():
     import polars as pl
     import seaborn as sns
     from tqdm.auto import tqdm
-    return mo, pathlib, pl, random, sns
+
+    import sbn_utilities
+    return mo, pathlib, pl, random, sbn_utilities, sns
 
 
 @app.cell(hide_code=True)
@@ -57,7 +59,7 @@ def _(mo):
 
 
 @app.cell
-def _(M, pj_values, pl, random):
+def _(M, pj_values, pl, random, sbn_utilities):
     def compute_workload(
         job_list: list,
         pj_dict: dict,
@@ -177,28 +179,27 @@ def _(M, pj_values, pl, random):
 
         import matplotlib.pyplot as plt
 
-        fig, ax = plt.subplots(1, 1, figsize=(8, 3))
-
-        for machine in schedule_details_dict:
-            for job in schedule_details_dict[machine]:
-                start_time = schedule_details_dict[machine][job]['start_time']
-                completion_time = schedule_details_dict[machine][job]['completion_time']
-                length = completion_time - start_time
-                ax.barh(
-                    machine, 
-                    length,
-                    left=start_time, 
-                    edgecolor='black',
-                )
-                ax.text(
-                    start_time + length/2,
-                    machine,
-                    job,
-                    va='center',
-                    ha='center',
-                    color='k',
-                )
-            ax.spines[['right', 'top']].set_visible(False)
+        # Flatten the schedule into one bar per job (drawn with one collection per machine)
+        machines = list(schedule_details_dict)
+        bars = [
+            (row, job, details['start_time'], details['completion_time'] - details['start_time'])
+            for row, machine in enumerate(machines)
+            for job, details in schedule_details_dict[machine].items()
+        ]
+        rows, jobs, start_times, lengths = zip(*bars) if bars else ((), (), (), ())
+
+        fig, ax = sbn_utilities.plot_gantt(
+            rows=rows,
+            starts=start_times,
+            durations=lengths,
+            row_labels=[str(machine) for machine in machines],
+            colors=[f'C{i % 10}' for i in range(len(bars))],
+            labels=[str(job) for job in jobs],
+            figsize=(8, 3),
+            height=0.8,
+            fontsize=plt.rcParams['font.size'],
+        )
+        ax.spines[['right', 'top']].set_visible(False)
 
         ax.set_xlabel('Time')
         ax.set_ylabel('Machines')
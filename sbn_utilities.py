@@ -4,21 +4,45 @@ Critical Path Method (CPM) utilities for project scheduling.
 This module provides utilities to analyze project schedules using the
 Critical Path Method. It calculates early/late start/finish times for
 each task in a project network.
+
+Networks can be given either as a Polars DataFrame of "machine,job"
+operations or as a DisjunctiveGraph, an integer-indexed representation
+used by the shifting bottleneck heuristic.
 """
 
+import hashlib
+import heapq
+import os
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
 import polars as pl
-from collections import defaultdict
-from typing import Dict, List, Any, Tuple
+from collections import deque
+from typing import Dict, List, Any, Sequence, Tuple, Union
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 
+from cache_utilities import LRUCache
 
-def calculate_cpm(df: pl.DataFrame) -> Dict[str, Dict[str, int]]:
+
+def calculate_cpm(df: Union[pl.DataFrame, "DisjunctiveGraph"]) -> Dict[str, Dict[str, int]]:
     """
     Calculate Critical Path Method metrics for a project schedule.
 
+    A topological order is computed once with Kahn's algorithm and reused
+    for both the forward and the backward pass, so the whole calculation
+    is O(V + E). The 1 ms target for a sequenced 100x20 job shop applies only
+    to the array API, DisjunctiveGraph.cpm(): about 1 ms with the cached
+    topological order and 2 ms when it has to be recomputed. This function
+    does not meet it: building the 2000 per-task dictionaries (and, for a
+    DataFrame, reading its columns) alone takes over 1 ms, so it takes
+    about 2 ms for a DisjunctiveGraph and 5-8 ms for a DataFrame. Hot loops should call
+    DisjunctiveGraph.cpm() (or IncrementalCPM) instead.
+
     Args:
-        df: A Polars DataFrame with three columns:
+        df: A DisjunctiveGraph, or a Polars DataFrame with three columns:
             - "current_machine_job" (str): Task identifier
             - "predecessors" (list): List of predecessor task identifiers
             - "pij" (int): Task duration
@@ -31,6 +55,10 @@ def calculate_cpm(df: pl.DataFrame) -> Dict[str, Dict[str, int]]:
             - "late_start": Latest time task can start without delaying project
             - "late_finish": Latest time task can finish without delaying project
 
+    Raises:
+        ValueError: If a predecessor is unknown or the network contains a
+            cycle (the arcs on the cycle are listed in the message)
+
     Example:
         >>> df = pl.DataFrame({
         ...     "current_machine_job": ["A", "B", "C"],
@@ -41,166 +69,908 @@ def calculate_cpm(df: pl.DataFrame) -> Dict[str, Dict[str, int]]:
         >>> result["A"]
         {'early_start': 0, 'early_finish': 5, 'late_start': 0, 'late_finish': 5}
     """
+    if isinstance(df, DisjunctiveGraph):
+        cpm = df.cpm()
+        return _cpm_result_dict(
+            df.names,
+            cpm["early_start"].tolist(),
+            cpm["early_finish"].tolist(),
+            cpm["late_start"].tolist(),
+            cpm["late_finish"].tolist(),
+        )
+
+    tasks = df["current_machine_job"].to_list()
+    durations = df["pij"].to_list()
+    task_index = {task: i for i, task in enumerate(tasks)}
+
+    # Step 1: Build integer predecessor lists
+    predecessors = []
+    for task, task_predecessors in zip(tasks, df["predecessors"].to_list()):
+        try:
+            predecessors.append([task_index[pred] for pred in task_predecessors or []])
+        except KeyError as error:
+            raise ValueError(f"Task {task} has unknown predecessor {error.args[0]}") from None
+
+    # Step 2: Topological order (computed once, reused by both passes)
+    successors = _get_successors(predecessors)
+    order = topological_order(predecessors, successors, names=tasks)
+
+    # Step 3: Forward and backward passes
+    early_start, early_finish = _forward_pass(order, predecessors, durations)
+    project_duration = max(early_finish, default=0)
+    late_start, late_finish = _backward_pass(order, successors, durations, project_duration)
 
-    # Step 1: Calculate early times (forward pass)
-    early_times = _calculate_early_times(df)
+    # Step 4: Format results into the required dictionary structure
+    return _cpm_result_dict(tasks, early_start, early_finish, late_start, late_finish)
 
-    # Step 2: Determine project duration
-    project_duration = max(ef for es, ef in early_times.values())
 
-    # Step 3: Calculate late times (backward pass)
-    late_times = _calculate_late_times(df, early_times, project_duration)
+def _cpm_result_dict(
+    tasks: List[str],
+    early_start: List[int],
+    early_finish: List[int],
+    late_start: List[int],
+    late_finish: List[int],
+) -> Dict[str, Dict[str, int]]:
+    """Task name -> CPM times, built in one pass over the columns."""
+    return {
+        task: {"early_start": es, "early_finish": ef, "late_start": ls, "late_finish": lf}
+        for task, es, ef, ls, lf in zip(tasks, early_start, early_finish, late_start, late_finish)
+    }
 
-    # Step 4: Format results into the required dictionary structure
-    result = {}
-    for row in df.iter_rows(named=True):
-        task = row["current_machine_job"]
-        es, ef = early_times[task]
-        ls, lf = late_times[task]
-
-        result[task] = {
-            "early_start": es,
-            "early_finish": ef,
-            "late_start": ls,
-            "late_finish": lf
-        }
 
-    return result
+def _get_successors(predecessors: List[List[int]]) -> List[List[int]]:
+    """Invert integer predecessor lists into successor lists."""
+    successors = [[] for _ in predecessors]
+    for task, task_predecessors in enumerate(predecessors):
+        for pred in task_predecessors:
+            successors[pred].append(task)
+    return successors
 
 
-def _calculate_early_times(df: pl.DataFrame) -> Dict[str, tuple]:
+def topological_order(
+    predecessors: List[List[int]],
+    successors: List[List[int]] = None,
+    names: List[Any] = None,
+) -> List[int]:
     """
-    Calculate Early Start (ES) and Early Finish (EF) times for all tasks.
+    Compute a topological order of a network with Kahn's algorithm.
 
-    The early start is the earliest a task can begin (after all predecessors finish).
-    The early finish is early start + duration.
+    Tasks are released through an indegree queue, so every task and arc is
+    visited exactly once (O(V + E)).
 
     Args:
-        df: DataFrame with project data
+        predecessors: predecessors[i] lists the tasks that must precede task i
+        successors: Optional precomputed inverse of predecessors
+        names: Optional task names used in the error message
 
     Returns:
-        Dictionary mapping task name to (ES, EF) tuple
-    """
-    early_times = {}
-
-    # Create a mapping of task to its data
-    task_data = {}
-    for row in df.iter_rows(named=True):
-        task = row["current_machine_job"]
-        task_data[task] = {
-            "duration": row["pij"],
-            "predecessors": row["predecessors"] if row["predecessors"] else []
-        }
+        List of task indices in topological order
 
-    # Process tasks in topological order
-    # Keep track of tasks that still need to be processed
-    remaining_tasks = set(task_data.keys())
-
-    while remaining_tasks:
-        # Find tasks whose predecessors have all been processed
-        ready_tasks = []
-        for task in remaining_tasks:
-            predecessors = task_data[task]["predecessors"]
-            if all(pred in early_times for pred in predecessors):
-                ready_tasks.append(task)
-
-        # If no tasks are ready, we have a circular dependency
-        if not ready_tasks:
-            raise ValueError("Circular dependency detected in task predecessors")
-
-        # Process all ready tasks
-        for task in ready_tasks:
-            duration = task_data[task]["duration"]
-            predecessors = task_data[task]["predecessors"]
-
-            # Calculate Early Start (ES)
-            if not predecessors:
-                # No predecessors means this task can start at time 0
-                es = 0
-            else:
-                # ES is the maximum EF of all predecessors
-                es = max(early_times[pred][1] for pred in predecessors)
-
-            # Calculate Early Finish (EF)
-            ef = es + duration
-
-            early_times[task] = (es, ef)
-            remaining_tasks.remove(task)
+    Raises:
+        ValueError: If the network contains a cycle; the message lists the
+            arcs (pred -> task) that lie on a cycle
+    """
+    if successors is None:
+        successors = _get_successors(predecessors)
+
+    indegree = [len(task_predecessors) for task_predecessors in predecessors]
+    queue = deque(task for task, degree in enumerate(indegree) if degree == 0)
+
+    order = []
+    while queue:
+        task = queue.popleft()
+        order.append(task)
+        for succ in successors[task]:
+            indegree[succ] -= 1
+            if indegree[succ] == 0:
+                queue.append(succ)
+
+    if len(order) < len(predecessors):
+        raise ValueError(
+            "Circular dependency detected in task predecessors: "
+            + ", ".join(f"{a} -> {b}" for a, b in _get_cycle_arcs(predecessors, successors, order, names))
+        )
+
+    return order
+
+
+def _get_cycle_arcs(
+    predecessors: List[List[int]],
+    successors: List[List[int]],
+    order: List[int],
+    names: List[Any] = None,
+) -> List[Tuple[Any, Any]]:
+    """
+    Arcs that lie on cycles, given the partial order left by Kahn's algorithm.
 
-    return early_times
+    Tasks not reached by the forward peel are on a cycle or downstream of
+    one; peeling tasks without remaining successors removes the downstream
+    ones, leaving only the strongly connected part of the network.
+    """
+    remaining = set(range(len(predecessors))) - set(order)
+
+    outdegree = {task: sum(succ in remaining for succ in successors[task]) for task in remaining}
+    queue = deque(task for task, degree in outdegree.items() if degree == 0)
+    while queue:
+        task = queue.popleft()
+        remaining.discard(task)
+        for pred in predecessors[task]:
+            if pred in remaining:
+                outdegree[pred] -= 1
+                if outdegree[pred] == 0:
+                    queue.append(pred)
+
+    label = (lambda task: names[task]) if names is not None else (lambda task: task)
+    return [
+        (label(pred), label(task))
+        for task in sorted(remaining)
+        for pred in predecessors[task]
+        if pred in remaining
+    ]
+
+
+def _forward_pass(
+    order: List[int],
+    predecessors: List[List[int]],
+    durations: List[int],
+) -> Tuple[List[int], List[int]]:
+    """
+    Calculate Early Start (ES) and Early Finish (EF) times in topological order.
 
+    The early start is the earliest a task can begin (after all predecessors finish).
+    The early finish is early start + duration.
+    """
+    early_start = [0] * len(order)
+    early_finish = [0] * len(order)
+
+    # Plain loops are used instead of max() over generators: this is the hot
+    # path of the shifting bottleneck heuristic
+    for task in order:
+        # ES is the maximum EF of all predecessors (0 without predecessors)
+        es = 0
+        for pred in predecessors[task]:
+            finish = early_finish[pred]
+            if finish > es:
+                es = finish
+        early_start[task] = es
+        early_finish[task] = es + durations[task]
+
+    return early_start, early_finish
+
+
+def _chain_cpm_passes(
+    order: List[int],
+    durations: List[int],
+    job_pred: List[int],
+    machine_pred: List[int],
+    job_succ: List[int],
+    machine_succ: List[int],
+) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """
+    Forward and backward CPM passes when every operation has at most one
+    job and one machine predecessor (and successor), -1 meaning none.
 
-def _calculate_late_times(
-    df: pl.DataFrame,
-    early_times: Dict[str, tuple],
-    project_duration: int
-) -> Dict[str, tuple]:
+    The finish and late start lists carry one extra sentinel entry, so a
+    -1 index reads 0 (forward) or the project duration (backward) and the
+    loops need no branches for missing arcs.
+    """
+    n = len(durations)
+    early_start = [0] * n
+    early_finish = [0] * (n + 1)
+    for op in order:
+        es = early_finish[job_pred[op]]
+        finish = early_finish[machine_pred[op]]
+        if finish > es:
+            es = finish
+        early_start[op] = es
+        early_finish[op] = es + durations[op]
+    early_finish.pop()
+
+    project_duration = max(early_finish, default=0)
+    late_start = [0] * n + [project_duration]
+    late_finish = [0] * n
+    for op in reversed(order):
+        lf = late_start[job_succ[op]]
+        start = late_start[machine_succ[op]]
+        if start < lf:
+            lf = start
+        late_finish[op] = lf
+        late_start[op] = lf - durations[op]
+    late_start.pop()
+
+    return early_start, early_finish, late_start, late_finish
+
+
+def _backward_pass(
+    order: List[int],
+    successors: List[List[int]],
+    durations: List[int],
+    project_duration: int,
+) -> Tuple[List[int], List[int]]:
     """
-    Calculate Late Start (LS) and Late Finish (LF) times for all tasks.
+    Calculate Late Start (LS) and Late Finish (LF) times in reverse topological order.
 
     The late finish is the latest a task can finish without delaying the project.
     The late start is late finish - duration.
-
-    Args:
-        df: DataFrame with project data
-        early_times: Dictionary of early start/finish times
-        project_duration: Total project duration (maximum EF)
-
-    Returns:
-        Dictionary mapping task name to (LS, LF) tuple
     """
-    late_times = {}
+    late_start = [0] * len(order)
+    late_finish = [0] * len(order)
 
-    # Create a mapping of which tasks depend on each task (reverse dependencies)
-    # and store task durations
-    successors = defaultdict(list)
-    task_durations = {}
+    for task in reversed(order):
+        # LF is the minimum LS of all successors (project duration without successors)
+        lf = project_duration
+        for succ in successors[task]:
+            start = late_start[succ]
+            if start < lf:
+                lf = start
+        late_finish[task] = lf
+        late_start[task] = lf - durations[task]
 
-    for row in df.iter_rows(named=True):
-        task = row["current_machine_job"]
-        task_durations[task] = row["pij"]
-        predecessors = row["predecessors"] if row["predecessors"] else []
-        for pred in predecessors:
-            successors[pred].append(task)
+    return late_start, late_finish
 
-    # Process tasks in reverse topological order
-    # Start with tasks that have no successors or whose successors have been processed
-    remaining_tasks = set(task_durations.keys())
-
-    while remaining_tasks:
-        # Find tasks whose successors have all been processed
-        ready_tasks = []
-        for task in remaining_tasks:
-            task_successors = successors.get(task, [])
-            if all(succ in late_times for succ in task_successors):
-                ready_tasks.append(task)
-
-        # If no tasks are ready, we have an issue (shouldn't happen if forward pass worked)
-        if not ready_tasks:
-            raise ValueError("Unable to process tasks in reverse order")
-
-        # Process all ready tasks
-        for task in ready_tasks:
-            duration = task_durations[task]
-
-            # Calculate Late Finish (LF)
-            if task not in successors or not successors[task]:
-                # No successors means this is a final task
-                lf = project_duration
-            else:
-                # LF is the minimum LS of all successors
-                lf = min(late_times[succ][0] for succ in successors[task])
 
-            # Calculate Late Start (LS)
-            ls = lf - duration
+class DisjunctiveGraph:
+    """
+    Integer-indexed disjunctive graph of a job shop.
+
+    Operations are numbered 0..n-1. Conjunctive (job routing) arcs are
+    stored in compressed sparse row (CSR) form: the predecessors of
+    operation i are pred_idx[pred_ptr[i]:pred_ptr[i + 1]] and its
+    successors are succ_idx[succ_ptr[i]:succ_ptr[i + 1]]. Every operation
+    runs on a single machine, so once machines are sequenced each
+    operation has at most one machine predecessor and one machine
+    successor; these disjunctive arcs are kept in the machine_pred and
+    machine_succ arrays (-1 when absent) and are added in place.
+
+    A machine -> operations index is built once at construction, so the
+    operations of a machine are found in O(ops on machine) without
+    scanning names (where "1" would also match "10,3").
+
+    Attributes:
+        names: Operation names in "machine,job" format
+        duration: Processing time of each operation
+        machine: Machine code of each operation (index into machine_ids)
+        job: Job code of each operation (index into job_ids)
+        machine_ids: Machine labels, sorted
+        job_ids: Job labels, in order of appearance
+        pred_ptr, pred_idx: CSR predecessor arrays (conjunctive arcs)
+        succ_ptr, succ_idx: CSR successor arrays (conjunctive arcs)
+        machine_pred, machine_succ: Fixed machine-sequence arcs
+        machine_ptr, machine_ops: Machine -> operation index, the operations
+            of machine code m are machine_ops[machine_ptr[m]:machine_ptr[m + 1]]
+    """
 
-            late_times[task] = (ls, lf)
-            remaining_tasks.remove(task)
+    def __init__(
+        self,
+        names: Sequence[str],
+        duration: Sequence[int],
+        machine: Sequence[int],
+        job: Sequence[int],
+        machine_ids: Sequence[str],
+        job_ids: Sequence[str],
+        arcs_from: Sequence[int],
+        arcs_to: Sequence[int],
+    ):
+        self.names = list(names)
+        self.duration = np.asarray(duration, dtype=np.int64)
+        self.machine = np.asarray(machine, dtype=np.int64)
+        self.job = np.asarray(job, dtype=np.int64)
+        self.machine_ids = list(machine_ids)
+        self.job_ids = list(job_ids)
+
+        n_operations = len(self.names)
+        arcs_from = np.asarray(arcs_from, dtype=np.int64)
+        arcs_to = np.asarray(arcs_to, dtype=np.int64)
+        self.pred_ptr, self.pred_idx = _build_csr(arcs_to, arcs_from, n_operations)
+        self.succ_ptr, self.succ_idx = _build_csr(arcs_from, arcs_to, n_operations)
+
+        self.machine_pred = np.full(n_operations, -1, dtype=np.int64)
+        self.machine_succ = np.full(n_operations, -1, dtype=np.int64)
+
+        # Caches for cpm(): job arc lists (immutable, shared by copies) and the
+        # last topological order with the machine arcs it was computed for
+        self._job_arc_lists = None
+        self._order_cache = None
+
+        # Machine -> operation index (operations in index order within a machine)
+        self.machine_index = {str(m): code for code, m in enumerate(self.machine_ids)}
+        self.machine_ptr, self.machine_ops = _build_csr(
+            self.machine, np.arange(n_operations, dtype=np.int64), len(self.machine_ids)
+        )
+
+    @classmethod
+    def from_dataframe(cls, df: pl.DataFrame) -> "DisjunctiveGraph":
+        """
+        Build a graph from a CPM network DataFrame.
+
+        Args:
+            df: Polars DataFrame with current_machine_job, predecessors and pij columns
+
+        Returns:
+            A DisjunctiveGraph whose conjunctive arcs are the listed predecessors
+        """
+        names = df["current_machine_job"].to_list()
+        index = {name: i for i, name in enumerate(names)}
+        machines, jobs = zip(*(parse_machine_job(name) for name in names)) if names else ((), ())
+
+        machine_ids = sorted(set(machines), key=_label_sort_key)
+        job_ids = list(dict.fromkeys(jobs))
+        machine_code = {m: i for i, m in enumerate(machine_ids)}
+        job_code = {j: i for i, j in enumerate(job_ids)}
+
+        arcs_from, arcs_to = [], []
+        for i, predecessors in enumerate(df["predecessors"].to_list()):
+            for pred in predecessors or []:
+                arcs_from.append(index[pred])
+                arcs_to.append(i)
+
+        return cls(
+            names=names,
+            duration=df["pij"].to_list(),
+            machine=[machine_code[m] for m in machines],
+            job=[job_code[j] for j in jobs],
+            machine_ids=machine_ids,
+            job_ids=job_ids,
+            arcs_from=arcs_from,
+            arcs_to=arcs_to,
+        )
+
+    @classmethod
+    def from_job_table(cls, jobs: pl.DataFrame) -> "DisjunctiveGraph":
+        """
+        Build a graph from a job routing table (the SBN_data.csv format).
+
+        Routings are exploded with Polars list operations and operation
+        ids, machine/job codes and job-chain arcs are assigned in bulk, so
+        no Python loop runs per operation.
+
+        Args:
+            jobs: Polars DataFrame with job, machine_sequence and pij
+                columns; machine_sequence and pij are comma-separated
+                strings (as read from the CSV) or lists of equal length
+
+        Returns:
+            A DisjunctiveGraph with one conjunctive chain per job; operation
+            ids follow the table (job by job, in routing order)
+
+        Example:
+            >>> network = DisjunctiveGraph.from_job_table(pl.read_csv('data/SBN_data.csv'))
+        """
+        def as_list(name: str) -> pl.Expr:
+            column = pl.col(name)
+            if jobs.schema[name] == pl.String:
+                column = column.str.split(",")
+            return column.list.eval(pl.element().cast(pl.String).str.strip_chars())
+
+        operations = (
+            jobs.select(
+                pl.col("job").cast(pl.String).str.strip_chars(),
+                as_list("machine_sequence").alias("machine"),
+                as_list("pij").alias("pij"),
+            )
+            .with_row_index("job_code")
+            .explode("machine", "pij")
+            .with_columns(
+                pl.col("pij").cast(pl.Int64),
+                (pl.int_range(pl.len()).over("job_code") > 0).alias("has_job_predecessor"),
+                pl.concat_str("machine", "job", separator=",").alias("name"),
+            )
+        )
+
+        machine_ids = sorted(operations["machine"].unique().to_list(), key=_label_sort_key)
+        machine = operations["machine"].replace_strict(
+            {m: code for code, m in enumerate(machine_ids)}, return_dtype=pl.Int64
+        )
+
+        # Each operation after the first of its job follows the previous row
+        arcs_to = np.flatnonzero(operations["has_job_predecessor"].to_numpy())
+
+        return cls(
+            names=operations["name"].to_list(),
+            duration=operations["pij"].to_numpy(),
+            machine=machine.to_numpy(),
+            job=operations["job_code"].to_numpy(),
+            machine_ids=machine_ids,
+            job_ids=jobs["job"].cast(pl.String).str.strip_chars().to_list(),
+            arcs_from=arcs_to - 1,
+            arcs_to=arcs_to,
+        )
+
+    @classmethod
+    def from_routings(cls, machines: Sequence[Sequence[int]], processing_times: Sequence[Sequence[int]]) -> "DisjunctiveGraph":
+        """
+        Build a graph from job routings (the OR-Library/Taillard layout).
+
+        Row j of machines lists the machines job j visits in order and row j
+        of processing_times the matching processing times. Machines are
+        0-based codes; labels are 1-based ("1", "2", ...) and operations are
+        named "machine,job" like the CSV networks. Operation ids are
+        job-major (job j, step k is j * n_steps + k).
+
+        Args:
+            machines: n_jobs x n_steps array of 0-based machine codes
+            processing_times: n_jobs x n_steps array of processing times
+
+        Returns:
+            A DisjunctiveGraph with one conjunctive chain per job
+
+        Example:
+            >>> graph = DisjunctiveGraph.from_routings([[0, 1], [1, 0]], [[3, 2], [4, 1]])
+            >>> graph.names
+            ['1,1', '2,1', '2,2', '1,2']
+        """
+        machines = np.asarray(machines, dtype=np.int64)
+        processing_times = np.asarray(processing_times, dtype=np.int64)
+        n_jobs, n_steps = machines.shape
+
+        machine_codes, machine = np.unique(machines.ravel(), return_inverse=True)
+        job = np.repeat(np.arange(n_jobs, dtype=np.int64), n_steps)
+        machine_ids = [str(m + 1) for m in machine_codes.tolist()]
+        job_ids = [str(j + 1) for j in range(n_jobs)]
+
+        # Chain arcs between consecutive steps of the same job
+        operations = np.arange(n_jobs * n_steps, dtype=np.int64).reshape(n_jobs, n_steps)
+        arcs_from = operations[:, :-1].ravel()
+        arcs_to = operations[:, 1:].ravel()
+
+        return cls(
+            names=[f"{machine_ids[m]},{job_ids[j]}" for m, j in zip(machine.tolist(), job.tolist())],
+            duration=processing_times.ravel(),
+            machine=machine,
+            job=job,
+            machine_ids=machine_ids,
+            job_ids=job_ids,
+            arcs_from=arcs_from,
+            arcs_to=arcs_to,
+        )
+
+    @property
+    def n_operations(self) -> int:
+        return len(self.names)
+
+    def copy(self) -> "DisjunctiveGraph":
+        """Copy of the graph; the immutable CSR and attribute arrays are shared."""
+        graph = object.__new__(DisjunctiveGraph)
+        graph.__dict__.update(self.__dict__)
+        graph.machine_pred = self.machine_pred.copy()
+        graph.machine_succ = self.machine_succ.copy()
+        return graph
+
+    def machine_code(self, machine: str) -> int:
+        """Integer code of a machine label."""
+        return self.machine_index[str(machine)]
+
+    def operations_on(self, machine: str) -> np.ndarray:
+        """Operation indices processed on a machine (by label), from the precomputed index."""
+        code = self.machine_index[str(machine)]
+        return self.machine_ops[self.machine_ptr[code]:self.machine_ptr[code + 1]]
+
+    def add_machine_sequence(self, sequence: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        Fix the processing order of a machine by adding arcs in place.
+
+        Args:
+            sequence: Operation indices in processing order
+
+        Returns:
+            List of (from, to) arcs that were added
+        """
+        arcs = list(zip(sequence[:-1], sequence[1:]))
+        for a, b in arcs:
+            self.machine_succ[a] = b
+            self.machine_pred[b] = a
+        return arcs
+
+    def remove_machine_sequence(self, sequence: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        Release the processing order of a machine by removing its arcs in place.
+
+        Args:
+            sequence: Operation indices in the processing order that was fixed
+
+        Returns:
+            List of (from, to) arcs that were removed
+        """
+        arcs = list(zip(sequence[:-1], sequence[1:]))
+        for a, b in arcs:
+            self.machine_succ[a] = -1
+            self.machine_pred[b] = -1
+        return arcs
+
+    def predecessor_lists(self) -> List[List[int]]:
+        """Predecessors of every operation, conjunctive and machine arcs combined."""
+        ptr = self.pred_ptr.tolist()
+        idx = self.pred_idx.tolist()
+        predecessors = [idx[ptr[i]:ptr[i + 1]] for i in range(self.n_operations)]
+        for op in np.flatnonzero(self.machine_pred >= 0).tolist():
+            predecessors[op].append(int(self.machine_pred[op]))
+        return predecessors
+
+    def successor_lists(self) -> List[List[int]]:
+        """Successors of every operation, conjunctive and machine arcs combined."""
+        ptr = self.succ_ptr.tolist()
+        idx = self.succ_idx.tolist()
+        successors = [idx[ptr[i]:ptr[i + 1]] for i in range(self.n_operations)]
+        for op in np.flatnonzero(self.machine_succ >= 0).tolist():
+            successors[op].append(int(self.machine_succ[op]))
+        return successors
+
+    def _job_arcs(self) -> Tuple[List[List[int]], List[List[int]], Tuple[List[int], List[int]]]:
+        """
+        Job (conjunctive) arcs as predecessor and successor lists, built once.
+
+        The third item is (job_pred, job_succ), flat lists with -1 for none,
+        when every job is a chain (at most one job predecessor and successor
+        per operation, as in any job shop), and None otherwise.
+        """
+        if self._job_arc_lists is None:
+            ptr, idx = self.pred_ptr.tolist(), self.pred_idx.tolist()
+            predecessors = [idx[ptr[i]:ptr[i + 1]] for i in range(self.n_operations)]
+            ptr, idx = self.succ_ptr.tolist(), self.succ_idx.tolist()
+            successors = [idx[ptr[i]:ptr[i + 1]] for i in range(self.n_operations)]
+            chains = None
+            if all(len(preds) <= 1 for preds in predecessors) and all(len(succs) <= 1 for succs in successors):
+                chains = (
+                    [preds[0] if preds else -1 for preds in predecessors],
+                    [succs[0] if succs else -1 for succs in successors],
+                )
+            self._job_arc_lists = (predecessors, successors, chains)
+        return self._job_arc_lists
+
+    def topological_order(self) -> List[int]:
+        """
+        Topological order of the operations (Kahn's algorithm).
+
+        The order is cached with the machine arcs it was computed for and
+        reused until they change, so repeated CPM runs on the same network
+        only pay for the two passes.
+
+        Raises:
+            ValueError: If the machine arcs create a cycle
+        """
+        if self._order_cache is not None and np.array_equal(self._order_cache[0], self.machine_pred):
+            return self._order_cache[1]
+
+        job_predecessors, job_successors, _chains = self._job_arcs()
+        machine_pred, machine_succ = self.machine_pred.tolist(), self.machine_succ.tolist()
+        indegree = [len(preds) + (pred >= 0) for preds, pred in zip(job_predecessors, machine_pred)]
+        stack = [op for op, degree in enumerate(indegree) if degree == 0]
+
+        order = []
+        while stack:
+            op = stack.pop()
+            order.append(op)
+            for succ in job_successors[op]:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    stack.append(succ)
+            succ = machine_succ[op]
+            if succ >= 0:
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    stack.append(succ)
+
+        if len(order) < self.n_operations:
+            # Generic path, which lists the arcs on the cycle
+            topological_order(self.predecessor_lists(), self.successor_lists(), names=self.names)
+        self._order_cache = (self.machine_pred.copy(), order)
+        return order
+
+    def cpm(self) -> Dict[str, np.ndarray]:
+        """
+        Critical Path Method on the graph.
+
+        The topological order is reused while the machine arcs are
+        unchanged. When every job is a chain (at most one job predecessor
+        and successor per operation, as in any job shop), the passes run on
+        flat predecessor/successor lists without building adjacency lists.
+
+        Returns:
+            Dictionary of arrays indexed by operation: "early_start",
+            "early_finish", "late_start" and "late_finish"
+        """
+        order = self.topological_order()
+        durations = self.duration.tolist()
+
+        chains = self._job_arcs()[2]
+        if chains is not None:
+            job_pred, job_succ = chains
+            early_start, early_finish, late_start, late_finish = _chain_cpm_passes(
+                order, durations, job_pred, self.machine_pred.tolist(), job_succ, self.machine_succ.tolist(),
+            )
+        else:
+            predecessors = self.predecessor_lists()
+            successors = self.successor_lists()
+            early_start, early_finish = _forward_pass(order, predecessors, durations)
+            project_duration = max(early_finish, default=0)
+            late_start, late_finish = _backward_pass(order, successors, durations, project_duration)
+
+        return {
+            "early_start": np.array(early_start, dtype=np.int64),
+            "early_finish": np.array(early_finish, dtype=np.int64),
+            "late_start": np.array(late_start, dtype=np.int64),
+            "late_finish": np.array(late_finish, dtype=np.int64),
+        }
 
-    return late_times
+    def machine_sequences(self) -> Dict[str, List[int]]:
+        """
+        Processing order of every fully sequenced machine.
+
+        Returns:
+            Machine label -> operation indices in processing order (machines
+            whose operations are not chained by machine arcs are omitted)
+        """
+        sequences = {}
+        for machine in self.machine_ids:
+            operations = self.operations_on(machine)
+            starts = operations[self.machine_pred[operations] < 0].tolist()
+            if len(starts) != 1:
+                continue
+            sequence = starts
+            while self.machine_succ[sequence[-1]] >= 0:
+                sequence.append(int(self.machine_succ[sequence[-1]]))
+            sequences[machine] = sequence
+        return sequences
+
+    def to_dataframe(self) -> pl.DataFrame:
+        """The graph in the current_machine_job / predecessors / pij DataFrame format."""
+        predecessors = self.predecessor_lists()
+        return pl.DataFrame(
+            {
+                "current_machine_job": self.names,
+                "predecessors": [
+                    [self.names[pred] for pred in preds] if preds else None
+                    for preds in predecessors
+                ],
+                "pij": self.duration,
+            },
+            schema={
+                "current_machine_job": pl.String,
+                "predecessors": pl.List(pl.String),
+                "pij": pl.Int64,
+            },
+        )
+
+
+def _build_csr(rows: np.ndarray, columns: np.ndarray, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR (pointer, index) arrays for the (row, column) pairs, stable within a row."""
+    order = np.argsort(rows, kind="stable")
+    pointer = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=pointer[1:])
+    return pointer, columns[order]
+
+
+def _label_sort_key(label: str):
+    """Sort numeric labels numerically and everything else alphabetically."""
+    return (0, int(label), "") if str(label).isdigit() else (1, 0, str(label))
+
+
+class IncrementalCPM:
+    """
+    Heads and tails of a DisjunctiveGraph maintained incrementally.
+
+    The head of an operation is its early start (longest path from the
+    start of the network); its tail is the longest path from its
+    completion to the end of the network. Adding arcs can only change the
+    heads of operations downstream of the new arcs and the tails of
+    operations upstream of them, so only those cones are updated:
+        - a topological order is kept valid with the Pearce-Kelly dynamic
+          ordering algorithm (which also detects cycles),
+        - heads are re-evaluated forward from the arc targets and tails
+          backward from the arc sources, each affected operation exactly
+          once, using heaps keyed by topological position.
+
+    Late times follow from the tails (LF = makespan - tail), so cpm()
+    returns the same values as a full calculate_cpm.
+
+    Attributes:
+        graph: The DisjunctiveGraph (machine arcs are added to it in place)
+        updated_operations: Number of head/tail re-evaluations performed
+            by incremental updates (a measure of the work done)
+    """
 
+    def __init__(self, graph: DisjunctiveGraph):
+        self.graph = graph
+        self.duration = graph.duration.tolist()
+        self.predecessors = graph.predecessor_lists()
+        self.successors = graph.successor_lists()
+
+        order = topological_order(self.predecessors, self.successors, names=graph.names)
+        self.position = [0] * len(order)
+        for rank, op in enumerate(order):
+            self.position[op] = rank
+
+        # Full passes once; afterwards everything is incremental
+        self.head, _early_finish = _forward_pass(order, self.predecessors, self.duration)
+        self.tail = [0] * len(order)
+        for op in reversed(order):
+            tail = 0
+            for succ in self.successors[op]:
+                length = self.duration[succ] + self.tail[succ]
+                if length > tail:
+                    tail = length
+            self.tail[op] = tail
+
+        self.updated_operations = 0
+
+    @property
+    def makespan(self) -> int:
+        """Length of the longest path through the network."""
+        return max(
+            (h + p + q for h, p, q in zip(self.head, self.duration, self.tail)),
+            default=0,
+        )
+
+    def add_machine_sequence(self, sequence: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        Fix a machine sequence and update heads and tails incrementally.
+
+        Args:
+            sequence: Operation indices in processing order
+
+        Returns:
+            List of (from, to) arcs that were added
+
+        Raises:
+            ValueError: If an arc would create a cycle (the graph is left unchanged)
+        """
+        arcs = list(zip(sequence[:-1], sequence[1:]))
+        added = []
+        try:
+            for a, b in arcs:
+                self._add_arc(a, b)
+                added.append((a, b))
+        except ValueError:
+            # Removing arcs keeps the topological order valid, so rolling back is enough
+            for a, b in added:
+                self.successors[a].remove(b)
+                self.predecessors[b].remove(a)
+            raise
+        self.graph.add_machine_sequence(sequence)
+
+        self._update_heads([b for _a, b in arcs])
+        self._update_tails([a for a, _b in arcs])
+        return arcs
+
+    def remove_machine_sequence(self, sequence: Sequence[int]) -> List[Tuple[int, int]]:
+        """
+        Release a fixed machine sequence and update heads and tails incrementally.
+
+        Removing arcs keeps the topological order valid; heads downstream and
+        tails upstream of the removed arcs can only decrease.
+
+        Args:
+            sequence: Operation indices in the processing order that was fixed
+
+        Returns:
+            List of (from, to) arcs that were removed
+        """
+        arcs = list(zip(sequence[:-1], sequence[1:]))
+        for a, b in arcs:
+            self.successors[a].remove(b)
+            self.predecessors[b].remove(a)
+        self.graph.remove_machine_sequence(sequence)
+
+        self._update_heads([b for _a, b in arcs])
+        self._update_tails([a for a, _b in arcs])
+        return arcs
+
+    def cpm(self) -> Dict[str, np.ndarray]:
+        """
+        Critical Path Method values from the maintained heads and tails.
+
+        Returns:
+            Dictionary of arrays indexed by operation: "early_start",
+            "early_finish", "late_start" and "late_finish"
+        """
+        head = np.asarray(self.head, dtype=np.int64)
+        tail = np.asarray(self.tail, dtype=np.int64)
+        duration = self.graph.duration
+        late_finish = self.makespan - tail
+
+        return {
+            "early_start": head,
+            "early_finish": head + duration,
+            "late_start": late_finish - duration,
+            "late_finish": late_finish,
+        }
 
-def minimize_maximum_lateness(df: pl.DataFrame) -> Dict[str, Any]:
+    def _add_arc(self, a: int, b: int) -> None:
+        """Insert arc a -> b, repairing the topological order if needed."""
+        if self.position[a] > self.position[b]:
+            self._reorder(a, b)
+        self.successors[a].append(b)
+        self.predecessors[b].append(a)
+
+    def _reorder(self, a: int, b: int) -> None:
+        """Pearce-Kelly: shift the affected region so that a precedes b."""
+        position = self.position
+        lower, upper = position[b], position[a]
+
+        # Operations reachable from b inside the affected region
+        forward, stack, seen = [], [b], {b}
+        while stack:
+            op = stack.pop()
+            forward.append(op)
+            for succ in self.successors[op]:
+                if succ == a:
+                    raise ValueError(
+                        f"Adding arc {self.graph.names[a]} -> {self.graph.names[b]} creates a cycle"
+                    )
+                if succ not in seen and position[succ] < upper:
+                    seen.add(succ)
+                    stack.append(succ)
+
+        # Operations that reach a inside the affected region
+        backward, stack, seen = [], [a], {a}
+        while stack:
+            op = stack.pop()
+            backward.append(op)
+            for pred in self.predecessors[op]:
+                if pred not in seen and position[pred] > lower:
+                    seen.add(pred)
+                    stack.append(pred)
+
+        # Reuse the freed positions: everything reaching a, then everything reached from b
+        backward.sort(key=position.__getitem__)
+        forward.sort(key=position.__getitem__)
+        moved = backward + forward
+        for op, rank in zip(moved, sorted(position[op] for op in moved)):
+            position[op] = rank
+
+    def _update_heads(self, changed: List[int]) -> None:
+        """Re-evaluate heads downstream of changed operations in topological order."""
+        position, duration, head = self.position, self.duration, self.head
+        queued = set(changed)
+        heap = [(position[op], op) for op in queued]
+        heapq.heapify(heap)
+
+        while heap:
+            _rank, op = heapq.heappop(heap)
+            self.updated_operations += 1
+            new_head = 0
+            for pred in self.predecessors[op]:
+                finish = head[pred] + duration[pred]
+                if finish > new_head:
+                    new_head = finish
+            if new_head == head[op]:
+                continue
+            head[op] = new_head
+            for succ in self.successors[op]:
+                if succ not in queued:
+                    queued.add(succ)
+                    heapq.heappush(heap, (position[succ], succ))
+
+    def _update_tails(self, changed: List[int]) -> None:
+        """Re-evaluate tails upstream of changed operations in reverse topological order."""
+        position, duration, tail = self.position, self.duration, self.tail
+        queued = set(changed)
+        heap = [(-position[op], op) for op in queued]
+        heapq.heapify(heap)
+
+        while heap:
+            _rank, op = heapq.heappop(heap)
+            self.updated_operations += 1
+            new_tail = 0
+            for succ in self.successors[op]:
+                length = duration[succ] + tail[succ]
+                if length > new_tail:
+                    new_tail = length
+            if new_tail == tail[op]:
+                continue
+            tail[op] = new_tail
+            for pred in self.predecessors[op]:
+                if pred not in queued:
+                    queued.add(pred)
+                    heapq.heappush(heap, (-position[pred], pred))
+
+
+def minimize_maximum_lateness(
+    jobs: Union[pl.DataFrame, Sequence[Any]],
+    pj: Sequence[float] = None,
+    rj: Sequence[float] = None,
+    dj: Sequence[float] = None,
+) -> Dict[str, Any]:
     """
     Solve the single machine scheduling problem to minimize maximum lateness.
 
@@ -208,12 +978,19 @@ def minimize_maximum_lateness(df: pl.DataFrame) -> Dict[str, Any]:
     considering release times. Jobs are scheduled as early as possible based on
     their availability and due dates.
 
+    Jobs are released from a release-time-sorted array into a due-date
+    min-heap, so the sequence is built in O(n log n). Ties on the due date
+    go to the job that was released first, then to the job listed first.
+
     Args:
-        df: A Polars DataFrame with four columns:
+        jobs: Job identifiers (column array), or a Polars DataFrame with four columns:
             - "job" (str): Job identifier
             - "pj" (float): Job processing time
             - "rj" (float): Job release time
             - "dj" (float): Job due date
+        pj: Job processing times (column array, when jobs is not a DataFrame)
+        rj: Job release times (column array, when jobs is not a DataFrame)
+        dj: Job due dates (column array, when jobs is not a DataFrame)
 
     Returns:
         A dictionary containing:
@@ -221,56 +998,56 @@ def minimize_maximum_lateness(df: pl.DataFrame) -> Dict[str, Any]:
             - "max_lateness": The maximum lateness value across all jobs
 
     Example:
-        >>> df = pl.DataFrame({
-        ...     "job": ["J1", "J2", "J3"],
-        ...     "pj": [3, 2, 4],
-        ...     "rj": [0, 1, 0],
-        ...     "dj": [5, 8, 10]
-        ... })
-        >>> result = minimize_maximum_lateness(df)
+        >>> result = minimize_maximum_lateness(
+        ...     ["J1", "J2", "J3"], pj=[3, 2, 4], rj=[0, 1, 0], dj=[5, 8, 10]
+        ... )
         >>> result["max_lateness"]
     """
-    # Convert DataFrame to list of dictionaries for easier manipulation
-    jobs = df.to_dicts()
+    if isinstance(jobs, pl.DataFrame):
+        jobs, pj, rj, dj = (jobs[column] for column in ("job", "pj", "rj", "dj"))
+    jobs, pj, rj, dj = (_to_list(column) for column in (jobs, pj, rj, dj))
+    n_jobs = len(jobs)
+
+    # Release-time-sorted array and a (due date, release step, index) min-heap
+    release_order = sorted(range(n_jobs), key=lambda i: (rj[i], i))
+    available_jobs = []
+    next_release = 0
     scheduled = []
     current_time = 0
-    available_jobs = []
 
-    while len(scheduled) < len(jobs):
-        # Find all jobs that are available (released) at current_time
-        for job in jobs:
-            if job not in scheduled and job["rj"] <= current_time:
-                if job not in available_jobs:
-                    available_jobs.append(job)
+    while len(scheduled) < n_jobs:
+        # Move all jobs released by current_time into the heap
+        while next_release < n_jobs and rj[release_order[next_release]] <= current_time:
+            i = release_order[next_release]
+            heapq.heappush(available_jobs, (dj[i], len(scheduled), i))
+            next_release += 1
 
         # If no jobs are available, advance time to the next release time
         if not available_jobs:
-            next_release = min(job["rj"] for job in jobs if job not in scheduled)
-            current_time = next_release
+            current_time = rj[release_order[next_release]]
             continue
 
         # Select job with earliest due date among available jobs
-        selected_job = min(available_jobs, key=lambda j: j["dj"])
-        available_jobs.remove(selected_job)
+        _due_date, _step, selected_job = heapq.heappop(available_jobs)
         scheduled.append(selected_job)
 
         # Update current time
-        current_time += selected_job["pj"]
+        current_time += pj[selected_job]
 
     # Calculate completion times and lateness for each job
     current_time = 0
     max_lateness = float('-inf')
     job_details = []
 
-    for job in scheduled:
+    for i in scheduled:
         # Job starts at max(current_time, release_time)
-        start_time = max(current_time, job["rj"])
-        completion_time = start_time + job["pj"]
-        lateness = completion_time - job["dj"]
+        start_time = max(current_time, rj[i])
+        completion_time = start_time + pj[i]
+        lateness = completion_time - dj[i]
         max_lateness = max(max_lateness, lateness)
 
         job_details.append({
-            "job": job["job"],
+            "job": jobs[i],
             "start": start_time,
             "completion": completion_time,
             "lateness": lateness
@@ -278,7 +1055,7 @@ def minimize_maximum_lateness(df: pl.DataFrame) -> Dict[str, Any]:
 
         current_time = completion_time
 
-    sequence = [job["job"] for job in scheduled]
+    sequence = [jobs[i] for i in scheduled]
 
     return {
         "sequence": sequence,
@@ -287,107 +1064,1560 @@ def minimize_maximum_lateness(df: pl.DataFrame) -> Dict[str, Any]:
     }
 
 
-def parse_machine_job(machine_job_str: str) -> Tuple[str, str]:
+def carlier_minimize_maximum_lateness(
+    jobs: Union[pl.DataFrame, Sequence[Any]],
+    pj: Sequence[float] = None,
+    rj: Sequence[float] = None,
+    dj: Sequence[float] = None,
+    node_limit: int = 10_000,
+    time_limit: float = 1.0,
+) -> Dict[str, Any]:
     """
-    Parse the machine,job string into separate components.
+    Solve 1|rj|Lmax exactly with Carlier's branch-and-bound.
+
+    The problem is written with heads r_j, bodies p_j and tails
+    q_j = max(d) - d_j, so minimizing Lmax is minimizing max(C_j + q_j).
+    Every node runs Schrage's heuristic (non-preemptive, largest tail
+    first, i.e. dynamic EDD); the incumbent is the best Schrage schedule
+    found. From the critical path of a Schrage schedule an interference
+    job c and a critical set J are found, and the node branches on
+    "c after J" (raise r_c) or "c before J" (raise q_c). Nodes are pruned
+    with the preemptive (Jackson) lower bound and the bounds h(J) and
+    h(J + c). If the node or time limit is hit, the best schedule found so
+    far is returned, which is never worse than dynamic EDD.
 
     Args:
-        machine_job_str: String in format "machine,job" (e.g., "3,2")
+        jobs: Job identifiers (column array), or a Polars DataFrame with
+            "job", "pj", "rj" and "dj" columns
+        pj: Job processing times (column array, when jobs is not a DataFrame)
+        rj: Job release times (column array, when jobs is not a DataFrame)
+        dj: Job due dates (column array, when jobs is not a DataFrame)
+        node_limit: Maximum number of branch-and-bound nodes
+        time_limit: Maximum search time in seconds
 
     Returns:
-        Tuple of (machine, job) as strings
+        A dictionary containing:
+            - "sequence": List of job IDs in the scheduled order
+            - "max_lateness": The maximum lateness value across all jobs
+            - "job_details": Start, completion and lateness of each job
+            - "stats": Search statistics ("nodes", "optimal",
+              "lower_bound", "time")
     """
-    parts = machine_job_str.split(',')
-    return parts[0], parts[1]
+    if isinstance(jobs, pl.DataFrame):
+        jobs, pj, rj, dj = (jobs[column] for column in ("job", "pj", "rj", "dj"))
+    jobs, pj, rj, dj = (_to_list(column) for column in (jobs, pj, rj, dj))
+    n_jobs = len(jobs)
+    if n_jobs == 0:
+        return {
+            "sequence": [],
+            "max_lateness": float("-inf"),
+            "job_details": [],
+            "stats": {"nodes": 0, "optimal": True, "lower_bound": float("-inf"), "time": 0.0},
+        }
 
+    started = time.perf_counter()
+    max_due_date = max(dj)
+    tails = [max_due_date - d for d in dj]
+
+    best_sequence, best_value = _schrage(pj, rj, tails)
+    root_bound = _preemptive_bound(pj, rj, tails)
+    lower_bound = root_bound
+
+    nodes = 0
+    stack = [(list(rj), list(tails))]
+    while stack and best_value > root_bound:
+        if nodes >= node_limit or time.perf_counter() - started > time_limit:
+            break
+        heads, node_tails = stack.pop()
+        nodes += 1
+
+        sequence, value = _schrage(pj, heads, node_tails)
+        if value < best_value:
+            best_sequence, best_value = sequence, value
+
+        critical = _critical_set(sequence, pj, heads, node_tails, value)
+        if critical is None:
+            # Schrage is optimal for this node
+            continue
+        c, critical_jobs = critical
+
+        head_j = min(heads[j] for j in critical_jobs)
+        tail_j = min(node_tails[j] for j in critical_jobs)
+        body_j = sum(pj[j] for j in critical_jobs)
+        set_bound = max(
+            head_j + body_j + tail_j,
+            min(head_j, heads[c]) + body_j + pj[c] + min(tail_j, node_tails[c]),
+        )
+
+        # Branch 1: c is processed after every job of J
+        after_heads = list(heads)
+        after_heads[c] = max(heads[c], head_j + body_j)
+        # Branch 2: c is processed before every job of J
+        before_tails = list(node_tails)
+        before_tails[c] = max(node_tails[c], tail_j + body_j)
+
+        for child_heads, child_tails in ((list(heads), before_tails), (after_heads, list(node_tails))):
+            bound = max(set_bound, _preemptive_bound(pj, child_heads, child_tails))
+            if bound < best_value:
+                stack.append((child_heads, child_tails))
+
+    optimal = not stack or best_value <= root_bound
+    if optimal:
+        lower_bound = best_value
+
+    # Calculate completion times and lateness for each job in the original data
+    current_time = 0
+    max_lateness = float('-inf')
+    job_details = []
+    for i in best_sequence:
+        start_time = max(current_time, rj[i])
+        completion_time = start_time + pj[i]
+        lateness = completion_time - dj[i]
+        max_lateness = max(max_lateness, lateness)
+        job_details.append({
+            "job": jobs[i],
+            "start": start_time,
+            "completion": completion_time,
+            "lateness": lateness
+        })
+        current_time = completion_time
+
+    return {
+        "sequence": [jobs[i] for i in best_sequence],
+        "max_lateness": max_lateness,
+        "job_details": job_details,
+        "stats": {
+            "nodes": nodes,
+            "optimal": optimal,
+            "lower_bound": lower_bound - max_due_date,
+            "time": time.perf_counter() - started,
+        },
+    }
+
+
+def _schrage(pj: List[float], heads: List[float], tails: List[float]) -> Tuple[List[int], float]:
+    """Schrage's heuristic: whenever the machine is free, start the released job with the largest tail."""
+    n_jobs = len(pj)
+    release_order = sorted(range(n_jobs), key=lambda i: (heads[i], i))
+    ready = []
+    next_release = 0
+    current_time = 0
+    sequence = []
+    value = float('-inf')
+
+    while len(sequence) < n_jobs:
+        if not ready and heads[release_order[next_release]] > current_time:
+            current_time = heads[release_order[next_release]]
+        while next_release < n_jobs and heads[release_order[next_release]] <= current_time:
+            i = release_order[next_release]
+            heapq.heappush(ready, (-tails[i], i))
+            next_release += 1
+
+        _tail, i = heapq.heappop(ready)
+        sequence.append(i)
+        current_time += pj[i]
+        value = max(value, current_time + tails[i])
+
+    return sequence, value
+
+
+def _preemptive_bound(pj: List[float], heads: List[float], tails: List[float]) -> float:
+    """Value of Jackson's preemptive schedule (largest tail first, with preemption), a lower bound."""
+    n_jobs = len(pj)
+    release_order = sorted(range(n_jobs), key=lambda i: heads[i])
+    remaining = list(pj)
+    ready = []
+    next_release = 0
+    current_time = 0
+    value = float('-inf')
+
+    while next_release < n_jobs or ready:
+        if not ready:
+            current_time = max(current_time, heads[release_order[next_release]])
+        while next_release < n_jobs and heads[release_order[next_release]] <= current_time:
+            i = release_order[next_release]
+            heapq.heappush(ready, (-tails[i], i))
+            next_release += 1
+
+        _tail, i = ready[0]
+        # Run the job until it finishes or the next release (which may preempt it)
+        next_time = heads[release_order[next_release]] if next_release < n_jobs else float('inf')
+        run = min(remaining[i], next_time - current_time)
+        current_time += run
+        remaining[i] -= run
+        if remaining[i] == 0:
+            heapq.heappop(ready)
+            value = max(value, current_time + tails[i])
+
+    return value
+
+
+def _critical_set(
+    sequence: List[int],
+    pj: List[float],
+    heads: List[float],
+    tails: List[float],
+    value: float,
+):
+    """
+    Interference job c and critical set J of a Schrage schedule.
 
-def create_gantt_chart(df: pl.DataFrame) -> Tuple[Any, Any]:
+    Returns None when the schedule is optimal for the node (no job on the
+    critical path has a smaller tail than the last critical job).
     """
-    Create a Gantt chart from the solution data.
+    starts = []
+    current_time = 0
+    for i in sequence:
+        current_time = max(current_time, heads[i])
+        starts.append(current_time)
+        current_time += pj[i]
+
+    # Last job p on the critical path
+    p = max(k for k, i in enumerate(sequence) if starts[k] + pj[i] + tails[i] == value)
+
+    # First job a of the contiguous block ending at p
+    a = p
+    while a > 0 and starts[a - 1] + pj[sequence[a - 1]] == starts[a]:
+        a -= 1
+
+    # Last job c of the block with a smaller tail than p
+    tail_p = tails[sequence[p]]
+    for k in range(p - 1, a - 1, -1):
+        if tails[sequence[k]] < tail_p:
+            return sequence[k], sequence[k + 1:p + 1]
+    return None
+
+
+SUBPROBLEM_SOLVERS = {
+    "edd": minimize_maximum_lateness,
+    "carlier": carlier_minimize_maximum_lateness,
+}
+
+
+class SubproblemCache(LRUCache):
+    """
+    Bounded LRU cache of single-machine subproblem results.
+
+    Keys are the machine, the solver (and its options) and a digest of the
+    operation indices and their pj, rj and dj vectors. Between SBN
+    iterations most unscheduled machines are not reached by the new arcs,
+    so their subproblems are looked up instead of solved again.
+
+    Due dates are late finishes (makespan - tail) and move together when
+    the makespan grows, which changes Lmax but not the optimal sequence;
+    solve_machine_subproblems therefore keys on dj - max(dj) and stores
+    Lmax relative to that offset.
+
+    Bounded and counted by cache_utilities.LRUCache (maxsize, hits,
+    misses, clear() and info()); sequences are stored as tuples and handed
+    out as fresh lists flagged "cached".
+    """
+
+    def get(self, key) -> Dict[str, Any]:
+        """Return a copy of the cached result for key (or None) and update the counters."""
+        result = super().get(key)
+        if result is None:
+            return None
+        return {**result, "sequence": list(result["sequence"]), "cached": True}
+
+    def put(self, key, result: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        super().put(key, {**result, "sequence": tuple(result["sequence"])})
+
+
+def _subproblem_cache_key(task: Tuple[str, np.ndarray, np.ndarray, np.ndarray, np.ndarray, str, dict]) -> Tuple[tuple, int]:
+    """Cache key of a subproblem and the due-date offset it was normalized by."""
+    machine, operations, pj, rj, dj, solver, solver_options = task
+    offset = int(dj.max()) if len(dj) else 0
+    digest = hashlib.blake2b(digest_size=16)
+    for values in (operations, pj, rj, dj - offset):
+        digest.update(np.ascontiguousarray(values, dtype=np.int64).tobytes())
+    return (machine, solver, tuple(sorted(solver_options.items())), digest.hexdigest()), offset
+
+
+def _shift_lateness(result: Dict[str, Any], shift: int) -> Dict[str, Any]:
+    """Result with Lmax (and the lower bound of exact solvers) shifted by a constant."""
+    stats = result.get("stats")
+    if stats is not None and "lower_bound" in stats:
+        stats = {**stats, "lower_bound": stats["lower_bound"] + shift}
+    return {**result, "Lmax": result["Lmax"] + shift, "stats": stats}
+
+
+def _solve_subproblem(task: Tuple[str, np.ndarray, np.ndarray, np.ndarray, np.ndarray, str, dict]) -> dict:
+    """Solve one machine's 1|rj|Lmax problem (pool entry point)."""
+    machine, operations, pj, rj, dj, solver, solver_options = task
+    result = SUBPROBLEM_SOLVERS[solver](operations, pj=pj, rj=rj, dj=dj, **solver_options)
+    return {
+        "machine": machine,
+        "sequence": result["sequence"],
+        "Lmax": result["max_lateness"],
+        "stats": result.get("stats"),
+        "cached": False,
+    }
+
+
+def solve_machine_subproblems(
+    graph: DisjunctiveGraph,
+    cpm_results: Dict[str, np.ndarray],
+    machines: Sequence[str],
+    solver: str = "edd",
+    solver_options: Dict[str, Any] = None,
+    max_workers: int = 1,
+    executor: str = "process",
+    cache: SubproblemCache = None,
+) -> List[Dict[str, Any]]:
+    """
+    Solve the single-machine subproblem of every candidate bottleneck.
+
+    Release times (early starts) and due dates (late finishes) are sliced
+    from one read-only CPM snapshot, so the subproblems are independent and
+    can be dispatched to a thread or process pool. Results are returned in
+    the order of machines regardless of completion order. With a cache,
+    only machines whose (pj, rj, dj) changed since they were last solved
+    are dispatched.
 
     Args:
-        df: Polars DataFrame with current_machine_job, predecessors, and pij columns
-        output_file: Path to save the output image
+        graph: The current DisjunctiveGraph
+        cpm_results: CPM arrays of the graph ("early_start", "late_finish", ...)
+        machines: Machine labels to evaluate
+        solver: Key of SUBPROBLEM_SOLVERS ("edd" or "carlier")
+        solver_options: Extra keyword arguments for the solver (e.g. node_limit)
+        max_workers: Number of workers (1 solves serially; None uses all CPUs)
+        executor: "process" or "thread" pool
+        cache: Optional SubproblemCache to look up and store results
 
     Returns:
-        Tuple of (figure, axes) matplotlib objects
+        List of dictionaries with "machine", "sequence" (operation indices),
+        "Lmax", "stats" (None for solvers without statistics) and "cached"
     """
-    # Calculate CPM to get early start times
-    cpm_results = calculate_cpm(df)
+    solver_options = solver_options or {}
+    early_start, late_finish = cpm_results["early_start"], cpm_results["late_finish"]
+
+    tasks = []
+    for machine in machines:
+        operations = graph.operations_on(machine)
+        tasks.append((
+            machine,
+            operations,
+            graph.duration[operations],
+            early_start[operations],
+            late_finish[operations],
+            solver,
+            solver_options,
+        ))
+
+    results = [None] * len(tasks)
+    if cache is not None:
+        keys, offsets = zip(*[_subproblem_cache_key(task) for task in tasks]) if tasks else ((), ())
+        for idx, key in enumerate(keys):
+            cached = cache.get(key)
+            if cached is not None:
+                results[idx] = _shift_lateness(cached, -offsets[idx])
+    pending = [idx for idx, result in enumerate(results) if result is None]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(pending))
+
+    if max_workers <= 1:
+        solved = [_solve_subproblem(tasks[idx]) for idx in pending]
+    else:
+        pool = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+        with pool(max_workers=max_workers) as workers:
+            solved = list(workers.map(_solve_subproblem, [tasks[idx] for idx in pending]))
+
+    for idx, result in zip(pending, solved):
+        results[idx] = result
+        if cache is not None:
+            cache.put(keys[idx], _shift_lateness(result, offsets[idx]))
+    return results
+
+
+def select_bottleneck(results: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Machine with the largest Lmax; ties go to the machine evaluated first.
 
-    # Parse data and organize by machine
-    machine_jobs = {}  # machine -> list of (job, start_time, duration)
+    Args:
+        results: Output of solve_machine_subproblems
 
-    for row in df.iter_rows(named=True):
-        machine_job = row['current_machine_job']
-        machine, job = parse_machine_job(machine_job)
+    Returns:
+        The result dictionary of the bottleneck machine
+    """
+    return max(results, key=lambda result: result["Lmax"]) if results else None
+
+
+def reoptimize_machines(
+    engine: IncrementalCPM,
+    machine_sequences: Dict[str, List[int]],
+    solver: str = "edd",
+    solver_options: Dict[str, Any] = None,
+    max_passes: int = None,
+    cache: SubproblemCache = None,
+    timings: Dict[str, float] = None,
+) -> Dict[str, int]:
+    """
+    Re-optimization phase of the shifting bottleneck heuristic.
 
-        early_start = cpm_results[machine_job]['early_start']
-        duration = row['pij']
+    Each scheduled machine in turn has its arcs removed, its 1|rj|Lmax
+    subproblem re-solved with the heads and tails of the remaining network,
+    and the new sequence inserted. The new sequence is kept only if it
+    shortens the makespan; otherwise the previous one is restored. Passes
+    over the scheduled machines are repeated until one brings no
+    improvement. All network updates are incremental, so a pass costs a
+    few partial head/tail updates per machine instead of full CPM runs.
 
-        if machine not in machine_jobs:
-            machine_jobs[machine] = []
+    Args:
+        engine: IncrementalCPM of the current network (updated in place)
+        machine_sequences: Scheduled machine -> operation sequence (updated in place)
+        solver: Key of SUBPROBLEM_SOLVERS ("edd" or "carlier")
+        solver_options: Extra keyword arguments for the solver
+        max_passes: Maximum number of passes (None repeats until no improvement)
+        cache: Optional SubproblemCache; a machine whose neighbourhood did not
+            change since the previous pass is looked up instead of re-solved
+        timings: Optional dictionary accumulating seconds per phase
+            ("cpm", "subproblems", "network_updates")
 
-        machine_jobs[machine].append({
-            'job': job,
-            'start': early_start,
-            'duration': duration,
-            'end': early_start + duration
-        })
+    Returns:
+        Dictionary with "passes", "improvements" and the resulting "makespan"
+
+    Example:
+        >>> engine = IncrementalCPM(graph)
+        >>> engine.add_machine_sequence(sequence)
+        >>> reoptimize_machines(engine, {"1": sequence})
+    """
+    passes, improvements = 0, 0
+    improved = len(machine_sequences) > 1
+
+    while improved and (max_passes is None or passes < max_passes):
+        improved = False
+        passes += 1
+        for machine, sequence in list(machine_sequences.items()):
+            makespan = engine.makespan
+            with _timed(timings, "network_updates"):
+                engine.remove_machine_sequence(sequence)
+            with _timed(timings, "cpm"):
+                cpm_results = engine.cpm()
+
+            with _timed(timings, "subproblems"):
+                result = solve_machine_subproblems(
+                    engine.graph, cpm_results, [machine], solver=solver, solver_options=solver_options,
+                    cache=cache,
+                )[0]
+            new_sequence = list(result["sequence"])
+
+            with _timed(timings, "network_updates"):
+                if new_sequence != list(sequence):
+                    try:
+                        engine.add_machine_sequence(new_sequence)
+                    except ValueError:
+                        new_sequence = None
+                    if new_sequence is not None and engine.makespan < makespan:
+                        machine_sequences[machine] = new_sequence
+                        improvements += 1
+                        improved = True
+                        continue
+                    if new_sequence is not None:
+                        engine.remove_machine_sequence(new_sequence)
+
+                engine.add_machine_sequence(sequence)
+
+    return {"passes": passes, "improvements": improvements, "makespan": engine.makespan}
+
+
+def shifting_bottleneck(
+    graph: DisjunctiveGraph,
+    machines: Sequence[str] = None,
+    solver: str = "edd",
+    solver_options: Dict[str, Any] = None,
+    reoptimize: bool = True,
+    max_workers: int = 1,
+    executor: str = "process",
+    cache: SubproblemCache = None,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """
+    Shifting bottleneck heuristic on a DisjunctiveGraph.
 
-    # Sort machines for consistent display
-    machines = sorted(machine_jobs.keys(), key=lambda x: int(x))
-
-    # Create the Gantt chart
-    fig, ax = plt.subplots(figsize=(12, max(6, len(machines) * 0.8)))
-
-    # Color palette for jobs
-    colors = plt.cm.tab10.colors
-
-    # Plot each machine's jobs
-    for i, machine in enumerate(machines):
-        jobs = machine_jobs[machine]
-
-        for job_info in jobs:
-            # Draw the bar
-            bar = ax.barh(
-                i,
-                job_info['duration'],
-                left=job_info['start'],
-                height=0.6,
-                color=colors[int(job_info['job']) % len(colors)],
-                edgecolor='black',
-                linewidth=1.5
+    The SBN loop used by shifting_bottleneck_heuristic.py and the
+    benchmarks: bottleneck selection from one CPM snapshot, incremental arc
+    insertion and the optional re-optimization phase, with each phase
+    timed.
+
+    Args:
+        graph: Network to schedule (not modified; a copy is sequenced)
+        machines: Machines to schedule, in tie-breaking order (default: all)
+        solver: Key of SUBPROBLEM_SOLVERS ("edd" or "carlier")
+        solver_options: Extra keyword arguments for the solver
+        reoptimize: Run the re-optimization phase after each bottleneck
+        max_workers: Workers for the candidate subproblems (1 solves serially)
+        executor: "process" or "thread" pool
+        cache: Optional SubproblemCache shared by all iterations
+        verbose: Print the bottleneck (and re-optimized makespan) of each iteration
+
+    Returns:
+        Dictionary with:
+            - "graph": The sequenced DisjunctiveGraph
+            - "makespan": Length of the resulting schedule
+            - "machine_sequences": Machine -> operation sequence
+            - "bottlenecks": Machines in the order they were scheduled
+            - "search_statistics": Branch-and-bound statistics of every solved
+              (not cached) subproblem, with its iteration and machine (empty
+              for the EDD solver)
+            - "timings": Seconds spent in "cpm", "subproblems" and
+              "network_updates" (the re-optimization phase included)
+
+    Example:
+        >>> result = shifting_bottleneck(graph, solver="carlier")
+        >>> result["makespan"]
+    """
+    timings = {"cpm": 0.0, "subproblems": 0.0, "network_updates": 0.0}
+    graph = graph.copy()
+    machines = list(graph.machine_ids if machines is None else machines)
+
+    with _timed(timings, "cpm"):
+        engine = IncrementalCPM(graph)
+
+    machine_sequences, bottlenecks, search_statistics = {}, [], []
+    while len(bottlenecks) < len(machines):
+        unscheduled = [m for m in machines if m not in machine_sequences]
+        with _timed(timings, "cpm"):
+            cpm_results = engine.cpm()
+        with _timed(timings, "subproblems"):
+            results = solve_machine_subproblems(
+                graph, cpm_results, unscheduled, solver=solver, solver_options=solver_options,
+                max_workers=max_workers, executor=executor, cache=cache,
             )
+        # Cached results were already recorded when they were solved
+        for result in results:
+            if result.get("stats") is not None and not result.get("cached"):
+                search_statistics.append({
+                    "iteration": len(bottlenecks) + 1, "machine": result["machine"], **result["stats"],
+                })
+        bottleneck = select_bottleneck(results)
+        if verbose:
+            print(f"Identified bottleneck is {bottleneck['machine']}")
+
+        with _timed(timings, "network_updates"):
+            engine.add_machine_sequence(bottleneck["sequence"])
+        machine_sequences[bottleneck["machine"]] = list(bottleneck["sequence"])
+        bottlenecks.append(bottleneck["machine"])
+
+        if reoptimize:
+            reoptimization = reoptimize_machines(
+                engine, machine_sequences, solver=solver, solver_options=solver_options,
+                cache=cache, timings=timings,
+            )
+            if verbose:
+                print(f"  Makespan after re-optimization: {reoptimization['makespan']} "
+                      f"({reoptimization['improvements']} machines resequenced)")
+
+    return {
+        "graph": graph,
+        "makespan": engine.makespan,
+        "machine_sequences": machine_sequences,
+        "bottlenecks": bottlenecks,
+        "search_statistics": search_statistics,
+        "timings": timings,
+    }
+
+
+def makespan_lower_bounds(graph: DisjunctiveGraph) -> Dict[str, Any]:
+    """
+    Lower bounds on the optimal makespan of a job shop.
+
+    Heads and tails come from the job routings alone (machine arcs are
+    ignored), so the bounds hold for every schedule:
+        - job bound: the longest job (total processing time, or the longest
+          routing path when routings branch)
+        - machine bound: for each machine, the smallest head plus its load
+          plus the smallest tail
+        - one-machine bound: for each machine, Jackson's preemptive schedule
+          of its 1|rj,pmtn|max(Cj + qj) relaxation with those heads and tails
+
+    Args:
+        graph: Job shop network
+
+    Returns:
+        Dictionary with "job_bound", "machine_bound", "one_machine_bound",
+        their maximum "lower_bound", and "machines": a Polars DataFrame
+        with machine, load, machine_bound and one_machine_bound per machine
+
+    Example:
+        >>> bounds = makespan_lower_bounds(network)
+        >>> gap = (makespan - bounds["lower_bound"]) / bounds["lower_bound"]
+    """
+    cpm = _job_cpm(graph)
+    head = cpm["early_start"]
+    routing_length = int(cpm["early_finish"].max(initial=0))
+    tail = routing_length - cpm["late_finish"]
+
+    n_machines = len(graph.machine_ids)
+    job_length = np.bincount(graph.job, weights=graph.duration, minlength=len(graph.job_ids))
+    load = np.bincount(graph.machine, weights=graph.duration, minlength=n_machines).astype(np.int64)
+    min_head = np.full(n_machines, np.iinfo(np.int64).max)
+    min_tail = np.full(n_machines, np.iinfo(np.int64).max)
+    np.minimum.at(min_head, graph.machine, head)
+    np.minimum.at(min_tail, graph.machine, tail)
+    machine_bound = np.where(load > 0, min_head + load + min_tail, 0)
+
+    one_machine_bound = [
+        int(_preemptive_bound(
+            graph.duration[operations].tolist(), head[operations].tolist(), tail[operations].tolist()
+        )) if len(operations) else 0
+        for operations in (graph.operations_on(machine) for machine in graph.machine_ids)
+    ]
+
+    bounds = {
+        "job_bound": max(int(job_length.max(initial=0)), routing_length),
+        "machine_bound": int(machine_bound.max(initial=0)),
+        "one_machine_bound": max(one_machine_bound, default=0),
+    }
+    bounds["lower_bound"] = max(bounds.values())
+    bounds["machines"] = pl.DataFrame({
+        "machine": graph.machine_ids,
+        "load": load,
+        "machine_bound": machine_bound,
+        "one_machine_bound": one_machine_bound,
+    })
+    return bounds
+
+
+def _expand_beam_node(
+    machine_sequences: Dict[str, List[int]],
+    incumbent: int,
+    graph: DisjunctiveGraph,
+    machines: List[str],
+    solver: str,
+    solver_options: Dict[str, Any],
+    branching: int,
+    reoptimize: bool,
+) -> Dict[str, Any]:
+    """Bound a partial SBN network and branch on its top bottleneck candidates."""
+    network = graph.copy()
+    for sequence in machine_sequences.values():
+        network.add_machine_sequence(sequence)
+    engine = IncrementalCPM(network)
+    unscheduled = [m for m in machines if m not in machine_sequences]
+
+    # Without re-optimization, descendants only add arcs, which can only
+    # lengthen heads and tails; the makespan and the preemptive one-machine
+    # bounds of the unscheduled machines then hold for every completion.
+    # Re-optimization resequences fixed machines and can shorten the
+    # schedule, so no bound is applied in that case.
+    if not reoptimize:
+        bound = engine.makespan
+        for machine in unscheduled:
+            operations = network.operations_on(machine).tolist()
+            bound = max(bound, _preemptive_bound(
+                [engine.duration[op] for op in operations],
+                [engine.head[op] for op in operations],
+                [engine.tail[op] for op in operations],
+            ))
+        if bound >= incumbent:
+            return {"pruned": True, "children": []}
+
+    results = solve_machine_subproblems(
+        network, engine.cpm(), unscheduled, solver=solver, solver_options=solver_options,
+    )
+    # Stable sort: ties keep the machine order, like select_bottleneck
+    candidates = sorted(results, key=lambda result: -result["Lmax"])[:branching]
+
+    children = []
+    for candidate in candidates:
+        child_sequences = {**machine_sequences, candidate["machine"]: list(candidate["sequence"])}
+        child = network.copy()
+        child.add_machine_sequence(child_sequences[candidate["machine"]])
+        try:
+            child_engine = IncrementalCPM(child)
+        except ValueError:
+            continue
+        if reoptimize:
+            reoptimize_machines(child_engine, child_sequences, solver=solver, solver_options=solver_options)
+        children.append({"machine_sequences": child_sequences, "makespan": child_engine.makespan})
+    return {"pruned": False, "children": children}
+
+
+def _expand_beam_node_worker(task: Tuple[Dict[str, List[int]], int]) -> Dict[str, Any]:
+    return _expand_beam_node(*task, **_WORKER_STATE)
+
+
+def beam_shifting_bottleneck(
+    graph: DisjunctiveGraph,
+    beam_width: int = 3,
+    branching: int = None,
+    machines: Sequence[str] = None,
+    solver: str = "edd",
+    solver_options: Dict[str, Any] = None,
+    reoptimize: bool = False,
+    max_workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Beam-search variant of the shifting bottleneck heuristic.
+
+    Instead of fixing only the machine with the largest Lmax, every level
+    keeps the beam_width best partial networks (fewest time units of
+    makespan so far). Each one is expanded on its branching machines with
+    the largest Lmax. Expansions of the nodes of a level are independent
+    and run in a process pool. The incumbent starts as the greedy SBN
+    schedule, so the result is never worse than shifting_bottleneck with
+    the same reoptimize setting.
+    beam_width = branching = 1 reproduces the greedy heuristic; larger
+    widths trade time for makespan.
+
+    Without re-optimization (the default), adding machines never shortens
+    a schedule, so a node is pruned when its makespan or the preemptive
+    one-machine bound of an unscheduled machine reaches the incumbent.
+    Re-optimization can shorten a partial schedule, so with
+    reoptimize=True no node bound is valid and nothing is pruned; the
+    beam then relies on ranking alone. In both cases the search stops once
+    the incumbent reaches makespan_lower_bounds, where it is optimal.
+
+    Args:
+        graph: Network to schedule (not modified)
+        beam_width: Partial networks kept per level
+        branching: Bottleneck candidates expanded per node (default: beam_width)
+        machines: Machines to schedule, in tie-breaking order (default: all)
+        solver: Key of SUBPROBLEM_SOLVERS ("edd" or "carlier")
+        solver_options: Extra keyword arguments for the solver
+        reoptimize: Run the re-optimization phase on every child (disables
+            pruning by bound)
+        max_workers: Worker processes for node expansion (1 expands serially,
+            None uses all CPUs)
+
+    Returns:
+        Dictionary with:
+            - "graph": The best sequenced DisjunctiveGraph
+            - "makespan": Its makespan
+            - "machine_sequences": Machine -> operation sequence
+            - "greedy_makespan": Makespan of the greedy SBN incumbent
+            - "expanded" and "pruned": Nodes expanded and nodes pruned by bound
+              (always 0 with reoptimize=True)
+            - "time": Seconds
+
+    Example:
+        >>> result = beam_shifting_bottleneck(network, beam_width=4, max_workers=4)
+        >>> result["greedy_makespan"], result["makespan"]
+    """
+    start_time = time.perf_counter()
+    machines = list(graph.machine_ids if machines is None else machines)
+    branching = beam_width if branching is None else branching
+
+    greedy = shifting_bottleneck(
+        graph, machines=machines, solver=solver, solver_options=solver_options, reoptimize=reoptimize,
+    )
+    best = {"makespan": greedy["makespan"], "machine_sequences": greedy["machine_sequences"]}
+    lower_bound = makespan_lower_bounds(graph)["lower_bound"]
+
+    state = {
+        "graph": graph,
+        "machines": machines,
+        "solver": solver,
+        "solver_options": solver_options or {},
+        "branching": branching,
+        "reoptimize": reoptimize,
+    }
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    workers = None
+    if max_workers > 1 and beam_width > 1:
+        workers = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(state,))
+
+    beam, expanded, pruned = [{}], 0, 0
+    try:
+        for level in range(len(machines)):
+            if best["makespan"] <= lower_bound:
+                break
+            tasks = [(machine_sequences, best["makespan"]) for machine_sequences in beam]
+            if workers is None:
+                expansions = [_expand_beam_node(*task, **state) for task in tasks]
+            else:
+                expansions = list(workers.map(_expand_beam_node_worker, tasks))
+            expanded += len(tasks)
+            pruned += sum(1 for expansion in expansions if expansion["pruned"])
+
+            # Pool the children; the same arc set reached twice is kept once
+            children, seen = [], set()
+            for expansion in expansions:
+                for child in expansion["children"]:
+                    key = frozenset((m, tuple(s)) for m, s in child["machine_sequences"].items())
+                    if key not in seen:
+                        seen.add(key)
+                        children.append(child)
+
+            if level == len(machines) - 1:
+                for child in children:
+                    if child["makespan"] < best["makespan"]:
+                        best = child
+                break
+
+            # Without re-optimization a partial makespan only grows as machines are added
+            if not reoptimize:
+                children = [child for child in children if child["makespan"] < best["makespan"]]
+            children.sort(key=lambda child: child["makespan"])
+            beam = [child["machine_sequences"] for child in children[:beam_width]]
+            if not beam:
+                break
+    finally:
+        if workers is not None:
+            workers.shutdown()
+
+    scheduled = graph.copy()
+    for sequence in best["machine_sequences"].values():
+        scheduled.add_machine_sequence(sequence)
+
+    return {
+        "graph": scheduled,
+        "makespan": best["makespan"],
+        "machine_sequences": best["machine_sequences"],
+        "greedy_makespan": greedy["makespan"],
+        "expanded": expanded,
+        "pruned": pruned,
+        "time": time.perf_counter() - start_time,
+    }
+
+
+def tabu_search(
+    graph: DisjunctiveGraph,
+    max_iterations: int = 1000,
+    time_limit: float = None,
+    tabu_tenure: int = 8,
+    lower_bound: int = None,
+) -> Dict[str, Any]:
+    """
+    Critical-block tabu search on a fully sequenced job shop schedule.
+
+    Starting from the machine arcs of graph (e.g. the SBN solution), each
+    iteration takes one critical path, splits it into blocks (maximal runs
+    of operations on the same machine) and evaluates:
+        - N5 moves: swap the first two or last two operations of a block
+          (not the first pair of the first block nor the last pair of the
+          last block, which cannot shorten the path)
+        - N6 moves: move an operation of a block to the start or end of
+          the block, when a head/tail condition guarantees no cycle
+
+    Moves are ranked by an approximate makespan: the heads and tails of
+    the reordered operations are recomputed from the unchanged heads of
+    their job and machine neighbours, without a CPM per candidate. The
+    best non-tabu move (or a tabu one that beats the best makespan) is
+    applied with incremental head/tail updates. Reversed operation pairs
+    are tabu for tabu_tenure iterations.
+
+    Args:
+        graph: Sequenced DisjunctiveGraph (not modified)
+        max_iterations: Iteration budget
+        time_limit: Time budget in seconds (None for no limit)
+        tabu_tenure: Iterations a reversed pair stays tabu
+        lower_bound: Stop as soon as the makespan reaches this value (e.g.
+            makespan_lower_bounds(graph)["lower_bound"])
+
+    Returns:
+        Dictionary with:
+            - "graph": Copy of graph with the best machine arcs found
+            - "machine_sequences": Machine -> operation sequence of the best schedule
+            - "makespan" and "initial_makespan"
+            - "iterations", "improvements" and "time" (seconds)
+            - "history": Makespan after each iteration
+
+    Example:
+        >>> result = tabu_search(shifting_bottleneck(graph)["graph"], max_iterations=500)
+        >>> result["makespan"]
+    """
+    start_time = time.perf_counter()
+    engine = IncrementalCPM(graph.copy())
+    work = engine.graph
+    duration = engine.duration
+
+    ptr, idx = work.pred_ptr.tolist(), work.pred_idx.tolist()
+    job_predecessors = [idx[ptr[i]:ptr[i + 1]] for i in range(work.n_operations)]
+    ptr, idx = work.succ_ptr.tolist(), work.succ_idx.tolist()
+    job_successors = [idx[ptr[i]:ptr[i + 1]] for i in range(work.n_operations)]
+
+    best_makespan = initial_makespan = engine.makespan
+    best_sequences = work.machine_sequences()
+    tabu = {}  # (a, b) -> iteration until which putting a before b again is tabu
+    history, improvements, iteration = [], 0, 0
+
+    while iteration < max_iterations:
+        if time_limit is not None and time.perf_counter() - start_time > time_limit:
+            break
+        if lower_bound is not None and best_makespan <= lower_bound:
+            break  # proven optimal
+        moves = _block_moves(engine, job_predecessors, job_successors)
+        if not moves:
+            break  # no block of two or more operations: the critical path cannot be shortened
+
+        candidates = []
+        for segment, new_order in moves:
+            estimate = _estimate_makespan(engine, segment, new_order, job_predecessors, job_successors)
+            reversed_pairs = _reversed_pairs(segment, new_order)
+            is_tabu = any(tabu.get((b, a), -1) >= iteration for a, b in reversed_pairs)
+            candidates.append((is_tabu and estimate >= best_makespan, estimate, segment, new_order, reversed_pairs))
+
+        # Best admissible move; when every move is tabu, the best tabu move
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[1]))
+        for _is_tabu, _estimate, segment, new_order, reversed_pairs in candidates:
+            chain, new_chain = _reordered_chain(work, segment, new_order)
+            engine.remove_machine_sequence(chain)
+            try:
+                engine.add_machine_sequence(new_chain)
+            except ValueError:
+                engine.add_machine_sequence(chain)
+                continue
+            for a, b in reversed_pairs:
+                # b now precedes a; restoring a before b is tabu
+                tabu[(a, b)] = iteration + tabu_tenure
+            break
+        else:
+            break
+
+        iteration += 1
+        makespan = engine.makespan
+        history.append(makespan)
+        if makespan < best_makespan:
+            best_makespan = makespan
+            best_sequences = work.machine_sequences()
+            improvements += 1
+
+    best_graph = graph.copy()
+    best_graph.machine_pred[:] = -1
+    best_graph.machine_succ[:] = -1
+    for sequence in best_sequences.values():
+        best_graph.add_machine_sequence(sequence)
+
+    return {
+        "graph": best_graph,
+        "machine_sequences": best_sequences,
+        "makespan": best_makespan,
+        "initial_makespan": initial_makespan,
+        "iterations": iteration,
+        "improvements": improvements,
+        "time": time.perf_counter() - start_time,
+        "history": history,
+    }
+
+
+def _critical_path(engine: IncrementalCPM) -> List[int]:
+    """One critical path of the current schedule, following machine arcs where possible."""
+    head, tail, duration = engine.head, engine.tail, engine.duration
+    graph = engine.graph
+    makespan = engine.makespan
+
+    op = next(i for i in range(len(head)) if head[i] == 0 and duration[i] + tail[i] == makespan)
+    path = [op]
+    while tail[op] > 0:
+        candidates = [
+            succ for succ in engine.successors[op]
+            if head[succ] == head[op] + duration[op] and duration[succ] + tail[succ] == tail[op]
+        ]
+        machine_succ = int(graph.machine_succ[op])
+        op = machine_succ if machine_succ in candidates else candidates[0]
+        path.append(op)
+    return path
+
+
+def _block_moves(
+    engine: IncrementalCPM,
+    job_predecessors: List[List[int]],
+    job_successors: List[List[int]],
+) -> List[Tuple[List[int], List[int]]]:
+    """N5 and N6 moves on the critical blocks, as (segment, reordered segment) pairs."""
+    graph, head, tail, duration = engine.graph, engine.head, engine.tail, engine.duration
+    path = _critical_path(engine)
+
+    blocks, block = [], [path[0]]
+    for a, b in zip(path[:-1], path[1:]):
+        if graph.machine_succ[a] == b:
+            block.append(b)
+        else:
+            blocks.append(block)
+            block = [b]
+    blocks.append(block)
+
+    moves, seen = [], set()
+
+    def add(segment: List[int], new_order: List[int]) -> None:
+        key = (tuple(segment), tuple(new_order))
+        if key not in seen:
+            seen.add(key)
+            moves.append((segment, new_order))
+
+    for number, block in enumerate(blocks):
+        if len(block) < 2:
+            continue
+        first, last = number == 0, number == len(blocks) - 1
+
+        # N5: swap the first pair and the last pair of the block
+        if not first:
+            add(block[:2], block[1::-1])
+        if not last:
+            add(block[-2:], block[:-3:-1])
+
+        # N6: move an operation to the start of the block, if no job path leads
+        # from the start of the block to it (no job predecessor finishes that late)
+        if not first:
+            v = block[0]
+            for k in range(2, len(block)):
+                u = block[k]
+                if all(head[w] < head[v] + duration[v] for w in job_predecessors[u]):
+                    add(block[:k + 1], [u] + block[:k])
+        # ... or to the end of the block, symmetrically on the tails
+        if not last:
+            v = block[-1]
+            for k in range(len(block) - 2):
+                u = block[k]
+                if all(tail[w] < tail[v] + duration[v] for w in job_successors[u]):
+                    add(block[k:], block[k + 1:] + [u])
+    return moves
+
+
+def _reversed_pairs(segment: Sequence[int], new_order: Sequence[int]) -> List[Tuple[int, int]]:
+    """Pairs (a, b) with a before b in segment and b before a in new_order."""
+    rank = {op: k for k, op in enumerate(new_order)}
+    return [
+        (a, b)
+        for i, a in enumerate(segment)
+        for b in segment[i + 1:]
+        if rank[b] < rank[a]
+    ]
+
+
+def _reordered_chain(
+    graph: DisjunctiveGraph, segment: Sequence[int], new_order: Sequence[int]
+) -> Tuple[List[int], List[int]]:
+    """Machine chain of a segment with its machine neighbours, before and after reordering."""
+    before = [int(graph.machine_pred[segment[0]])] if graph.machine_pred[segment[0]] >= 0 else []
+    after = [int(graph.machine_succ[segment[-1]])] if graph.machine_succ[segment[-1]] >= 0 else []
+    return before + list(segment) + after, before + list(new_order) + after
+
+
+def _estimate_makespan(
+    engine: IncrementalCPM,
+    segment: Sequence[int],
+    new_order: Sequence[int],
+    job_predecessors: List[List[int]],
+    job_successors: List[List[int]],
+) -> int:
+    """
+    Approximate makespan after reordering a machine segment.
+
+    Heads of the reordered operations are recomputed forward from the
+    machine predecessor of the segment and their job predecessors, tails
+    backward from the machine successor and their job successors; all
+    other heads and tails are taken as unchanged.
+    """
+    graph, head, tail, duration = engine.graph, engine.head, engine.tail, engine.duration
+
+    machine_pred = graph.machine_pred[segment[0]]
+    release = head[machine_pred] + duration[machine_pred] if machine_pred >= 0 else 0
+    heads = []
+    for op in new_order:
+        for w in job_predecessors[op]:
+            if head[w] + duration[w] > release:
+                release = head[w] + duration[w]
+        heads.append(release)
+        release += duration[op]
+
+    machine_succ = graph.machine_succ[segment[-1]]
+    remaining = duration[machine_succ] + tail[machine_succ] if machine_succ >= 0 else 0
+    estimate = 0
+    for op, op_head in zip(reversed(new_order), reversed(heads)):
+        for w in job_successors[op]:
+            if duration[w] + tail[w] > remaining:
+                remaining = duration[w] + tail[w]
+        estimate = max(estimate, op_head + duration[op] + remaining)
+        remaining += duration[op]
+    return estimate
+
+
+def _job_cpm(graph: DisjunctiveGraph) -> Dict[str, np.ndarray]:
+    """CPM of the job routings only (machine arcs ignored)."""
+    routings = graph.copy()
+    routings.machine_pred[:] = -1
+    routings.machine_succ[:] = -1
+    return routings.cpm()
+
+
+def _spt_priority(graph: DisjunctiveGraph) -> np.ndarray:
+    """Shortest processing time first."""
+    return graph.duration.astype(np.float64)
+
+
+def _mwkr_priority(graph: DisjunctiveGraph) -> np.ndarray:
+    """Most work remaining first (the operation and the longest job path after it)."""
+    cpm = _job_cpm(graph)
+    remaining = cpm["early_finish"].max(initial=0) - cpm["late_start"]
+    return -remaining.astype(np.float64)
+
+
+def _edd_priority(graph: DisjunctiveGraph) -> np.ndarray:
+    """Earliest due date first, with the late finish of the job routings as due date."""
+    return _job_cpm(graph)["late_finish"].astype(np.float64)
+
+
+PRIORITY_RULES = {
+    "spt": _spt_priority,
+    "mwkr": _mwkr_priority,
+    "edd": _edd_priority,
+}
+
+# Read-only data shared with pool workers through _init_worker
+_WORKER_STATE = {}
+
+
+def giffler_thompson(
+    graph: DisjunctiveGraph,
+    rule: str = "mwkr",
+    mode: str = "active",
+    randomness: float = 0.0,
+    seed: int = None,
+    priority: Sequence[float] = None,
+) -> Dict[str, Any]:
+    """
+    Giffler-Thompson schedule generation.
+
+    Operations become schedulable once all their job predecessors are
+    scheduled. Schedulable operations sit in a heap keyed by their earliest
+    completion time (lazily refreshed when their machine becomes busy):
+        - "active": the operation with the smallest earliest completion C*
+          fixes the machine; the conflict set is every schedulable operation
+          on that machine that can start before C*
+        - "non-delay": the operation with the smallest earliest start t*
+          fixes the machine; the conflict set is every schedulable operation
+          on that machine that can start at t*
+    The priority rule picks from the conflict set; with randomness > 0 a
+    uniformly random member is picked with that probability instead.
+
+    Args:
+        graph: Job shop network (existing machine arcs are ignored)
+        rule: Key of PRIORITY_RULES ("spt", "mwkr" or "edd")
+        mode: "active" or "non-delay"
+        randomness: Probability of a random pick from the conflict set
+        seed: Seed of the random picks
+        priority: Precomputed priorities (lower is better), overriding rule
+
+    Returns:
+        Dictionary with:
+            - "graph": Copy of graph with the generated machine arcs
+            - "makespan": Length of the schedule
+            - "start": Start time of every operation
+            - "machine_sequences": Machine -> operation sequence
+
+    Example:
+        >>> result = giffler_thompson(graph, rule="spt", mode="non-delay")
+        >>> result["makespan"]
+    """
+    if priority is None:
+        priority = PRIORITY_RULES[rule](graph)
+    priority = list(priority)
+    rng = np.random.default_rng(seed)
+    active = mode == "active"
+
+    n_operations = graph.n_operations
+    duration = graph.duration.tolist()
+    machine = graph.machine.tolist()
+    ptr, idx = graph.succ_ptr.tolist(), graph.succ_idx.tolist()
+    successors = [idx[ptr[i]:ptr[i + 1]] for i in range(n_operations)]
+    waiting = np.diff(graph.pred_ptr).tolist()  # unscheduled job predecessors
+
+    job_ready = [0] * n_operations  # completion of the job predecessors
+    machine_free = [0] * len(graph.machine_ids)
+    start = [0] * n_operations
+    ready = [[] for _ in graph.machine_ids]  # schedulable operations per machine
+    sequences = [[] for _ in graph.machine_ids]
+    done = [False] * n_operations
+
+    # Heap of (key, op): the earliest completion (active) or start (non-delay)
+    offset = 1 if active else 0
+    heap = []
+    for op in range(n_operations):
+        if waiting[op] == 0:
+            ready[machine[op]].append(op)
+            heap.append((duration[op] * offset, op))
+    heapq.heapify(heap)
+
+    for _step in range(n_operations):
+        # Smallest valid key; entries of scheduled operations are dropped and
+        # entries of operations whose machine became busy are refreshed
+        while True:
+            key, op = heapq.heappop(heap)
+            if done[op]:
+                continue
+            current = max(job_ready[op], machine_free[machine[op]]) + duration[op] * offset
+            if current == key:
+                break
+            heapq.heappush(heap, (current, op))
+
+        m = machine[op]
+        if active:
+            conflict = [o for o in ready[m] if o == op or max(job_ready[o], machine_free[m]) < key]
+        else:
+            conflict = [o for o in ready[m] if max(job_ready[o], machine_free[m]) <= key]
+
+        if randomness > 0 and len(conflict) > 1 and rng.random() < randomness:
+            chosen = conflict[int(rng.integers(len(conflict)))]
+        else:
+            chosen = min(conflict, key=lambda o: (priority[o], o))
+
+        # Schedule the chosen operation; the heap entries of the others on the
+        # machine are now stale and get refreshed when popped
+        ready[m].remove(chosen)
+        done[chosen] = True
+        start[chosen] = max(job_ready[chosen], machine_free[m])
+        machine_free[m] = start[chosen] + duration[chosen]
+        sequences[m].append(chosen)
+        if chosen != op:
+            heapq.heappush(heap, (key, op))  # op was popped but is still schedulable
+
+        for succ in successors[chosen]:
+            if machine_free[m] > job_ready[succ]:
+                job_ready[succ] = machine_free[m]
+            waiting[succ] -= 1
+            if waiting[succ] == 0:
+                ready[machine[succ]].append(succ)
+                heapq.heappush(
+                    heap, (max(job_ready[succ], machine_free[machine[succ]]) + duration[succ] * offset, succ)
+                )
+
+    scheduled = graph.copy()
+    scheduled.machine_pred[:] = -1
+    scheduled.machine_succ[:] = -1
+    for sequence in sequences:
+        scheduled.add_machine_sequence(sequence)
+
+    return {
+        "graph": scheduled,
+        "makespan": max((s + p for s, p in zip(start, duration)), default=0),
+        "start": np.asarray(start, dtype=np.int64),
+        "machine_sequences": {graph.machine_ids[m]: sequence for m, sequence in enumerate(sequences)},
+    }
+
+
+def _init_worker(state: dict) -> None:
+    """Pool initializer: receive the shared read-only network once per worker process."""
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(state)
+
+
+def _giffler_thompson_run(
+    rule_index: int,
+    replica: int,
+    graph: DisjunctiveGraph,
+    rules: List[str],
+    priorities: List[List[float]],
+    mode: str,
+    randomness: float,
+    seed: int,
+) -> Dict[str, Any]:
+    """One rule replica; replica 0 is the deterministic rule."""
+    result = giffler_thompson(
+        graph,
+        mode=mode,
+        randomness=randomness if replica > 0 else 0.0,
+        seed=[seed, rule_index, replica],
+        priority=priorities[rule_index],
+    )
+    return {
+        "rule": rules[rule_index],
+        "replica": replica,
+        "makespan": result["makespan"],
+        "machine_sequences": result["machine_sequences"],
+    }
 
-            # Annotate with job number
+
+def _giffler_thompson_run_worker(run: Tuple[int, int]) -> Dict[str, Any]:
+    return _giffler_thompson_run(*run, **_WORKER_STATE)
+
+
+def giffler_thompson_replicas(
+    graph: DisjunctiveGraph,
+    rules: Sequence[str] = ("spt", "mwkr", "edd"),
+    n_replicas: int = 10,
+    mode: str = "active",
+    randomness: float = 0.2,
+    seed: int = 0,
+    max_workers: int = 1,
+) -> Dict[str, Any]:
+    """
+    Run randomized Giffler-Thompson replicas of several priority rules.
+
+    Every (rule, replica) pair is an independent run, so runs are spread
+    over a process pool; the network and the rule priorities are sent to
+    each worker once. Replica 0 of each rule is the deterministic rule.
+
+    Args:
+        graph: Job shop network
+        rules: Keys of PRIORITY_RULES to run
+        n_replicas: Runs per rule
+        mode: "active" or "non-delay"
+        randomness: Probability of a random conflict-set pick in replicas > 0
+        seed: Base seed; run (rule, replica) uses its own stream
+        max_workers: Number of worker processes (1 runs serially, None uses all CPUs)
+
+    Returns:
+        A dictionary containing:
+            - "graph": Copy of graph with the machine arcs of the best run
+            - "makespan": Makespan of the best run
+            - "rule" and "replica": The best run
+            - "runs": Polars DataFrame with rule, replica and makespan of every run
+
+    Example:
+        >>> result = giffler_thompson_replicas(graph, n_replicas=50, max_workers=4)
+        >>> result["runs"].group_by("rule").agg(pl.col("makespan").min())
+    """
+    rules = list(rules)
+    state = {
+        "graph": graph,
+        "rules": rules,
+        "priorities": [PRIORITY_RULES[rule](graph).tolist() for rule in rules],
+        "mode": mode,
+        "randomness": randomness,
+        "seed": seed,
+    }
+    runs = [(rule_index, replica) for rule_index in range(len(rules)) for replica in range(n_replicas)]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(runs))
+
+    if max_workers <= 1:
+        results = [_giffler_thompson_run(*run, **state) for run in runs]
+    else:
+        chunksize = max(1, len(runs) // (4 * max_workers))
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(state,),
+        ) as executor:
+            results = list(executor.map(_giffler_thompson_run_worker, runs, chunksize=chunksize))
+
+    # Runs come back in submission order, so ties resolve to the earliest run
+    best = min(results, key=lambda result: result["makespan"])
+    scheduled = graph.copy()
+    scheduled.machine_pred[:] = -1
+    scheduled.machine_succ[:] = -1
+    for sequence in best["machine_sequences"].values():
+        scheduled.add_machine_sequence(sequence)
+
+    return {
+        "graph": scheduled,
+        "makespan": best["makespan"],
+        "rule": best["rule"],
+        "replica": best["replica"],
+        "runs": pl.DataFrame(
+            [{key: result[key] for key in ("rule", "replica", "makespan")} for result in results]
+        ),
+    }
+
+
+@contextmanager
+def _timed(timings: Dict[str, float], phase: str):
+    """Add the wall time of the block to timings[phase] (no-op without timings)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def _to_list(column: Any) -> list:
+    """Plain Python list from a list, NumPy array or Polars Series."""
+    return column.tolist() if hasattr(column, "tolist") else list(column)
+
+
+def parse_machine_job(machine_job_str: str) -> Tuple[str, str]:
+    """
+    Parse the machine,job string into separate components.
+
+    Args:
+        machine_job_str: String in format "machine,job" (e.g., "3,2")
+
+    Returns:
+        Tuple of (machine, job) as strings
+    """
+    parts = machine_job_str.split(',')
+    return parts[0], parts[1]
+
+
+def plot_gantt(
+    rows: Sequence[int],
+    starts: Sequence[float],
+    durations: Sequence[float],
+    row_labels: Sequence[str] = None,
+    colors: Sequence[Any] = None,
+    labels: Sequence[str] = None,
+    label_colors: Sequence[Any] = None,
+    ax: Any = None,
+    height: float = 0.6,
+    edgecolor: Any = 'black',
+    linewidth: float = 1.0,
+    alpha: float = 1.0,
+    label_min_width: float = 20.0,
+    fontsize: float = 10,
+    rasterized: bool = None,
+    save_path: str = None,
+    dpi: int = 150,
+    figsize: Tuple[float, float] = None,
+) -> Tuple[Any, Any]:
+    """
+    Draw a Gantt chart from precomputed start times.
+
+    Bars are grouped by row and drawn with one broken_barh collection per
+    row instead of one barh call per bar, and labels are only placed on
+    bars at least label_min_width pixels wide, so charts with thousands of
+    operations render in seconds.
+
+    Args:
+        rows: Row (y position) of each bar, 0-based
+        starts: Start time of each bar
+        durations: Length of each bar
+        row_labels: Tick label of each row (rows are unlabeled if None)
+        colors: Face color of each bar (default: the tab10 cycle by row)
+        labels: Text of each bar (None draws no labels)
+        label_colors: Text color of each label (default: black)
+        ax: Axes to draw on (a new figure is created if None); the x limits
+            are only ever widened, so earlier bars on the axes stay visible
+        height: Bar height in row units
+        edgecolor, linewidth, alpha: Bar styling
+        label_min_width: Minimum bar width in pixels to receive a label
+        fontsize: Label font size
+        rasterized: Rasterize the bars (default: only with 1,000+ bars), which
+            keeps vector exports small
+        save_path: Optional file (e.g. a PNG) to save the figure to, for
+            headless batch runs (use a non-interactive backend such as Agg)
+        dpi: Resolution used when saving
+        figsize: Size of a new figure (default: 12 wide, 0.8 per row)
+
+    Returns:
+        Tuple of (figure, axes) matplotlib objects
+
+    Example:
+        >>> fig, ax = plot_gantt([0, 0, 1], [0, 5, 2], [5, 3, 4], row_labels=['M1', 'M2'],
+        ...                      labels=['J1', 'J2', 'J3'], save_path='gantt.png')
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = np.asarray(starts, dtype=float)
+    durations = np.asarray(durations, dtype=float)
+    n_rows = len(row_labels) if row_labels is not None else int(rows.max(initial=-1)) + 1
+
+    if ax is None:
+        fig, ax = plt.subplots(figsize=figsize or (12, max(6, n_rows * 0.8)))
+        previous_right = 0.0
+    else:
+        # Drawing onto existing axes (e.g. an overlay) must not clip what is already there
+        fig = ax.figure
+        previous_right = ax.get_xlim()[1]
+    if colors is None:
+        palette = plt.cm.tab10.colors
+        colors = [palette[row % len(palette)] for row in rows.tolist()]
+    if rasterized is None:
+        rasterized = len(rows) >= 1000
+
+    # One collection per row
+    order = np.argsort(rows, kind='stable')
+    boundaries = np.flatnonzero(np.diff(rows[order])) + 1
+    for group in np.split(order, boundaries):
+        if len(group) == 0:
+            continue
+        collection = ax.broken_barh(
+            list(zip(starts[group].tolist(), durations[group].tolist())),
+            (rows[group[0]] - height / 2, height),
+            facecolors=[colors[i] for i in group.tolist()],
+            edgecolor=edgecolor,
+            linewidth=linewidth,
+            alpha=alpha,
+        )
+        collection.set_rasterized(rasterized)
+
+    ax.set_xlim(0, max(max(float((starts + durations).max(initial=0)), 1.0) * 1.02, previous_right))
+    ax.set_ylim(-0.5 - (1 - height) / 2, n_rows - 0.5 + (1 - height) / 2)
+    if row_labels is not None:
+        ax.set_yticks(range(n_rows))
+        ax.set_yticklabels(row_labels)
+
+    if labels is not None:
+        # Pixels per time unit at the current figure size
+        x_min, x_max = ax.get_xlim()
+        pixels_per_unit = ax.get_window_extent().width / (x_max - x_min)
+        for i in np.flatnonzero(durations * pixels_per_unit >= label_min_width).tolist():
             ax.text(
-                job_info['start'] + job_info['duration'] / 2,
-                i,
-                f"J{job_info['job']}",
+                starts[i] + durations[i] / 2,
+                rows[i],
+                labels[i],
                 ha='center',
                 va='center',
                 fontweight='bold',
-                fontsize=10,
-                color='white' if int(job_info['job']) % len(colors) < 5 else 'black'
+                fontsize=fontsize,
+                color=label_colors[i] if label_colors is not None else 'black',
             )
 
+    if save_path is not None:
+        fig.savefig(save_path, dpi=dpi, bbox_inches='tight')
+
+    return fig, ax
+
+
+def create_gantt_chart(
+    df: Union[pl.DataFrame, DisjunctiveGraph],
+    start_times: Sequence[float] = None,
+    label_min_width: float = 20.0,
+    save_path: str = None,
+) -> Tuple[Any, Any]:
+    """
+    Create a Gantt chart from the solution data.
+
+    Args:
+        df: A DisjunctiveGraph, or a Polars DataFrame with current_machine_job,
+            predecessors, and pij columns
+        start_times: Start time of every operation (e.g. the "start" of
+            giffler_thompson); computed as CPM early starts when None
+        label_min_width: Minimum bar width in pixels to receive a job label
+        save_path: Optional file (e.g. a PNG) to save the chart to
+
+    Returns:
+        Tuple of (figure, axes) matplotlib objects
+    """
+    graph = df if isinstance(df, DisjunctiveGraph) else DisjunctiveGraph.from_dataframe(df)
+    early_starts = start_times is None
+    if early_starts:
+        start_times = graph.cpm()['early_start']
+
+    # Color by job number (job code for non-numeric labels); light labels on
+    # the dark half of the palette
+    palette = plt.cm.tab10.colors
+    job_colors = [
+        int(label) % len(palette) if str(label).isdigit() else code % len(palette)
+        for code, label in enumerate(graph.job_ids)
+    ]
+    color_index = [job_colors[j] for j in graph.job.tolist()]
+
+    fig, ax = plot_gantt(
+        rows=graph.machine,
+        starts=start_times,
+        durations=graph.duration,
+        row_labels=[f'Machine {m}' for m in graph.machine_ids],
+        colors=[palette[c] for c in color_index],
+        labels=[f'J{graph.job_ids[j]}' for j in graph.job.tolist()],
+        label_colors=['white' if c < 5 else 'black' for c in color_index],
+        linewidth=1.5,
+        label_min_width=label_min_width,
+    )
+
     # Customize the plot
-    ax.set_yticks(range(len(machines)))
-    ax.set_yticklabels([f'Machine {m}' for m in machines])
     ax.set_xlabel('Time', fontsize=12, fontweight='bold')
     ax.set_ylabel('Machine', fontsize=12, fontweight='bold')
-    ax.set_title('Gantt Chart - Job Scheduling by Machine\n(Early Start Times)',
+    start_label = 'Early Start Times' if early_starts else 'Scheduled Start Times'
+    ax.set_title(f'Gantt Chart - Job Scheduling by Machine\n({start_label})',
                  fontsize=14, fontweight='bold', pad=20)
 
     # Add grid for better readability
     ax.grid(True, axis='x', alpha=0.3, linestyle='--')
     ax.set_axisbelow(True)
 
-    # Set x-axis to start at 0
-    ax.set_xlim(left=0)
-
     # Tight layout
     plt.tight_layout()
 
+    if save_path is not None:
+        fig.savefig(save_path, dpi=150)
+
     return fig, ax
@@ -45,10 +45,12 @@ def _(mo):
 
 @app.cell
 def _():
+    import numpy as np
     import polars as pl
 
+    import jobshop_benchmarks
     import sbn_utilities
-    return pl, sbn_utilities
+    return jobshop_benchmarks, np, pl, sbn_utilities
 
 
 @app.cell(hide_code=True)
@@ -66,58 +68,31 @@ def _(mo):
     - Each node represents a specific operation: `machine,job` (e.g., "3,2" means Job 2 on Machine 3)
     - Edges represent precedence constraints (job routing + machine sequencing)
     - Each node has a duration (`pij`)
+
+    `DisjunctiveGraph.from_job_table` does this conversion column-wise: the routings are exploded with Polars list
+    operations and operation ids and job-chain arcs are assigned in bulk (no Python loop per operation), so instances
+    with 100k operations load in a fraction of a second.
     """
     )
     return
 
 
 @app.cell
-def _(pl):
-    # Load raw job shop data from CSV and parse comma-separated fields
-    raw_data = pl.read_csv(
-        'data/SBN_data.csv'
-    ).with_columns(
-        pl.col('machine_sequence').str.split(','),
-        pl.col('pij').str.split(',')
-    )
+def _(pl, sbn_utilities):
+    # Load raw job shop data from CSV (comma-separated machine_sequence and pij fields)
+    raw_data = pl.read_csv('data/SBN_data.csv')
 
-    # Extract list of all machines and initialize tracking variables
-    machine_list = raw_data['machine_sequence'].explode().unique().sort().to_list()
-    scheduled_machines = []
-
-    # Convert job shop data into CPM network format
-    # Each operation becomes a node with format "machine,job"
-    cpm_data = []
-    for row in raw_data.to_dicts():
-        current_job = row.get('job')
-        previous_machine_job = None
-        row_machine_sequence = row.get('machine_sequence')
-        row_pij = row.get('pij')
-
-        # For each operation in the job's routing
-        for machine, pij in zip(row_machine_sequence, row_pij):
-            current_machine_job = f'{machine},{current_job}'
-
-            # Add precedence constraint from previous operation in the same job
-            if previous_machine_job is None:
-                predecessors = None  # First operation has no job predecessor
-            else:
-                predecessors = [previous_machine_job]
-
-            cpm_data.append({
-                'current_machine_job': current_machine_job,
-                'predecessors': predecessors,
-                'pij': pij,
-            })
-            previous_machine_job = current_machine_job
-
-    # Convert to DataFrame and ensure processing times are integers
-    cpm_data = pl.DataFrame(
-        cpm_data
-    ).with_columns(
-        pl.col('pij').cast(pl.Int64)
-    )
-    return cpm_data, machine_list, scheduled_machines
+    # Convert job shop data into the integer-indexed network in bulk: routings are
+    # exploded with Polars list operations, each operation becomes a node "machine,job"
+    # and consecutive operations of a job are linked by precedence arcs
+    network = sbn_utilities.DisjunctiveGraph.from_job_table(raw_data)
+
+    # CPM network view of the same data (one row per operation)
+    cpm_data = network.to_dataframe()
+
+    # Extract list of all machines (numerically sorted)
+    machine_list = list(network.machine_ids)
+    return cpm_data, machine_list, network
 
 
 @app.cell(hide_code=True)
@@ -131,13 +106,46 @@ def _(mo):
       - `current_machine_job`: Operation identifier ("machine,job" format)
       - `predecessors`: List of predecessor operations (job routing constraints)
       - `pij`: Processing time for the operation
+    - **`network`**: `sbn_utilities.DisjunctiveGraph`, the same network with integer operation ids:
+      - `duration`, `machine`, `job`: arrays indexed by operation
+      - CSR predecessor/successor arrays for the job routing arcs
+      - `machine_pred` / `machine_succ`: machine sequencing arcs, added in place as machines are scheduled
+      - `operations_on(machine)`: operations of a machine, from a machine → operation index built once at load time
     - **`machine_list`**: List of all unique machines in the problem
-    - **`scheduled_machines`**: Initially empty; tracks which machines have been scheduled
     """
     )
     return
 
 
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ### Single-Machine Subproblem Solver
+
+    Each candidate bottleneck is a 1|rⱼ|Lmax problem. Two solvers are available in `sbn_utilities.SUBPROBLEM_SOLVERS`:
+    - **`'edd'`**: the dynamic EDD heuristic (fast, but can misjudge which machine is the bottleneck)
+    - **`'carlier'`**: Carlier's exact branch-and-bound, using Schrage's heuristic as the incumbent and the preemptive
+      schedule as a lower bound; it falls back to the best schedule found (never worse than EDD) if the node or time limit is reached
+    """
+    )
+    return
+
+
+@app.cell
+def _():
+    subproblem_solver = 'carlier'
+
+    # Candidate bottleneck machines are independent subproblems; with max_workers > 1
+    # they are solved in a process pool (1 solves them one at a time)
+    max_workers = 1
+
+    # Re-optimization phase: after each bottleneck is fixed, resequence the machines
+    # scheduled so far one at a time until no pass improves the makespan
+    reoptimize = True
+    return max_workers, reoptimize, subproblem_solver
+
+
 @app.cell(hide_code=True)
 def _(mo):
     mo.md(
@@ -147,112 +155,185 @@ def _(mo):
     The algorithm iteratively schedules machines until all are scheduled:
 
     ### For each iteration:
-    1. **Run CPM** on the current network to get early/late start/finish times
-    2. **For each unscheduled machine**:
+    1. **Run CPM** on the current network to get early/late start/finish times (a full CPM is only run once; after each bottleneck is fixed, `IncrementalCPM` updates the early starts downstream and the late finishes upstream of the new arcs)
+    2. **For each unscheduled machine** (independent subproblems, optionally solved in parallel from one CPM snapshot):
        - Extract jobs assigned to that machine
        - Formulate single-machine problem with release times (rj = early start) and due dates (dj = late finish)
-       - Solve to minimize maximum lateness using EDD (Earliest Due Date) rule
-    3. **Select bottleneck**: Machine with highest maximum lateness (Lmax)
-    4. **Fix sequence**: Add precedence constraints between consecutive jobs on the bottleneck machine
-    5. **Repeat** until all machines are scheduled
+       - Solve to minimize maximum lateness with the selected subproblem solver (dynamic EDD or Carlier's exact branch-and-bound)
+       - Machines whose release and due dates did not change since they were last solved are answered from `subproblem_cache`
+    3. **Select bottleneck**: Machine with highest maximum lateness (Lmax); ties go to the first machine in `machine_list`
+    4. **Fix sequence**: Add precedence constraints between consecutive jobs on the bottleneck machine (in place on the `network` graph)
+    5. **Re-optimize** (when `reoptimize` is on): for each scheduled machine, remove its arcs, update heads/tails incrementally,
+       re-solve its subproblem against the rest of the network and reinsert it, keeping the new sequence only if the
+       makespan shrinks; passes repeat until none improves (`sbn_utilities.reoptimize_machines`)
+    6. **Repeat** until all machines are scheduled
+    """
+    )
+    return
+
+
+@app.cell
+def _(machine_list, max_workers, network, reoptimize, sbn_utilities, subproblem_solver):
+    # Subproblems whose (pj, rj, dj) did not change since they were last solved are looked up
+    subproblem_cache = sbn_utilities.SubproblemCache()
+
+    # The loop above (steps 1-6) as implemented in sbn_utilities.shifting_bottleneck: the
+    # network is copied, heads/tails come from an IncrementalCPM engine, and candidate
+    # machines are taken in machine_list order so ties are broken deterministically
+    _result = sbn_utilities.shifting_bottleneck(
+        network,
+        machines=machine_list,
+        solver=subproblem_solver,
+        reoptimize=reoptimize,
+        max_workers=max_workers,
+        cache=subproblem_cache,
+        verbose=True,
+    )
+
+    final_solution = _result['graph']
+    # Branch-and-bound statistics per subproblem (only the exact solver reports them)
+    search_statistics = _result['search_statistics']
+    return final_solution, search_statistics, subproblem_cache
+
+
+@app.cell
+def _(pl, search_statistics):
+    # Branch-and-bound statistics per subproblem (empty when using the EDD solver)
+    pl.DataFrame(search_statistics)
+    return
+
+
+@app.cell
+def _(subproblem_cache):
+    # Subproblem cache hit rate over the greedy and re-optimization phases
+    subproblem_cache.info()
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Lower Bounds
+
+    `sbn_utilities.makespan_lower_bounds` bounds the optimal makespan from below using heads and tails of the job
+    routings only (no machine sequencing), so the gap of the SBN schedule can be reported:
+    - **Job bound**: the longest job (total processing time)
+    - **Machine bound**: smallest head + machine load + smallest tail, for each machine
+    - **One-machine bound**: Jackson's preemptive schedule of each machine's 1|rⱼ,pmtn|max(Cⱼ + qⱼ) relaxation
+
+    A schedule that reaches the lower bound is optimal, which also lets the local search stop early.
+    """
+    )
+    return
+
+
+@app.cell
+def _(final_solution, network, sbn_utilities):
+    lower_bounds = sbn_utilities.makespan_lower_bounds(network)
+    _makespan = int(final_solution.cpm()['early_finish'].max())
+    _gap = (_makespan - lower_bounds['lower_bound']) / lower_bounds['lower_bound']
+    print(f"SBN makespan: {_makespan}, lower bound: {lower_bounds['lower_bound']} "
+          f"(job {lower_bounds['job_bound']}, machine {lower_bounds['machine_bound']}, "
+          f"one-machine {lower_bounds['one_machine_bound']}), gap: {_gap:.1%}")
+    lower_bounds['machines']
+    return (lower_bounds,)
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Critical-Block Local Search
+
+    The SBN schedule is used as the starting point of a tabu search (`sbn_utilities.tabu_search`):
+    - A **critical path** of the schedule is split into **blocks**: maximal runs of consecutive operations on one machine
+    - **N5 moves** swap the first two or last two operations of a block; **N6 moves** shift an operation to the start or end
+      of its block (only when heads/tails guarantee no cycle)
+    - Each move is ranked by an **approximate makespan** recomputed from the heads and tails of the affected operations only,
+      so no CPM is run per candidate; the chosen move is applied with incremental head/tail updates
+    - Reversed operation pairs stay **tabu** for a few iterations, unless the move would beat the best makespan
+    - The search stops at the iteration or time budget, when the makespan reaches the lower bound, or when the critical path
+      is a single block (in both cases the schedule is optimal)
+    """
+    )
+    return
+
+
+@app.cell
+def _(final_solution, lower_bounds, sbn_utilities):
+    local_search = sbn_utilities.tabu_search(
+        final_solution, max_iterations=1000, time_limit=5.0, lower_bound=lower_bounds['lower_bound'],
+    )
+    improved_solution = local_search['graph']
+    _gap = (local_search['makespan'] - lower_bounds['lower_bound']) / lower_bounds['lower_bound']
+    print(f"Makespan: {local_search['initial_makespan']} (SBN) -> {local_search['makespan']} "
+          f"after {local_search['iterations']} iterations, gap to lower bound: {_gap:.1%}")
+    return (improved_solution,)
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Beam Search over Bottleneck Choices
+
+    The greedy heuristic commits to the machine with the largest Lmax at every iteration. `sbn_utilities.beam_shifting_bottleneck`
+    keeps several partial networks instead:
+    - Each level expands every network in the **beam** on its `branching` machines with the largest Lmax
+      (one child per candidate); expansions run in parallel workers
+    - The **incumbent** starts as the greedy SBN schedule (with the same `reoptimize` setting), so the beam never does
+      worse; the search stops early once it reaches the makespan lower bound
+    - By default (`reoptimize=False`) adding machines never shortens a schedule, so a network is **pruned** when its
+      makespan or the preemptive one-machine bound of an unscheduled machine reaches the incumbent; with
+      `reoptimize=True` each child is re-optimized like the main loop, which can shorten a partial schedule, so no
+      network is pruned and the beam relies on ranking alone
+    - The `beam_width` networks with the smallest partial makespan go to the next level
+
+    `beam_width = 1` is the greedy heuristic; wider beams trade time for makespan.
     """
     )
     return
 
 
 @app.cell
-def _(cpm_data, machine_list, pl, sbn_utilities, scheduled_machines):
-    # Create local working copies (marimo scoping: use _ prefix for cell-local variables)
-    _cpm_data = cpm_data.clone()
-    _scheduled_machines = list(scheduled_machines)
-
-    # Iterate until all machines have been scheduled
-    while set(machine_list) - set(_scheduled_machines):
-        _unscheduled_machines = list(set(machine_list) - set(_scheduled_machines))
-
-        # Step 1: Run CPM analysis on current network
-        _cpm_results = sbn_utilities.calculate_cpm(_cpm_data)
-
-        # Step 2: Evaluate each unscheduled machine as potential bottleneck
-        _all_single_machine_results = []
-        for _current_machine in _unscheduled_machines:
-            # Extract all jobs assigned to this machine
-            _relevant_jobs = [
-                job for job in _cpm_results.keys()
-                if job.startswith(_current_machine)
-            ]
-
-            # Formulate single-machine scheduling problem
-            # rj (release time) = early start from CPM
-            # dj (due date) = late finish from CPM
-            _current_single_machine_data = []
-            for _job in _relevant_jobs:
-                _early_start = _cpm_results[_job].get('early_start')
-                _early_finish = _cpm_results[_job].get('early_finish')
-                _processing_time = _early_finish - _early_start
-                _late_finish = _cpm_results[_job].get('late_finish')
-
-                _current_single_machine_data.append({
-                    'job': _job,
-                    'pj': _processing_time,
-                    'rj': _early_start,
-                    'dj': _late_finish,
-                })
-
-            # Solve single-machine problem to minimize maximum lateness
-            _current_single_machine_data = pl.DataFrame(_current_single_machine_data)
-            _single_machine_results = sbn_utilities.minimize_maximum_lateness(_current_single_machine_data)
-            _sequence = _single_machine_results.get('sequence')
-            _max_lateness = _single_machine_results.get('max_lateness')
-
-            _all_single_machine_results.append({
-                'machine': _current_machine,
-                'sequence': _sequence,
-                'Lmax': _max_lateness,
-            })
-
-        # Step 3: Select machine with highest maximum lateness as bottleneck
-        _all_single_machine_results = pl.DataFrame(
-            _all_single_machine_results
-        ).sort(
-            'Lmax',
-            descending=True
-        )
-        _bottleneck_information = _all_single_machine_results.to_dicts()[0]
-        _bottleneck_machine = _bottleneck_information.get('machine')
-        _bottleneck_sequence = _bottleneck_information.get('sequence')
-        print(f'Identified bottleneck is {_bottleneck_machine}')
-
-        # Step 4: Add precedence constraints for the bottleneck machine's sequence
-        # Convert to dictionary format for easier manipulation of predecessor lists
-        _cpm_data_dicts = {
-            row['current_machine_job']: {
-                'predecessors': row['predecessors'] if row['predecessors'] else [],
-                'pij': row['pij']
-            }
-            for row in _cpm_data.to_dicts()
-        }
-
-        # Add precedence constraints between consecutive jobs in bottleneck sequence
-        for _new_predecessor, _target in zip(_bottleneck_sequence[:-1], _bottleneck_sequence[1:]):
-            _cpm_data_dicts[_target]['predecessors'].append(_new_predecessor)
-
-        # Convert back to polars DataFrame
-        _updated_rows = [
-            {
-                'current_machine_job': _machine_job,
-                'predecessors': _data['predecessors'] if _data['predecessors'] else None,
-                'pij': _data['pij']
-            }
-            for _machine_job, _data in _cpm_data_dicts.items()
-        ]
-        _cpm_data = pl.DataFrame(_updated_rows)
-
-        # Mark this machine as scheduled
-        _scheduled_machines.append(_bottleneck_machine)
-
-    final_solution = _cpm_data.clone()
-    return (final_solution,)
+def _(max_workers, network, sbn_utilities):
+    beam_width = 3
+    beam_result = sbn_utilities.beam_shifting_bottleneck(network, beam_width=beam_width, max_workers=max_workers)
+    print(f"Beam width {beam_width}: makespan {beam_result['greedy_makespan']} (greedy) -> {beam_result['makespan']}, "
+          f"{beam_result['expanded']} nodes expanded, {beam_result['pruned']} pruned, {beam_result['time']:.2f}s")
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Fast Schedule Generation (Giffler-Thompson)
+
+    For large shops (1,000+ operations) where running SBN to completion is too slow, `sbn_utilities.giffler_thompson`
+    builds a schedule in one pass:
+    - Operations whose job predecessors are scheduled wait in a **heap keyed by earliest completion** (active schedules)
+      or **earliest start** (`mode='non-delay'`)
+    - The top of the heap fixes a machine; its **conflict set** is the schedulable operations on that machine that could
+      start before that completion (or at that start)
+    - A **priority rule** picks from the conflict set: `'spt'` (shortest processing time), `'mwkr'` (most work
+      remaining) or `'edd'` (earliest late finish of the job routings)
+
+    `giffler_thompson_replicas` runs every rule plus randomized replicas (a random conflict-set pick with probability
+    `randomness`) across a process pool and keeps the best schedule.
+    """
+    )
+    return
+
+
+@app.cell
+def _(max_workers, network, sbn_utilities):
+    gt_result = sbn_utilities.giffler_thompson_replicas(network, n_replicas=20, max_workers=max_workers)
+    print(f"Best Giffler-Thompson makespan: {gt_result['makespan']} "
+          f"(rule {gt_result['rule']}, replica {gt_result['replica']})")
+    gt_result['runs']
+    return
 
 
 @app.cell(hide_code=True)
@@ -262,8 +343,9 @@ def _(mo):
     ## Results and Visualization
 
     After completing the shifting bottleneck heuristic, we have:
-    - **final_solution**: A polars DataFrame containing the complete schedule with all precedence constraints
-    - Each row represents an operation with its machine, job, predecessors, and processing time
+    - **final_solution**: A `DisjunctiveGraph` containing the complete schedule with all precedence constraints
+    - `final_solution.to_dataframe()` gives one row per operation with its predecessors and processing time
+    - **improved_solution**: The same network with the machine sequences improved by the local search
 
     The Gantt chart below visualizes the schedule showing:
     - Each machine as a separate row
@@ -276,8 +358,55 @@ def _(mo):
 
 
 @app.cell
-def _(final_solution, sbn_utilities):
-    sbn_utilities.create_gantt_chart(final_solution)
+def _(improved_solution, sbn_utilities):
+    sbn_utilities.create_gantt_chart(improved_solution)
+    return
+
+
+@app.cell(hide_code=True)
+def _(mo):
+    mo.md(
+        r"""
+    ## Benchmark Instances
+
+    `jobshop_benchmarks` loads the standard OR-Library (ft, la) and Taillard (ta) job shop instances directly into a
+    `DisjunctiveGraph` and runs `sbn_utilities.shifting_bottleneck` (the loop above as a function) on each file in
+    `data/jobshop`. For every instance it reports the makespan, the gap to the best-known makespan, the wall time and
+    the time spent in each phase:
+    - **cpm_time**: initial CPM and head/tail snapshots
+    - **subproblem_time**: single-machine subproblems (cache lookups included)
+    - **update_time**: incremental network updates (arc insertion and removal)
+
+    `ft06`, `ft10`, `la01`-`la40` and `ta01`-`ta80` are bundled; other instance files in either format can be dropped
+    into `data/jobshop` (named after the instance, so that the best-known value is found). By default the cell below
+    runs the small instances (`ft06`, `ft10`, `la01`-`la05`); the switch adds one larger instance of each size, up to
+    the 100x20 Taillard `ta71`, to show how the phases scale (this takes about 30 seconds). Pass `paths=None` to
+    `run_benchmark` to run everything.
+    """
+    )
+    return
+
+
+@app.cell
+def _(mo):
+    include_large_instances = mo.ui.switch(label="Include larger instances (15x5 up to 100x20, about 30 s)")
+    include_large_instances
+    return (include_large_instances,)
+
+
+@app.cell
+def _(include_large_instances, jobshop_benchmarks, subproblem_solver):
+    _names = ['ft06', 'ft10', 'la01', 'la02', 'la03', 'la04', 'la05']
+    if include_large_instances.value:
+        # One instance per size: 15x5, 20x5, 15x10, 20x10, 30x10, 15x15, 20x15, 20x20, 30x15, 30x20, 50x15, 50x20,
+        # 100x20
+        _names += ['la06', 'la11', 'la21', 'la26', 'la31', 'la36', 'ta11', 'ta21', 'ta31', 'ta41', 'ta51', 'ta61',
+                   'ta71']
+    benchmark_results = jobshop_benchmarks.run_benchmark(
+        paths=[f'{jobshop_benchmarks.INSTANCE_DIRECTORY}/{_name}.txt' for _name in _names],
+        solver=subproblem_solver,
+    )
+    benchmark_results
     return
 
 